@@ -6,13 +6,37 @@ A Python toolkit for data analysis and experimentation.
 This package provides modules for connecting to various databases,
 running SQL queries, and analyzing data. It includes utilities for
 schema analysis, query management, and database connectivity.
+
+Importing the package is cheap: submodules (and pandas with them) are only
+imported when one of their names is first used.
 """
 
+import importlib
+from typing import Any, List
+
 __version__ = '0.1.0'
 __author__ = 'Cursor Analytics Team'
 
-# Import commonly used modules for easier access
-from cursor_analytics.db.connection import get_mysql_connection
+# Commonly used names, resolved from their modules on first access
+_LAZY_ATTRIBUTES = {
+    'get_mysql_connection': 'cursor_analytics.db.connection',
+    'get_postgres_connection': 'cursor_analytics.db.connection',
+    'get_snowflake_connection': 'cursor_analytics.db.connection',
+    'get_duckdb_connection': 'cursor_analytics.db.connection',
+    'run_analysis': 'cursor_analytics.analytics'
+}
 
 # Expose key functions at the package level
-__all__ = ['get_mysql_connection'] 
\ No newline at end of file
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
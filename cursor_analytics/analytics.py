@@ -2,44 +2,47 @@ import os
 import sys
 import logging
 import argparse
-from typing import Optional, Dict, Any, Callable, Union
-import pandas as pd
+import importlib
+from typing import Optional, Dict, Any, Callable, Union, List, TYPE_CHECKING
 from pathlib import Path
 import datetime
 import pickle
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+# pandas and the connection classes are imported when a query actually runs in this
+# process, so --list and daemon-forwarded runs start quickly
+if TYPE_CHECKING:
+    import pandas as pd
+    from cursor_analytics.db.connection import DatabaseConnection
 
-# Import our database connection classes
-from cursor_analytics.db.connection import (
-    get_mysql_connection,
-    get_postgres_connection,
-    get_snowflake_connection,
-    DatabaseConnection
-)
+logger = logging.getLogger(__name__)
 
 # Import query utilities
-from cursor_analytics.queries import load_query, list_available_queries
+from cursor_analytics.queries import load_query, list_available_queries, get_query
+from cursor_analytics.queries.catalog import CompiledQuery
+from cursor_analytics.db.sql_parser import preprocess, convert_placeholders
+from cursor_analytics.db.admission import query_priority, PRIORITIES
+from cursor_analytics.db.preflight import guard_query
+from cursor_analytics.daemon import (
+    forward_query, request_daemon, daemon_enabled, DaemonUnavailable
+)
+from cursor_analytics.utils.logger import configure_logging
 
-# Map database types to their connection functions
+# Map database types to their connection functions in db/connection.py
 DB_CONNECTIONS = {
-    'mysql': get_mysql_connection,
-    'postgres': get_postgres_connection,
-    'snowflake': get_snowflake_connection
+    'mysql': 'get_mysql_connection',
+    'postgres': 'get_postgres_connection',
+    'snowflake': 'get_snowflake_connection',
+    'duckdb': 'get_duckdb_connection'
 }
 
-def get_connection(db_type: str) -> Optional[DatabaseConnection]:
+def get_connection(db_type: str) -> Optional['DatabaseConnection']:
     if db_type.lower() not in DB_CONNECTIONS:
         supported_dbs = ", ".join(DB_CONNECTIONS.keys())
         raise ValueError(f"Unsupported database type: {db_type}. Supported types: {supported_dbs}")
     
     logger.info(f"Getting connection for database type: {db_type}")
-    connection_func = DB_CONNECTIONS[db_type.lower()]
+    connection_module = importlib.import_module('cursor_analytics.db.connection')
+    connection_func = getattr(connection_module, DB_CONNECTIONS[db_type.lower()])
     
     try:
         return connection_func()
@@ -76,11 +79,75 @@ def load_query_from_file(query_path: str) -> Optional[str]:
         logger.error(f"Error loading query from file: {e}")
         return None
 
+def resolve_query(query_path: str) -> Optional[CompiledQuery]:
+    # Catalog queries are compiled once and cached; other files are compiled on demand
+    # so their header parameters and templates work the same way
+    try:
+        compiled = get_query(query_path)
+        if compiled:
+            return compiled
+        path = Path(query_path)
+        if path.is_file():
+            logger.info(f"Loading query from file: {path}")
+            return CompiledQuery(path.stem, path, path.read_text(), path.stat().st_mtime)
+    except Exception as e:
+        logger.error(f"Error compiling query {query_path}: {e}")
+    return None
+
+def parse_params(items: Optional[List[str]]) -> Dict[str, str]:
+    params = {}
+    for item in items or []:
+        name, separator, value = item.partition('=')
+        if not separator:
+            raise ValueError(f"Parameters must be given as name=value: {item}")
+        params[name.strip()] = value
+    return params
+
+def execute_analysis(
+    connection: 'DatabaseConnection',
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    max_scan: Optional[int] = None,
+    confirm: Optional[Callable[[str], bool]] = None
+) -> Optional['pd.DataFrame']:
+    # Shared by run_analysis and the query daemon, which passes a pooled connection
+    logger.info("Executing query...")
+    
+    # Catalog templates bind %(name)s parameters; qmark backends need them positional
+    info = preprocess(query, connection.backend)
+    if params and connection.placeholder == '?' and info.param_style == 'pyformat':
+        query, params = convert_placeholders(query, params, 'qmark', connection.backend)
+    
+    # Optional EXPLAIN-based cost check (see db/preflight.py)
+    if not guard_query(connection, query, params, max_scan, confirm):
+        return None
+    
+    # Multi-statement scripts (e.g. temp tables followed by a final SELECT) run in
+    # one transaction; the last result set is the analysis result
+    if not params and preprocess(query, connection.backend).is_multi:
+        result_sets = connection.execute_script(query)
+        results = result_sets[-1] if result_sets else None
+    else:
+        results = connection.execute_query(query, params)
+    
+    if results is None or results.empty:
+        logger.warning("Query returned no results")
+        import pandas as pd
+        
+        return pd.DataFrame()
+    
+    logger.info(f"Query returned {len(results)} rows")
+    return results
+
 def run_analysis(
     db_type: str, 
     query: str, 
-    params: Optional[Dict[str, Any]] = None
-) -> Optional[pd.DataFrame]:
+    params: Optional[Dict[str, Any]] = None,
+    max_scan: Optional[int] = None,
+    confirm: Optional[Callable[[str], bool]] = None
+) -> Optional['pd.DataFrame']:
+    # Queries estimated to scan more than max_scan rows (PREFLIGHT_MAX_SCAN) are
+    # refused unless confirm, called with the pre-flight explanation, returns True
     connection = None
     try:
         # Get the appropriate database connection
@@ -90,17 +157,7 @@ def run_analysis(
             logger.error(f"Failed to connect to {db_type} database")
             return None
         
-        # Execute the query
-        logger.info("Executing query...")
-        
-        results = connection.execute_query(query, params)
-        
-        if results is None or results.empty:
-            logger.warning("Query returned no results")
-            return pd.DataFrame()
-        
-        logger.info(f"Query returned {len(results)} rows")
-        return results
+        return execute_analysis(connection, query, params, max_scan, confirm)
         
     except Exception as e:
         logger.error(f"Error during analysis: {e}")
@@ -118,26 +175,66 @@ def parse_arguments():
         '--db', '-d',
         type=str,
         default='mysql',
-        choices=['mysql', 'postgres', 'snowflake'],
+        choices=['mysql', 'postgres', 'snowflake', 'duckdb'],
         help='Database type to connect to'
     )
     
     parser.add_argument(
         '--query', '-q',
         type=str,
-        required=True,
         help='Name of query in the queries package or path to a query file'
     )
     
+    parser.add_argument(
+        '--param', '-p',
+        action='append',
+        metavar='NAME=VALUE',
+        help='Value for a query parameter declared in the query header (repeatable)'
+    )
+    
+    parser.add_argument(
+        '--priority',
+        type=str,
+        default='interactive',
+        choices=list(PRIORITIES),
+        help='Admission priority of the query (batch jobs queue behind interactive runs)'
+    )
+    
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Run the query in this process even if a query daemon is running'
+    )
+    
+    parser.add_argument(
+        '--max-scan',
+        type=int,
+        metavar='ROWS',
+        help='EXPLAIN the query first and refuse (or, on a terminal, confirm) it if it '
+             'would scan more rows'
+    )
+    
+    parser.add_argument(
+        '--stats',
+        nargs='?',
+        type=int,
+        const=20,
+        metavar='N',
+        help='Show the N most expensive queries from the query statistics (default 20)'
+    )
+    
     parser.add_argument(
         '--list', '-l',
         action='store_true',
         help='List available queries in the queries package'
     )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not args.query and not args.list and args.stats is None:
+        parser.error('the following arguments are required: --query/-q')
+    return args
 
-def save_results_as_pickle(results: pd.DataFrame, query_name: str) -> str:
+def save_results_as_pickle(results: 'pd.DataFrame', query_name: str) -> str:
     # Create outputs directory if it doesn't exist
     outputs_dir = Path('outputs')
     outputs_dir.mkdir(exist_ok=True)
@@ -163,6 +260,11 @@ def main() -> None:
     
     # Parse command line arguments
     args = parse_arguments()
+    configure_logging()
+    
+    if args.stats is not None:
+        show_query_stats(args.stats)
+        return
     
     # If --list flag is set, just list available queries and exit
     if args.list:
@@ -175,20 +277,100 @@ def main() -> None:
             print("No queries available in the package.")
         return
     
-    # Load the query from the specified file or name
-    query = load_query_from_file(args.query)
-    if not query:
+    try:
+        raw_params = parse_params(args.param)
+    except ValueError as e:
+        print(f"Invalid query parameters: {e}")
+        return
+    
+    # A running query daemon already holds warm connections; without one the query
+    # runs in this process. Pre-flight checks run in-process so they can ask for
+    # confirmation.
+    if not args.no_daemon and args.max_scan is None and daemon_enabled():
+        try:
+            results = forward_query(args.db, args.query, raw_params, args.priority)
+        except KeyboardInterrupt:
+            print("\nQuery cancelled.")
+            sys.exit(130)
+        except DaemonUnavailable as e:
+            logger.debug(f"Running in-process: {e}")
+        except ValueError as e:
+            print(f"Could not run query: {e}")
+            print("Use --list to see available queries")
+            return
+        else:
+            print(f"Executed query '{args.query}' against {args.db} database via the query daemon")
+            show_results(results, args)
+            return
+    
+    # Load the query from the specified file or name and bind its parameters
+    compiled = resolve_query(args.query)
+    if not compiled:
+        logger.error(f"Query file not found: {args.query}")
+        available_queries = list_available_queries()
+        if available_queries:
+            logger.info(f"Available queries: {', '.join(available_queries)}")
         print(f"Could not load query: {args.query}")
         print("Use --list to see available queries")
         return
+    try:
+        query, params = compiled.bind(raw_params)
+    except ValueError as e:
+        print(f"Invalid query parameters: {e}")
+        return
+    if not query:
+        print(f"Query is empty: {args.query}")
+        return
     
     # Run the analysis
     logger.info(f"Starting {args.db} analysis...")
     print(f"Executing query '{args.query}' against {args.db} database...")
     
-    results = run_analysis(args.db, query)
+    # Ctrl-C cancels the query on the server (see db/cancel.py) before exiting
+    try:
+        with query_priority(args.priority):
+            results = run_analysis(args.db, query, params, args.max_scan, confirm_on_terminal)
+    except KeyboardInterrupt:
+        print("\nQuery cancelled.")
+        sys.exit(130)
+    
+    show_results(results, args)
+
+def confirm_on_terminal(message: str) -> bool:
+    # Queries over the pre-flight limits are refused when nobody can answer
+    if not sys.stdin.isatty():
+        return False
+    print(message)
+    return input("Run the query anyway? [y/N] ").strip().lower() in ('y', 'yes')
+
+def show_query_stats(limit: int) -> None:
+    # Statistics saved by finished processes (QUERY_STATS_FILE) plus those of a
+    # running query daemon, which are saved when it exits
+    from cursor_analytics.db.stats import StatsRegistry, load_stats
+    
+    registry = StatsRegistry()
+    stats_file = os.getenv('QUERY_STATS_FILE')
+    if stats_file:
+        registry.merge(load_stats(stats_file))
+    if daemon_enabled():
+        try:
+            reply = request_daemon('stats')
+            registry.merge(StatsRegistry.from_dict(reply.get('stats', {})))
+        except DaemonUnavailable:
+            pass
     
-    # Display results
+    top = registry.top(limit)
+    if not top:
+        print("No query statistics recorded. Set QUERY_STATS_FILE to keep them across runs.")
+        return
+    
+    import pandas as pd
+    
+    with pd.option_context('display.max_columns', None, 'display.width', 200,
+                           'display.max_colwidth', 60):
+        print(pd.DataFrame(top).set_index('fingerprint'))
+
+def show_results(results: Optional['pd.DataFrame'], args: argparse.Namespace) -> None:
     if results is not None and not results.empty:
         print("\nQuery Results:")
         print("==============")
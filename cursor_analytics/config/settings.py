@@ -2,19 +2,30 @@
 Configuration settings for the Cursor Analytics package.
 
 This module loads environment variables and provides
-configuration settings for the package.
+configuration settings for the package. Nothing happens at import time: the .env
+file is loaded and the settings are resolved when `settings` is first used.
 """
 
 import os
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-# Load environment variables from .env file if present
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # python-dotenv not installed
+_env_loaded = False
+_settings: Optional['Settings'] = None
+_lock = threading.Lock()
+
+def load_environment() -> None:
+    # Loads the .env file (if python-dotenv is installed) once per process
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass  # python-dotenv not installed
 
 # Base directory is the parent of the project root
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -33,6 +44,8 @@ class Settings:
     """
     
     def __init__(self):
+        load_environment()
+        
         # Database settings (can be overridden by environment variables)
         self.mysql_host = os.getenv("MYSQL_HOST", "localhost")
         self.mysql_port = int(os.getenv("MYSQL_PORT", "3306"))
@@ -40,12 +53,16 @@ class Settings:
         self.mysql_password = os.getenv("MYSQL_PASSWORD", "")
         self.mysql_database = os.getenv("MYSQL_DATABASE", "")
         
-        # Output directory for generated files
-        self.output_dir = os.getenv("OUTPUT_DIR", DEFAULT_OUTPUT_DIR)
-        
-        # Create output directory if it doesn't exist
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        self._output_dir: Optional[str] = None
+    
+    @property
+    def output_dir(self) -> str:
+        # Output directory for generated files, created when it is first needed
+        if self._output_dir is None:
+            output_dir = os.getenv("OUTPUT_DIR", DEFAULT_OUTPUT_DIR)
+            os.makedirs(output_dir, exist_ok=True)
+            self._output_dir = output_dir
+        return self._output_dir
     
     @property
     def mysql_connection_string(self) -> str:
@@ -87,5 +104,17 @@ class Settings:
         
         return config
 
-# Create a singleton instance of the settings
-settings = Settings() 
\ No newline at end of file
+def get_settings() -> Settings:
+    global _settings
+    with _lock:
+        if _settings is None:
+            _settings = Settings()
+        return _settings
+
+def __getattr__(name: str) -> Any:
+    # `from cursor_analytics.config.settings import settings` still works; the
+    # singleton is created on that first access rather than at import time
+    if name == 'settings':
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+ 
\ No newline at end of file
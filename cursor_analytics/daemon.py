@@ -0,0 +1,402 @@
+"""
+Query Daemon Module
+
+This module provides a long-lived local daemon that runs queries for the analytics
+CLI. Every CLI invocation otherwise pays for a database handshake and for compiling
+its query; the daemon keeps warm connection pools (with their prepared statements),
+the compiled query catalog and one admission queue across invocations.
+
+The daemon listens on a Unix socket (QUERY_DAEMON_SOCKET, readable by the current
+user only). A request is a single JSON line; the reply is a JSON header line
+followed, for successful queries, by the result as an Arrow IPC stream. The client
+functions only need the standard library until a result arrives, and raise
+DaemonUnavailable whenever the CLI should run the query in-process instead.
+
+Each query carries a fingerprint of the caller's connection settings (the MYSQL_*,
+POSTGRES_*, SNOWFLAKE_* and DUCKDB_* environment variables). A daemon started with
+different settings refuses the query before running it, so the CLI never gets a
+result from another database than the one it is configured for.
+
+    python -m cursor_analytics.daemon start     # serve in the foreground
+    python -m cursor_analytics.daemon status
+    python -m cursor_analytics.daemon stop
+
+Classes:
+    QueryDaemon: Unix socket server running queries on pooled connections
+    DaemonUnavailable: Raised when no daemon can serve a request
+
+Functions:
+    socket_path: Path of the daemon socket
+    daemon_enabled: Whether the CLI should try the daemon
+    environment_fingerprint: Hash of the connection settings in the environment
+    request_daemon: Send a control request (status, stats, cancel, shutdown) to the daemon
+    forward_query: Run a query through the daemon and return its result
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import hashlib
+import socket
+import logging
+import argparse
+import tempfile
+import threading
+import socketserver
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+CONNECT_TIMEOUT = 0.5  # seconds; a missing or hung daemon must not slow the CLI down
+# Environment variables configuring the connections of each backend
+CONNECTION_ENV_PREFIXES = ('MYSQL_', 'POSTGRES_', 'SNOWFLAKE_', 'DUCKDB_')
+
+
+class DaemonUnavailable(Exception):
+    pass
+
+
+def socket_path() -> str:
+    default = os.path.join(tempfile.gettempdir(), f"cursor_analytics-{os.getuid()}.sock")
+    return os.getenv('QUERY_DAEMON_SOCKET', default)
+
+
+def daemon_enabled() -> bool:
+    return os.getenv('QUERY_DAEMON', 'auto').lower() not in ('off', 'false', '0', 'no')
+
+
+def environment_fingerprint() -> str:
+    # Hashed, so credentials never leave the process in clear text
+    settings = sorted(
+        (name, value) for name, value in os.environ.items()
+        if name.startswith(CONNECTION_ENV_PREFIXES)
+    )
+    return hashlib.sha256(json.dumps(settings).encode()).hexdigest()
+
+
+def _connect(path: Optional[str] = None) -> socket.socket:
+    path = path or socket_path()
+    if not os.path.exists(path):
+        raise DaemonUnavailable(f"No daemon socket at {path}")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(path)
+    except OSError as e:
+        sock.close()
+        raise DaemonUnavailable(f"Daemon at {path} is not accepting connections: {e}") from e
+    # Queries may legitimately run for a long time once the daemon has accepted them
+    sock.settimeout(None)
+    return sock
+
+
+def _send(sock: socket.socket, request: Dict[str, Any]) -> Tuple[BinaryIO, Dict[str, Any]]:
+    sock.sendall(json.dumps(request, default=str).encode() + b'\n')
+    reader = sock.makefile('rb')
+    line = reader.readline()
+    if not line:
+        raise DaemonUnavailable("Daemon closed the connection without replying")
+    return reader, json.loads(line)
+
+
+def request_daemon(op: str, path: Optional[str] = None, **fields: Any) -> Dict[str, Any]:
+    """
+    Send a control request to the daemon.
+
+    Args:
+        op: 'status', 'stats' (query statistics), 'cancel' (with a request_id) or
+            'shutdown'
+        path: Socket path (defaults to socket_path())
+        **fields: Further fields of the request
+
+    Returns:
+        Dict[str, Any]: The daemon's reply
+    """
+    with _connect(path) as sock:
+        _, header = _send(sock, {'op': op, **fields})
+        return header
+
+
+def forward_query(
+    db_type: str,
+    query: str,
+    params: Optional[Dict[str, str]] = None,
+    priority: str = 'interactive',
+    path: Optional[str] = None
+) -> Any:
+    """
+    Run a query through the daemon.
+
+    Args:
+        db_type: Database type, as for analytics.run_analysis
+        query: Name of a catalog query or path to a query file
+        params: Raw parameter values from the command line, bound by the daemon
+        priority: Admission priority of the query
+        path: Socket path (defaults to socket_path())
+
+    Returns:
+        Optional[pd.DataFrame]: The result (empty when the query returned no rows),
+        None when the query failed on the database
+
+    Raises:
+        DaemonUnavailable: No daemon could serve the request; run it in-process
+        ValueError: The query could not be found or its parameters are invalid
+    """
+    request = {
+        'op': 'query',
+        'db': db_type,
+        'query': query,
+        'params': params or {},
+        'priority': priority,
+        # Paths are resolved relative to the caller; the parent process identifies the
+        # calling script for fair queuing
+        'cwd': os.getcwd(),
+        'client': os.getenv('QUERY_CLIENT', f"pid-{os.getppid()}"),
+        'request_id': uuid.uuid4().hex,
+        'environment': environment_fingerprint()
+    }
+    with _connect(path) as sock:
+        try:
+            reader, header = _send(sock, request)
+        except KeyboardInterrupt:
+            # Closing the socket does not stop the query; ask the daemon to cancel it
+            try:
+                request_daemon('cancel', path, request_id=request['request_id'])
+            except (DaemonUnavailable, OSError) as e:
+                logger.warning(f"Could not cancel the query in the daemon: {e}")
+            raise
+        status = header.get('status')
+        if status == 'ok':
+            import pyarrow as pa
+
+            return pa.ipc.open_stream(reader).read_all().to_pandas()
+        if status == 'failed':
+            logger.error(f"Daemon query failed: {header.get('message')}")
+            return None
+        if status == 'invalid':
+            raise ValueError(header.get('message'))
+        raise DaemonUnavailable(header.get('message', f"Unexpected daemon reply: {header}"))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            self._reply({'status': 'error', 'message': 'Malformed request'})
+            return
+        header, table = self.server.daemon.handle(request)
+        self._reply(header)
+        if table is not None:
+            import pyarrow as pa
+
+            with pa.ipc.new_stream(self.wfile, table.schema) as writer:
+                writer.write_table(table)
+
+    def _reply(self, header: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(header, default=str).encode() + b'\n')
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class QueryDaemon:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        connection_factories: Optional[Dict[str, Callable[[], Any]]] = None
+    ):
+        from cursor_analytics.queries.dag import BACKEND_CLASSES
+
+        self.path = path or socket_path()
+        self.pool_size = pool_size or int(os.getenv('QUERY_DAEMON_POOL_SIZE',
+                                                    str(DEFAULT_POOL_SIZE)))
+        self.connection_factories = connection_factories or BACKEND_CLASSES
+        self.started_at = time.time()
+        # Connection settings the pools are created from
+        self.environment = environment_fingerprint()
+        self.requests = 0
+        self._pools: Dict[str, Any] = {}
+        # Connections running a query, by request_id, for cancel requests
+        self._running: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    def _pool(self, db_type: str) -> Any:
+        from cursor_analytics.db.pool import ConnectionPool
+
+        with self._lock:
+            if db_type not in self._pools:
+                if db_type not in self.connection_factories:
+                    raise ValueError(f"Unsupported database type: {db_type}")
+                template = self.connection_factories[db_type]()
+                self._pools[db_type] = ConnectionPool(template, max_size=self.pool_size)
+            return self._pools[db_type]
+
+    def handle(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+        op = request.get('op')
+        if op == 'status':
+            return {'status': 'ok', **self.stats()}, None
+        if op == 'stats':
+            from cursor_analytics.db.stats import get_stats_registry
+
+            return {'status': 'ok', 'stats': get_stats_registry().to_dict()}, None
+        if op == 'cancel':
+            with self._lock:
+                connection = self._running.get(request.get('request_id'))
+            report = connection.cancel(reason='client interrupted') if connection else None
+            return {'status': 'ok', 'cancel': report}, None
+        if op == 'shutdown':
+            threading.Thread(target=self.shutdown).start()
+            return {'status': 'ok'}, None
+        if op == 'query':
+            with self._lock:
+                self.requests += 1
+            return self._run_query(request)
+        return {'status': 'error', 'message': f"Unknown operation: {op}"}, None
+
+    def _run_query(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+        import pyarrow as pa
+
+        from cursor_analytics.analytics import execute_analysis, resolve_query
+        from cursor_analytics.queries import get_query
+        from cursor_analytics.db.admission import query_priority, query_client
+
+        name = request.get('query', '')
+        if request.get('environment') != self.environment:
+            # Refused before anything runs; the client falls back to running in-process
+            message = "The daemon runs with other connection settings; restart it to use them"
+            return {'status': 'error', 'message': message}, None
+        try:
+            # Catalog names win over files, as in the CLI; files are relative to the caller
+            compiled = get_query(name) or resolve_query(
+                os.path.join(request.get('cwd', ''), name)
+            )
+            if not compiled:
+                return {'status': 'invalid', 'message': f"Could not load query: {name}"}, None
+            sql, params = compiled.bind(request.get('params'))
+            pool = self._pool(request.get('db', 'mysql'))
+        except ValueError as e:
+            return {'status': 'invalid', 'message': str(e)}, None
+
+        start_time = time.time()
+        try:
+            with query_priority(request.get('priority', 'interactive')), \
+                    query_client(request.get('client', 'daemon')), \
+                    pool.connection() as connection:
+                request_id = request.get('request_id')
+                with self._lock:
+                    self._running[request_id] = connection
+                try:
+                    results = execute_analysis(connection, sql, params)
+                finally:
+                    with self._lock:
+                        self._running.pop(request_id, None)
+        except Exception as e:
+            logger.error(f"Error running {name}: {e}")
+            return {'status': 'failed', 'message': str(e)}, None
+        if results is None:
+            return {'status': 'failed', 'message': f"Query {name} failed"}, None
+
+        try:
+            table = pa.Table.from_pandas(results, preserve_index=False)
+        except (pa.ArrowException, ValueError) as e:
+            # The query already ran, so the client must not rerun it (it may have written)
+            logger.warning(f"Result of {name} cannot be sent as Arrow: {e}")
+            return {
+                'status': 'failed',
+                'message': f"Result cannot be sent as Arrow ({e}); run with QUERY_DAEMON=off"
+            }, None
+        logger.info(f"{name}: {len(results)} rows in {time.time() - start_time:.2f} seconds")
+        return {'status': 'ok', 'rows': len(results)}, table
+
+    def stats(self) -> Dict[str, Any]:
+        from cursor_analytics.db.admission import get_admission_controller
+
+        return {
+            'pid': os.getpid(),
+            'uptime_seconds': time.time() - self.started_at,
+            'requests': self.requests,
+            'pools': {db_type: pool.size for db_type, pool in self._pools.items()},
+            'admission': get_admission_controller().stats()
+        }
+
+    def bind(self) -> None:
+        if os.path.exists(self.path):
+            try:
+                request_daemon('status', self.path)
+            except DaemonUnavailable:
+                # Left behind by a daemon that did not shut down cleanly
+                os.unlink(self.path)
+            else:
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.path, _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+        self._server.daemon = self
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.bind()
+        logger.info(f"Query daemon listening on {self.path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        for pool in self._pools.values():
+            pool.close()
+        self._pools = {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Local query daemon for the analytics CLI')
+    parser.add_argument('command', choices=['start', 'status', 'stop'])
+    parser.add_argument('--socket', type=str, help='Socket path (default: QUERY_DAEMON_SOCKET)')
+    parser.add_argument('--pool-size', type=int, help='Pooled connections per database type')
+    args = parser.parse_args()
+
+    if args.command == 'start':
+        from cursor_analytics.config.settings import load_environment
+        from cursor_analytics.utils.logger import configure_logging
+
+        load_environment()
+        configure_logging()
+        daemon = QueryDaemon(args.socket, args.pool_size)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    try:
+        reply = request_daemon('status' if args.command == 'status' else 'shutdown', args.socket)
+    except DaemonUnavailable as e:
+        print(f"No daemon running: {e}")
+        sys.exit(1)
+    print(json.dumps(reply, indent=2, default=str) if args.command == 'status' else 'Stopped')
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,60 @@
 Cursor Analytics Database Module
 
 Provides database connection and schema analysis functionality.
+
+Names are imported from their submodules on first access, so lightweight modules
+such as db.sql_parser or db.admission can be used without importing pandas.
 """
 
-from cursor_analytics.db.connection import (
-    get_mysql_connection,
-    get_postgres_connection,
-    get_snowflake_connection,
-    DatabaseConnection,
-    MySQLConnection,
-    PostgreSQLConnection,
-    SnowflakeConnection
-)
-
-__all__ = [
-    'get_mysql_connection',
-    'get_postgres_connection',
-    'get_snowflake_connection',
-    'DatabaseConnection',
-    'MySQLConnection',
-    'PostgreSQLConnection',
-    'SnowflakeConnection'
-] 
\ No newline at end of file
+import sys
+import types
+import importlib
+from typing import Any, List
+
+_LAZY_ATTRIBUTES = {
+    'get_mysql_connection': 'cursor_analytics.db.connection',
+    'get_postgres_connection': 'cursor_analytics.db.connection',
+    'get_snowflake_connection': 'cursor_analytics.db.connection',
+    'get_duckdb_connection': 'cursor_analytics.db.connection',
+    'DatabaseConnection': 'cursor_analytics.db.connection',
+    'MySQLConnection': 'cursor_analytics.db.connection',
+    'PostgreSQLConnection': 'cursor_analytics.db.connection',
+    'SnowflakeConnection': 'cursor_analytics.db.connection',
+    'DuckDBConnection': 'cursor_analytics.db.connection',
+    'FederatedQuery': 'cursor_analytics.db.federated',
+    'federated_query': 'cursor_analytics.db.federated',
+    'ConnectionPool': 'cursor_analytics.db.pool',
+    'enrich': 'cursor_analytics.db.enrich',
+    'export_table': 'cursor_analytics.db.export',
+    'read_partitioned': 'cursor_analytics.db.partition',
+    'execute_many_params': 'cursor_analytics.db.sweep',
+    'get_admission_controller': 'cursor_analytics.db.admission',
+    'query_priority': 'cursor_analytics.db.admission',
+    'query_client': 'cursor_analytics.db.admission'
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
+
+
+class _LazyPackage(types.ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Importing db.enrich binds the submodule to the package attribute of the same
+        # name; keep the attribute pointing at the function the package exports
+        if isinstance(value, types.ModuleType) and _LAZY_ATTRIBUTES.get(name) == value.__name__:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyPackage
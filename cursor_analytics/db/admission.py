@@ -0,0 +1,257 @@
+"""
+Query Admission Module
+
+This module is a client-side scheduler that every query passes through before it
+reaches a database. It caps concurrent queries per backend and per host, admits
+waiting queries by priority class (interactive ahead of normal ahead of batch) and,
+within a class, fairly across clients (start-time fair queuing, so one job that
+queues a hundred queries cannot starve an analyst who queues one). Queue waits are
+recorded per backend.
+
+The priority and client of the current code path are context variables, set with
+the query_priority() and query_client() context managers. Queries issued while the
+same context already holds a slot (e.g. a query inside a stream_query loop) are not
+queued again, so nested queries cannot deadlock on their own slot.
+
+Classes:
+    AdmissionController: Concurrency caps, priority/fair queue and wait metrics
+    QueueTimeout: Raised when a query waited longer than the queue timeout
+
+Functions:
+    get_admission_controller: Process-wide controller used by DatabaseConnection
+    set_admission_controller: Replace the process-wide controller
+    query_priority: Context manager setting the priority class of queries
+    query_client: Context manager setting the client name used for fair queuing
+    slot_held: Whether the current context already holds a query slot
+"""
+
+import os
+import time
+import logging
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {'interactive': 0, 'normal': 1, 'batch': 2}
+DEFAULT_BACKEND_CONCURRENCY = 8
+DEFAULT_HOST_CONCURRENCY = 4
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    'query_priority', default=os.getenv('QUERY_PRIORITY', 'normal')
+)
+_client: contextvars.ContextVar[str] = contextvars.ContextVar(
+    'query_client', default=os.getenv('QUERY_CLIENT', f"pid-{os.getpid()}")
+)
+_held: contextvars.ContextVar[bool] = contextvars.ContextVar('query_slot_held', default=False)
+
+
+class QueueTimeout(Exception):
+    pass
+
+
+@contextmanager
+def query_priority(priority: str) -> Iterator[None]:
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority}. Use one of {', '.join(PRIORITIES)}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def query_client(client: str) -> Iterator[None]:
+    token = _client.set(client)
+    try:
+        yield
+    finally:
+        _client.reset(token)
+
+
+def slot_held() -> bool:
+    return _held.get()
+
+
+class _Ticket:
+    def __init__(self, keys: List[str], priority: int, tag: float, seq: int, backend: str):
+        self.keys = keys
+        self.order = (priority, tag, seq)
+        self.backend = backend
+        self.enqueued_at = time.monotonic()
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        backend_limits: Optional[Dict[str, int]] = None,
+        host_limit: int = DEFAULT_HOST_CONCURRENCY,
+        default_backend_limit: int = DEFAULT_BACKEND_CONCURRENCY,
+        queue_timeout: Optional[float] = None
+    ):
+        # A limit of 0 means unlimited
+        self.backend_limits = dict(backend_limits or {})
+        self.host_limit = host_limit
+        self.default_backend_limit = default_backend_limit
+        self.queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self._running: Dict[str, int] = {}
+        self._waiting: List[_Ticket] = []
+        self._seq = itertools.count()
+        # Start-time fair queuing: a virtual clock and the last tag issued per client
+        self._virtual_time = 0.0
+        self._client_tags: Dict[str, float] = {}
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_env(cls) -> 'AdmissionController':
+        backend_limits = {}
+        for backend in ('mysql', 'postgres', 'snowflake', 'duckdb'):
+            value = os.getenv(f"QUERY_CONCURRENCY_{backend.upper()}")
+            if value is not None:
+                backend_limits[backend] = int(value)
+        timeout = os.getenv('QUERY_QUEUE_TIMEOUT')
+        return cls(
+            backend_limits,
+            host_limit=int(os.getenv('QUERY_CONCURRENCY_PER_HOST', str(DEFAULT_HOST_CONCURRENCY))),
+            default_backend_limit=int(
+                os.getenv('QUERY_CONCURRENCY_PER_BACKEND', str(DEFAULT_BACKEND_CONCURRENCY))
+            ),
+            queue_timeout=float(timeout) if timeout else None
+        )
+
+    def _limit(self, key: str) -> int:
+        kind, _, name = key.partition(':')
+        if kind == 'host':
+            return self.host_limit
+        return self.backend_limits.get(name, self.default_backend_limit)
+
+    def _has_capacity(self, keys: List[str]) -> bool:
+        return all(
+            not self._limit(key) or self._running.get(key, 0) < self._limit(key) for key in keys
+        )
+
+    def _admissible(self, ticket: _Ticket) -> bool:
+        # A ticket runs once its slots are free and no better-ordered ticket is waiting
+        # for any of the same slots; tickets for other backends/hosts do not block it
+        if not self._has_capacity(ticket.keys):
+            return False
+        return not any(
+            other.order < ticket.order and set(other.keys) & set(ticket.keys)
+            for other in self._waiting
+        )
+
+    def _metric(self, backend: str) -> Dict[str, Any]:
+        return self._metrics.setdefault(backend, {
+            'admitted': 0, 'queued': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0,
+            'timeouts': 0, 'by_priority': {}
+        })
+
+    @contextmanager
+    def admit(self, backend: str, host: Optional[str] = None) -> Iterator[float]:
+        """
+        Hold a query slot for the backend (and host) for the duration of the block.
+
+        Args:
+            backend: Backend name, e.g. 'mysql'
+            host: Database host (or account/path) the query runs on
+
+        Yields:
+            float: Seconds the query waited in the queue
+        """
+        if _held.get():
+            yield 0.0
+            return
+
+        keys = [f"backend:{backend}"] + ([f"host:{backend}/{host}"] if host else [])
+        priority = _priority.get()
+        client = _client.get()
+        wait_seconds = self._acquire(keys, backend, priority, client)
+        token = _held.set(True)
+        try:
+            yield wait_seconds
+        finally:
+            try:
+                _held.reset(token)
+            except ValueError:
+                # A generator (stream_query) closed from another context
+                _held.set(False)
+            self._release(keys)
+
+    def _acquire(self, keys: List[str], backend: str, priority: str, client: str) -> float:
+        with self._condition:
+            tag = max(self._virtual_time, self._client_tags.get(client, 0.0)) + 1
+            self._client_tags[client] = tag
+            ticket = _Ticket(keys, PRIORITIES.get(priority, PRIORITIES['normal']), tag,
+                             next(self._seq), backend)
+            self._waiting.append(ticket)
+            deadline = time.monotonic() + self.queue_timeout if self.queue_timeout else None
+            try:
+                while not self._admissible(ticket):
+                    remaining = deadline - time.monotonic() if deadline else None
+                    if remaining is not None and remaining <= 0:
+                        self._metric(backend)['timeouts'] += 1
+                        raise QueueTimeout(
+                            f"{backend} query waited more than {self.queue_timeout} seconds"
+                        )
+                    self._condition.wait(remaining)
+            finally:
+                self._waiting.remove(ticket)
+                # Other waiters may have been blocked behind this ticket
+                self._condition.notify_all()
+
+            for key in keys:
+                self._running[key] = self._running.get(key, 0) + 1
+            self._virtual_time = max(self._virtual_time, tag)
+
+            waited = time.monotonic() - ticket.enqueued_at
+            metric = self._metric(backend)
+            metric['admitted'] += 1
+            metric['queued'] += waited > 0.001
+            metric['wait_seconds'] += waited
+            metric['max_wait_seconds'] = max(metric['max_wait_seconds'], waited)
+            metric['by_priority'][priority] = metric['by_priority'].get(priority, 0) + 1
+        if waited > 1:
+            logger.info(f"{priority} {backend} query waited {waited:.2f} seconds for a slot")
+        return waited
+
+    def _release(self, keys: List[str]) -> None:
+        with self._condition:
+            for key in keys:
+                self._running[key] -= 1
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            stats: Dict[str, Any] = {}
+            for backend, metric in self._metrics.items():
+                entry = dict(metric, by_priority=dict(metric['by_priority']))
+                entry['mean_wait_seconds'] = (
+                    metric['wait_seconds'] / metric['admitted'] if metric['admitted'] else 0.0
+                )
+                entry['running'] = self._running.get(f"backend:{backend}", 0)
+                entry['waiting'] = sum(1 for ticket in self._waiting if ticket.backend == backend)
+                stats[backend] = entry
+            return stats
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController.from_env()
+        return _controller
+
+
+def set_admission_controller(controller: AdmissionController) -> None:
+    global _controller
+    with _controller_lock:
+        _controller = controller
@@ -0,0 +1,167 @@
+"""
+Query Cancellation Module
+
+This module stops queries on the server when their client gives up on them.
+DatabaseConnection.cancel() cancels the statement running on a connection (KILL
+QUERY on MySQL, a cancel request on PostgreSQL, SYSTEM$CANCEL_QUERY on Snowflake,
+an interrupt on DuckDB); this module decides when to call it:
+
+    timeouts   a watchdog thread cancels queries that outlive their timeout by
+               QUERY_WATCHDOG_GRACE seconds, when the server's own timeout did not
+               stop them (e.g. a stalled connection); with QUERY_WATCHDOG=all it also
+               times out statements the server does not (MySQL writes, DuckDB)
+    Ctrl-C     run_interruptible() keeps the main thread responsive while a driver
+               blocks in C code, so a KeyboardInterrupt cancels the query instead
+               of waiting for it
+
+asyncio task cancellation is handled by DatabaseConnection.execute_query_async.
+
+Classes:
+    Watchdog: Cancels queries that run past their deadline
+
+Functions:
+    get_watchdog: Process-wide watchdog used by DatabaseConnection
+    run_interruptible: Run blocking work so that Ctrl-C interrupts its caller
+"""
+
+import os
+import time
+import heapq
+import logging
+import threading
+import itertools
+import contextvars
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCHDOG_GRACE = 1.0  # seconds past the server-side timeout
+# Seconds to wait for an interrupted driver call to return after its cancel
+INTERRUPT_WAIT = 10.0
+
+
+class Watchdog:
+    def __init__(self, grace: float = DEFAULT_WATCHDOG_GRACE, cover_all: bool = False):
+        self.grace = grace
+        # Whether to watch statements the server does not time out itself
+        self.cover_all = cover_all
+        self._deadlines: List[Tuple[float, int]] = []
+        self._watched: Dict[int, Any] = {}
+        self._tokens = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.cancelled = 0
+
+    def watch(self, connection: Any, timeout_seconds: float) -> int:
+        """
+        Cancel the query of a connection if it is still watched after its timeout.
+
+        Args:
+            connection: DatabaseConnection about to run a query
+            timeout_seconds: Timeout of the query; the watchdog adds its grace period
+
+        Returns:
+            int: Token to pass to unwatch() when the query ends
+        """
+        token = next(self._tokens)
+        deadline = time.monotonic() + timeout_seconds + self.grace
+        with self._condition:
+            self._watched[token] = connection
+            heapq.heappush(self._deadlines, (deadline, token))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='query-watchdog', daemon=True
+                )
+                self._thread.start()
+            elif self._deadlines[0][1] == token:
+                self._condition.notify()
+        return token
+
+    def unwatch(self, token: int) -> None:
+        # The deadline stays in the heap and is skipped when it comes up
+        with self._condition:
+            self._watched.pop(token, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._deadlines:
+                    self._condition.wait()
+                deadline, token = self._deadlines[0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                heapq.heappop(self._deadlines)
+                connection = self._watched.pop(token, None)
+            if connection is not None:
+                # Cancelling may open a side connection, so it happens outside the lock
+                if connection.cancel(reason='timeout'):
+                    self.cancelled += 1
+
+
+_watchdog: Optional[Watchdog] = None
+_watchdog_lock = threading.Lock()
+
+
+def get_watchdog() -> Optional[Watchdog]:
+    # QUERY_WATCHDOG: true (server-enforced timeouts only), all, or false (None)
+    global _watchdog
+    mode = os.getenv('QUERY_WATCHDOG', 'true').lower()
+    if mode not in ('true', 'all'):
+        return None
+    if _watchdog is None:
+        with _watchdog_lock:
+            if _watchdog is None:
+                _watchdog = Watchdog(
+                    float(os.getenv('QUERY_WATCHDOG_GRACE', str(DEFAULT_WATCHDOG_GRACE))),
+                    cover_all=mode == 'all'
+                )
+    return _watchdog
+
+
+def run_interruptible(
+    fn: Callable[[], Any],
+    on_interrupt: Callable[[], Any],
+    on_abandon: Optional[Callable[[], Any]] = None
+) -> Any:
+    """
+    Run blocking work on a helper thread while the calling thread waits for it.
+
+    Signals are only handled on the main thread, and only between bytecodes, so a
+    driver blocked in C code (libpq, the MySQL C extension) keeps the query running
+    until it returns. Waiting on a future is interruptible: on Ctrl-C, on_interrupt
+    cancels the query and the KeyboardInterrupt propagates once the driver returned.
+
+    Args:
+        fn: The blocking work
+        on_interrupt: Called on KeyboardInterrupt, e.g. to cancel the query
+        on_abandon: Called when fn has not returned INTERRUPT_WAIT seconds after the
+            interrupt, e.g. to drop its connection
+
+    Returns:
+        Any: The result of fn
+    """
+    future: Future = Future()
+    context = contextvars.copy_context()
+
+    def target() -> None:
+        try:
+            future.set_result(context.run(fn))
+        except BaseException as e:
+            future.set_exception(e)
+
+    # A daemon thread, so a driver that ignores the cancel cannot block interpreter exit
+    threading.Thread(target=target, name='query-runner', daemon=True).start()
+    try:
+        return future.result()
+    except KeyboardInterrupt:
+        on_interrupt()
+        try:
+            future.exception(timeout=INTERRUPT_WAIT)
+        except FutureTimeout:
+            logger.warning("Interrupted query did not return after its cancel")
+            if on_abandon is not None:
+                on_abandon()
+        raise
@@ -10,35 +10,208 @@ Classes:
     MySQLConnection: Implementation for MySQL databases
     PostgreSQLConnection: Implementation for PostgreSQL databases
     SnowflakeConnection: Implementation for Snowflake data warehouses
+    DuckDBConnection: Implementation for local DuckDB databases
 
 Functions:
     get_mysql_connection: Factory function for MySQL connections
     get_postgres_connection: Factory function for PostgreSQL connections
     get_snowflake_connection: Factory function for Snowflake connections
+    get_duckdb_connection: Factory function for DuckDB connections
 """
 
+import io
 import os
+import asyncio
+import copy
+import json
+import time
+import uuid
 import logging
-from typing import Dict, Any, Optional, Union, List
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Union, List, Iterator, Tuple
 import pandas as pd
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from cursor_analytics.db.sql_parser import (
+    split_statements, returns_rows, is_compound, preprocess, convert_placeholders, READ
 )
+from cursor_analytics.db.dtypes import plan_dtypes, optimize_dtypes
+from cursor_analytics.db.convert import build_converted_frame
+from cursor_analytics.db.prepared import PreparedStatementCache, DEFAULT_CACHE_SIZE
+from cursor_analytics.db.admission import get_admission_controller, QueueTimeout, slot_held
+from cursor_analytics.db.singleflight import get_singleflight
+from cursor_analytics.db.instrumentation import phase, trace_query
+from cursor_analytics.db.stats import get_stats_registry
+from cursor_analytics.db.slowlog import get_slow_query_log
+from cursor_analytics.db.cancel import get_watchdog, run_interruptible
+
 logger = logging.getLogger(__name__)
 
 # Note: Environment variables should be loaded in the Makefile or by the system before running
 
+WRITE_MODES = ('append', 'replace', 'upsert')
+DEFAULT_WRITE_CHUNK_SIZE = 50000
+# Rows fetched per network round trip by PostgreSQL server-side cursors
+DEFAULT_POSTGRES_ITERSIZE = 2000
+# Concurrent downloads of Snowflake Arrow result batches
+DEFAULT_SNOWFLAKE_FETCH_WORKERS = 4
+
+def _copy_on_write() -> bool:
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except Exception:
+        return False
+
+_COPY_ON_WRITE = _copy_on_write()
+
+def _flight_view(result: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    # Gives each caller of a shared flight its own frame. Under Copy-on-Write a shallow
+    # copy is an independent zero-copy view; older pandas shares the buffers of shallow
+    # copies, so callers get a real copy there
+    if result is None:
+        return None
+    return result.copy(deep=not _COPY_ON_WRITE)
+
+# Characters LOAD DATA reads as escape sequences, in the order they are escaped
+_MYSQL_LOAD_ESCAPES = (('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'), ('\r', '\\r'), ('\0', '\\0'))
+
+def _mysql_load_text(chunk: pd.DataFrame) -> str:
+    # MySQL's native LOAD DATA format: tab-separated, backslash-escaped and \N for
+    # NULL. Enclosed (CSV) fields would read a string cell 'NULL' as NULL.
+    fields = None
+    for column in range(chunk.shape[1]):
+        values = chunk.iloc[:, column]
+        if values.dtype == bool:
+            values = values.astype(int)  # MySQL expects 1/0 for booleans
+        text = values.astype(str)
+        if not pd.api.types.is_numeric_dtype(values.dtype):
+            for character, escaped in _MYSQL_LOAD_ESCAPES:
+                text = text.str.replace(character, escaped, regex=False)
+        text = text.where(values.notna(), '\\N')
+        fields = text if fields is None else fields + '\t' + text
+    if fields is None or fields.empty:
+        return ''
+    return '\n'.join(fields.tolist()) + '\n'
+
+def _postgres_copy_csv(chunk: pd.DataFrame) -> str:
+    # COPY's CSV format reads an unquoted empty field as NULL and a quoted one ("") as
+    # an empty string, so only empty strings are quoted. They are marked with a NUL
+    # byte, which PostgreSQL text cannot contain, while pandas writes the CSV.
+    chunk = chunk.copy()
+    for column in range(chunk.shape[1]):
+        values = chunk.iloc[:, column]
+        if not pd.api.types.is_numeric_dtype(values.dtype):
+            chunk.isetitem(column, values.mask(values.eq('') & values.notna(), '\0'))
+    buffer = io.StringIO()
+    chunk.to_csv(buffer, index=False, header=False, na_rep='', lineterminator='\n')
+    return buffer.getvalue().replace('\0', '""')
+
 class DatabaseConnection:
+    # Backend name used to interpret cursor.description type codes
+    backend = 'generic'
+    # DB-API placeholder used when building parameterized SQL programmatically
+    placeholder = '%s'
+    # Placeholder style of server-side prepared statements ('qmark' or 'numeric');
+    # None disables the prepared statement cache
+    prepared_style: Optional[str] = None
+    # Prefix turning a query into a statement that returns its plan as JSON
+    # (see db/explain.py); None when the backend has no JSON EXPLAIN
+    explain_prefix: Optional[str] = None
+    # Whether cancel() can stop a running statement on the server
+    supports_cancel = False
+
     def __init__(self):
         self.connection = None
+        # Compact result dtypes (see db/dtypes.py); column_types optionally maps
+        # column names to MySQL COLUMN_TYPE strings from the schema analyzer
+        self.optimize_dtypes = os.getenv('OPTIMIZE_DTYPES', 'false').lower() == 'true'
+        self.column_types: Dict[str, str] = {}
+        self.last_dtype_report: Optional[Dict[str, Any]] = None
+        # Bulk conversion of Decimal/TIME/bytes/JSON driver values (see db/convert.py);
+        # decimal_mode 'fixed' keeps DECIMAL columns exact as scaled integers
+        self.convert_values = os.getenv('CONVERT_DRIVER_VALUES', 'false').lower() == 'true'
+        self.decimal_mode = os.getenv('DECIMAL_MODE', 'float').lower()
+        self.statement_cache = self._new_statement_cache()
+        # Identical concurrent reads share one execution (see db/singleflight.py)
+        self.coalesce_queries = os.getenv('COALESCE_QUERIES', 'true').lower() == 'true'
+        # Serializes execute_query_async calls, which run on executor threads
+        self._async_lock = threading.Lock()
+        # (start, timeout in ms) of the statement in progress, for cancel()
+        self._running: Optional[Tuple[float, int]] = None
+        self._active_cursor: Any = None
+        self.last_cancel: Optional[Dict[str, Any]] = None
+        self._cancelled = False
+
+    def clone(self) -> 'DatabaseConnection':
+        # A disconnected copy with the same configuration, used to open extra
+        # connections to the same database (pools, side connections)
+        cloned = copy.copy(self)
+        if hasattr(self, 'config'):
+            cloned.config = dict(self.config)
+        cloned.connection = None
+        cloned.statement_cache = cloned._new_statement_cache()
+        cloned._async_lock = threading.Lock()
+        cloned._running = None
+        cloned._active_cursor = None
+        return cloned
+
+    def _new_statement_cache(self) -> PreparedStatementCache:
+        # Backends without a prepared_style get a disabled cache
+        max_size = int(os.getenv('PREPARED_CACHE_SIZE', str(DEFAULT_CACHE_SIZE)))
+        return PreparedStatementCache(
+            max_size if self.prepared_style else 0, on_evict=self._release_prepared
+        )
+
+    def _prepared_statement(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]]
+    ) -> Optional[Tuple[str, Any, List[Any]]]:
+        # Returns (cache key, statement handle, ordered params) for a parameterized
+        # statement that repeats on this connection, preparing it on the server the
+        # first time it repeats. None means: execute the query unprepared.
+        if not params or not self.statement_cache.enabled or not self._preparable(query):
+            return None
+
+        key = preprocess(query, self.backend).normalized
+        try:
+            statement, values = convert_placeholders(
+                query, params, self.prepared_style, self.backend
+            )
+        except (ValueError, KeyError, IndexError) as e:
+            logger.debug(f"Not preparing statement: {e}")
+            return None
+
+        handle = self.statement_cache.get(key)
+        if handle is None:
+            if not self.statement_cache.should_prepare(key):
+                return None
+            try:
+                handle = self._prepare(statement)
+            except Exception as e:
+                logger.warning(f"Failed to prepare statement, executing unprepared: {e}")
+                return None
+            self.statement_cache.put(key, handle)
+        return key, handle, values
+
+    def _preparable(self, query: str) -> bool:
+        # Whether running the query prepared keeps its execution path
+        return True
+
+    def _prepare(self, statement: str) -> Any:
+        raise NotImplementedError(f"{type(self).__name__} does not support prepared statements")
+
+    def _release_prepared(self, handle: Any) -> None:
+        pass
         
     def connect(self) -> bool:
         raise NotImplementedError("Subclasses must implement connect()")
     
     def disconnect(self) -> None:
+        self.statement_cache.invalidate()
         if self.connection:
             try:
                 self.connection.close()
@@ -49,17 +222,589 @@ class DatabaseConnection:
     def is_connected(self) -> bool:
         return self.connection is not None
     
+    @property
+    def host(self) -> Optional[str]:
+        # Identifies the server for per-host admission limits
+        config = getattr(self, 'config', {})
+        return config.get('host') or config.get('account') or config.get('database')
+
     def execute_query(
         self, 
         query: str, 
         params: Optional[Union[tuple, dict]] = None,
         timeout: int = 3000,
+        max_rows: int = 1000,
+        **kwargs: Any
+    ) -> Optional[pd.DataFrame]:
+        key = self._flight_key(query, params, timeout, max_rows, kwargs)
+        # Callers of a shared flight each get their own view of the same data; a caller
+        # that ran alone gets the frame as built
+        return get_singleflight().do(
+            key, lambda: self._admitted_query(query, params, timeout, max_rows, **kwargs),
+            share=_flight_view
+        )
+
+    async def execute_query_async(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        timeout: int = 3000,
+        max_rows: int = 1000,
+        **kwargs: Any
+    ) -> Optional[pd.DataFrame]:
+        # Runs execute_query's work on an executor thread; tasks sharing this
+        # connection take turns, identical concurrent reads share one execution
+        abandoned = threading.Event()
+        # Set while this task's own query runs: a task cancelled while it waits for
+        # its turn must not cancel the query of the task ahead of it
+        running = threading.Event()
+        state_lock = threading.Lock()
+
+        def run() -> Optional[pd.DataFrame]:
+            with self._async_lock:
+                with state_lock:
+                    if abandoned.is_set():
+                        return None
+                    running.set()
+                try:
+                    return self._admitted_query(query, params, timeout, max_rows, **kwargs)
+                finally:
+                    with state_lock:
+                        running.clear()
+
+        def cancel_own_query() -> None:
+            # Holding state_lock keeps the query from ending, and the next task's from
+            # starting, between the check and the cancel
+            with state_lock:
+                if running.is_set():
+                    self.cancel(reason='task cancelled')
+
+        key = self._flight_key(query, params, timeout, max_rows, kwargs)
+        try:
+            return await get_singleflight().do_async(key, run, share=_flight_view)
+        except asyncio.CancelledError:
+            # The executor thread cannot be interrupted, so the query is cancelled on
+            # the server instead, unless other callers are waiting for the same flight
+            with state_lock:
+                abandoned.set()
+            if key is None or not get_singleflight().shared(key):
+                asyncio.get_running_loop().run_in_executor(None, cancel_own_query)
+            raise
+
+    def _flight_key(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]],
+        timeout: int,
+        max_rows: int,
+        kwargs: Dict[str, Any]
+    ) -> Optional[Tuple]:
+        # Only plain reads are coalesced. A context that already holds a query slot
+        # runs its own query: the in-flight one might be waiting for that slot.
+        if not self.coalesce_queries or slot_held():
+            return None
+        info = preprocess(query, self.backend)
+        if info.kind != READ or not info.returns_rows or info.is_multi:
+            return None
+        config = getattr(self, 'config', {})
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        return (
+            self.backend, self.host, config.get('database'), config.get('user'),
+            info.normalized, repr(params), timeout, max_rows, repr(sorted(kwargs.items()))
+        )
+
+    def _admitted_query(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        timeout: int = 3000,
+        max_rows: int = 1000,
+        **kwargs: Any
+    ) -> Optional[pd.DataFrame]:
+        with trace_query(self.backend, query) as trace:
+            # Every query waits for a slot in the admission queue (see db/admission.py)
+            try:
+                with get_admission_controller().admit(self.backend, self.host) as wait_seconds:
+                    if trace is not None:
+                        trace.add('queue', wait_seconds)
+                    start_time = time.perf_counter()
+                    if not self.is_connected():
+                        with phase('connect'):
+                            if not self.connect():
+                                return None
+                    result = self._run_cancellable(query, params, timeout, max_rows, **kwargs)
+            except QueueTimeout as e:
+                logger.error(f"Query not admitted: {e}")
+                return None
+
+            if trace is not None:
+                trace.set_result(result)
+                if result is None and preprocess(query, self.backend).returns_rows:
+                    trace.error = 'query failed'
+
+        duration = time.perf_counter() - start_time
+        rows = None if result is None else len(result)
+        failed = result is None and preprocess(query, self.backend).returns_rows
+        get_stats_registry().record(self.backend, query, duration, rows, failed)
+        slow_log = get_slow_query_log()
+        if slow_log is not None:
+            slow_log.observe(self, query, params, duration, rows)
+        # Structured fields for JSON logs (LOG_FORMAT=json, see utils/logger.py)
+        logger.info(
+            f"{self.backend} query finished in {duration:.3f}s ({rows} rows)",
+            extra={
+                'query_fingerprint': preprocess(query, self.backend).fingerprint,
+                'backend': self.backend,
+                'duration_ms': round(duration * 1000, 3),
+                'queue_wait_ms': round(wait_seconds * 1000, 3),
+                'rows': rows
+            }
+        )
+        return result
+
+    def _execute_query(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        timeout: int = 3000,
         max_rows: int = 1000
     ) -> Optional[pd.DataFrame]:
-        raise NotImplementedError("Subclasses must implement execute_query()")
+        raise NotImplementedError("Subclasses must implement _execute_query()")
+
+    def _run_cancellable(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]],
+        timeout: int,
+        max_rows: int,
+        **kwargs: Any
+    ) -> Optional[pd.DataFrame]:
+        # Runs _execute_query under the watchdog; on the main thread, Ctrl-C cancels
+        # the statement on the server (see db/cancel.py)
+        def execute() -> Optional[pd.DataFrame]:
+            return self._execute_query(query, params, timeout, max_rows, **kwargs)
+
+        if not self.supports_cancel:
+            return execute()
+        watchdog = get_watchdog() if timeout else None
+        # By default the watchdog only backs up timeouts the server enforces itself, so
+        # long writes and DuckDB queries are not cut off by execute_query's default
+        if watchdog and not (watchdog.cover_all or self._server_times_out(query)):
+            watchdog = None
+        token = watchdog.watch(self, timeout / 1000) if watchdog else None
+        self._running = (time.perf_counter(), timeout)
+        self._cancelled = False
+        try:
+            if threading.current_thread() is not threading.main_thread():
+                return execute()
+            return run_interruptible(
+                execute, lambda: self.cancel(reason='interrupted'), self._discard_connection
+            )
+        finally:
+            self._running = None
+            if token is not None:
+                watchdog.unwatch(token)
+            if self._cancelled and self.connection is not None:
+                self._recover_from_cancel()
+
+    def cancel(self, reason: str = 'cancelled') -> Optional[Dict[str, Any]]:
+        """
+        Cancel the statement running on this connection, on the server.
+
+        Safe to call from any thread. The caller of the cancelled query sees it fail
+        (or, for Ctrl-C, the KeyboardInterrupt).
+
+        Args:
+            reason: Why the query is cancelled, for the log and the report
+
+        Returns:
+            Optional[Dict[str, Any]]: Report with the seconds the query had run and
+            the server time reclaimed (what was left of its timeout), or None if no
+            query was running or the cancel failed
+        """
+        running = self._running
+        if running is None or not self.supports_cancel:
+            return None
+        started, timeout = running
+        try:
+            self._cancel_running()
+        except Exception as e:
+            logger.error(f"Failed to cancel {self.backend} query: {e}")
+            return None
+        self._cancelled = True
+
+        elapsed = time.perf_counter() - started
+        report = {
+            'backend': self.backend,
+            'reason': reason,
+            'elapsed_seconds': round(elapsed, 3),
+            # Without the cancel the query could have run until the statement timeout
+            'reclaimed_seconds': round(max(0.0, timeout / 1000 - elapsed), 3) if timeout else None
+        }
+        self.last_cancel = report
+        logger.warning(
+            f"Cancelled {self.backend} query after {elapsed:.2f}s ({reason}); "
+            f"up to {report['reclaimed_seconds']}s of server time reclaimed",
+            extra={'cancel': report}
+        )
+        return report
+
+    def _cancel_running(self) -> None:
+        raise NotImplementedError(f"{type(self).__name__} does not support cancel()")
+
+    def _server_times_out(self, query: str) -> bool:
+        # Whether the session's statement timeout applies to the query
+        return False
+
+    def _recover_from_cancel(self) -> None:
+        # Brings the session back to a usable state after a cancelled statement
+        pass
+
+    def _recover_from_error(self) -> None:
+        # Brings the session back to a usable state after a failed statement
+        pass
+
+    def _discard_connection(self) -> None:
+        # Used when a driver call did not return after its cancel; the session is
+        # in an unknown state and a new one is opened for the next query
+        try:
+            self.disconnect()
+        finally:
+            self.connection = None
+
+    def explain(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        reuse_connection: bool = False
+    ) -> Optional[Any]:
+        """
+        Get the plan of a query without running it.
+
+        By default the EXPLAIN runs on a side connection, so it neither waits for nor
+        disturbs a query in progress on this one (e.g. when called from another thread).
+
+        Args:
+            query: SQL query to explain
+            params: Query parameters, as for execute_query
+            reuse_connection: Run the EXPLAIN on this connection when no statement is
+                running on it, saving the side connection's handshake. Only for callers
+                that run this connection's queries themselves (e.g. a pre-flight check).
+
+        Returns:
+            Optional[Any]: The parsed JSON plan, or None if the backend has no JSON
+            EXPLAIN or the EXPLAIN failed
+        """
+        if not self.explain_prefix:
+            return None
+        target = self if reuse_connection and self._running is None else self.clone()
+        if not target.is_connected() and not target.connect():
+            return None
+        cursor = None
+        try:
+            cursor = target.connection.cursor()
+            statement = self.explain_prefix + query.strip().rstrip(';')
+            if params:
+                cursor.execute(statement, params)
+            else:
+                cursor.execute(statement)
+            rows = cursor.fetchall()
+        except Exception as e:
+            logger.warning(f"EXPLAIN failed: {e}")
+            if target is self:
+                self._recover_from_error()
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if target is not self:
+                target.disconnect()
+
+        if not rows:
+            return None
+        # The plan is the last column of the first row: a JSON string, or already
+        # decoded by drivers that understand JSON columns (psycopg2)
+        plan = rows[0][-1]
+        if isinstance(plan, (bytes, bytearray)):
+            plan = plan.decode()
+        if isinstance(plan, str):
+            try:
+                return json.loads(plan)
+            except ValueError as e:
+                logger.warning(f"EXPLAIN returned an unreadable plan: {e}")
+                return None
+        return plan
+
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        batch_size: int = 10000
+    ) -> Iterator[pd.DataFrame]:
+        # Unlike execute_query, results are not capped by max_rows: rows are fetched in
+        # batches of batch_size so large extracts never sit in memory all at once.
+        if not self.is_connected():
+            if not self.connect():
+                raise ConnectionError(f"Failed to connect to {type(self).__name__} database")
+
+        # The admission slot is held until the stream is exhausted or closed
+        with get_admission_controller().admit(self.backend, self.host):
+            cursor = self._stream_cursor()
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                # The first batch is always yielded, even when empty, so callers can see the
+                # result columns. Server-side cursors only expose description after a fetch.
+                rows = cursor.fetchmany(batch_size)
+                columns = [desc[0] for desc in cursor.description]
+                yield pd.DataFrame(rows, columns=columns)
+
+                while rows:
+                    rows = cursor.fetchmany(batch_size)
+                    if rows:
+                        yield pd.DataFrame(rows, columns=columns)
+            finally:
+                cursor.close()
+
+    def _stream_cursor(self) -> Any:
+        return self.connection.cursor()
+
+    def execute_script(self, script: str) -> Optional[List[pd.DataFrame]]:
+        """
+        Execute a multi-statement SQL script on one connection in one transaction.
+
+        Args:
+            script: SQL text, e.g. the contents of a .sql file
+
+        Returns:
+            Optional[List[pd.DataFrame]]: One DataFrame per row-returning statement in
+            script order, or None if the script failed and was rolled back
+        """
+        statements = split_statements(script, self.backend)
+        if not statements:
+            return []
+
+        if not self.is_connected():
+            if not self.connect():
+                return None
+
+        start_time = time.time()
+        cursor = None
+        try:
+            with trace_query(self.backend, script) as trace, \
+                    get_admission_controller().admit(self.backend, self.host) as wait_seconds:
+                if trace is not None:
+                    trace.add('queue', wait_seconds)
+                cursor = self.connection.cursor()
+                self._begin_transaction(cursor)
+                results = self._run_script(cursor, statements)
+                self.connection.commit()
+                if trace is not None and results:
+                    trace.set_result(results[-1])
+        except QueueTimeout as e:
+            logger.error(f"Script not admitted: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Script execution failed, rolling back: {e}")
+            try:
+                self.connection.rollback()
+            except Exception as rollback_error:
+                logger.error(f"Rollback failed: {rollback_error}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+
+        logger.info(
+            f"Executed script of {len(statements)} statements ({len(results)} result sets) "
+            f"in {time.time() - start_time:.2f} seconds"
+        )
+        return results
+
+    def _run_script(self, cursor: Any, statements: List[str]) -> List[pd.DataFrame]:
+        # Portable fallback: one round trip per statement on the shared cursor
+        results = []
+        for statement in statements:
+            cursor.execute(statement)
+            if cursor.description is not None:
+                results.append(self._cursor_frame(cursor))
+        return results
+
+    def _cursor_frame(self, cursor: Any) -> pd.DataFrame:
+        return self._build_frame(cursor, cursor.fetchall())
+
+    def _build_frame(self, cursor: Any, data: List[Any]) -> pd.DataFrame:
+        with phase('build'):
+            if self.convert_values:
+                df = build_converted_frame(
+                    data, cursor.description, self.backend, self.decimal_mode, self.column_types
+                )
+            else:
+                columns = [desc[0] for desc in cursor.description]
+                df = pd.DataFrame(data, columns=columns)
+        return self._finalize_frame(df, cursor.description)
+
+    def _finalize_frame(self, df: pd.DataFrame, description: Any) -> pd.DataFrame:
+        if not self.optimize_dtypes or df.empty:
+            return df
+        with phase('build'):
+            return self._optimize_frame(df, description)
+
+    def _optimize_frame(self, df: pd.DataFrame, description: Any) -> pd.DataFrame:
+        plan = plan_dtypes(description, self.backend, self.column_types)
+        df, report = optimize_dtypes(df, plan, self.decimal_mode)
+        self.last_dtype_report = report
+        logger.info(
+            f"Dtype optimization saved {report['memory_saved'] / 1024 / 1024:.2f} MB "
+            f"({report['memory_before']} -> {report['memory_after']} bytes, "
+            f"{len(report['columns'])} columns converted)"
+        )
+        return df
+
+    def write_dataframe(
+        self,
+        df: pd.DataFrame,
+        table: str,
+        mode: str = 'append',
+        key_columns: Optional[List[str]] = None,
+        chunk_size: int = DEFAULT_WRITE_CHUNK_SIZE
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Bulk-load a DataFrame into an existing table in a single transaction.
+
+        Args:
+            df: Rows to write; column names must match the table's columns
+            table: Target table
+            mode: 'append' adds rows, 'replace' deletes existing rows first,
+                'upsert' inserts or updates rows matching key_columns
+            key_columns: Unique key used to match rows in upsert mode
+            chunk_size: Number of rows sent to the server per bulk-load call
+
+        Returns:
+            Optional[Dict[str, Any]]: Write statistics (rows, seconds, rows_per_second),
+            or None if the write failed and was rolled back
+        """
+        if mode not in WRITE_MODES:
+            raise ValueError(
+                f"Unsupported write mode: {mode}. Supported modes: {', '.join(WRITE_MODES)}"
+            )
+        if mode == 'upsert' and not key_columns:
+            raise ValueError("key_columns are required for upsert mode")
+
+        if not self.is_connected():
+            if not self.connect():
+                return None
+
+        columns = [str(column) for column in df.columns]
+        start_time = time.time()
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+            self._begin_transaction(cursor)
+
+            if mode == 'replace':
+                # DELETE rather than TRUNCATE so the replacement stays inside the transaction
+                cursor.execute(f"DELETE FROM {table}")
+
+            target = table
+            if mode == 'upsert':
+                target = f"_stage_{uuid.uuid4().hex[:12]}"
+                self._create_staging_table(cursor, target, table)
+
+            # Identifies the files or rows staged by this write
+            load_id = uuid.uuid4().hex
+            for start in range(0, len(df), chunk_size):
+                self._bulk_load(cursor, target, columns, df.iloc[start:start + chunk_size], load_id)
+            self._finish_bulk_load(cursor, target, columns, load_id)
+
+            if mode == 'upsert':
+                self._upsert_from_staging(cursor, table, target, columns, key_columns)
+                cursor.execute(f"DROP TABLE {target}")
+
+            self.connection.commit()
+        except Exception as e:
+            logger.error(f"Failed to write DataFrame to {table}, rolling back: {e}")
+            try:
+                self.connection.rollback()
+            except Exception as rollback_error:
+                logger.error(f"Rollback failed: {rollback_error}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+
+        elapsed_time = time.time() - start_time
+        rows_per_second = len(df) / elapsed_time if elapsed_time > 0 else float(len(df))
+        logger.info(
+            f"Wrote {len(df)} rows to {table} ({mode}) in {elapsed_time:.2f} seconds "
+            f"({rows_per_second:,.0f} rows/sec)"
+        )
+        return {
+            'table': table,
+            'mode': mode,
+            'rows': len(df),
+            'seconds': elapsed_time,
+            'rows_per_second': rows_per_second
+        }
+
+    # Bulk write hooks. The defaults use portable SQL and executemany; backends
+    # override them with their native bulk-load paths.
+
+    def _begin_transaction(self, cursor: Any) -> None:
+        # DB-API drivers open a transaction implicitly on the first statement
+        pass
+
+    def _create_staging_table(self, cursor: Any, staging_table: str, table: str) -> None:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging_table} AS SELECT * FROM {table} WHERE 1 = 0"
+        )
+
+    def _bulk_load(
+        self,
+        cursor: Any,
+        table: str,
+        columns: List[str],
+        chunk: pd.DataFrame,
+        load_id: str
+    ) -> None:
+        placeholders = ", ".join([self.placeholder] * len(columns))
+        insert = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        # Convert to Python objects so NaN/NaT are sent as NULL
+        rows = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+        cursor.executemany(insert, list(rows))
+
+    def _finish_bulk_load(self, cursor: Any, table: str, columns: List[str], load_id: str) -> None:
+        pass
+
+    def _upsert_from_staging(
+        self,
+        cursor: Any,
+        table: str,
+        staging_table: str,
+        columns: List[str],
+        key_columns: List[str]
+    ) -> None:
+        column_list = ", ".join(columns)
+        updates = ", ".join(
+            f"{column} = excluded.{column}" for column in columns if column not in key_columns
+        )
+        conflict_action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        cursor.execute(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging_table} "
+            f"WHERE true ON CONFLICT ({', '.join(key_columns)}) {conflict_action}"
+        )
 
 
 class MySQLConnection(DatabaseConnection):
+    backend = 'mysql'
+    prepared_style = 'qmark'
+    explain_prefix = 'EXPLAIN FORMAT=JSON '
+    supports_cancel = True
+
     def __init__(self, for_schema_analysis: bool = False, database: str = None):
         super().__init__()
         self.for_schema_analysis = for_schema_analysis
@@ -70,7 +815,9 @@ class MySQLConnection(DatabaseConnection):
             'port': int(os.getenv('MYSQL_PORT', '3306')),
             'user': os.getenv('MYSQL_USER'),
             'password': os.getenv('MYSQL_PASSWORD'),
-            'database': database or os.getenv('MYSQL_DATABASE')
+            'database': database or os.getenv('MYSQL_DATABASE'),
+            # Required by the LOAD DATA LOCAL INFILE write path; disabled unless opted in
+            'allow_local_infile': os.getenv('MYSQL_ALLOW_LOCAL_INFILE', 'false').lower() == 'true'
         }
         
         # Add additional options for schema analysis
@@ -86,16 +833,20 @@ class MySQLConnection(DatabaseConnection):
             import mysql.connector
             from mysql.connector import Error
             
+            # Prepared statements belong to the previous session
+            self.statement_cache.invalidate()
             self.connection = mysql.connector.connect(**self.config)
             
             if self.connection.is_connected():
+                # Read now: while a query runs the connection is busy
+                self._connection_id = self.connection.connection_id
                 return True
             return False
         except Exception as e:
             logger.error(f"Failed to connect to MySQL database: {e}")
             return False
     
-    def execute_query(
+    def _execute_query(
         self, 
         query: str, 
         params: Optional[Union[tuple, dict]] = None,
@@ -107,62 +858,161 @@ class MySQLConnection(DatabaseConnection):
                 return None
         
         cursor = None
+        prepared = None
         try:
             cursor = self.connection.cursor(dictionary=True, buffered=True)
             
             # Set a query timeout and limit result size
             try:
-                cursor.execute(f"SET SESSION MAX_EXECUTION_TIME={timeout}")
-                cursor.execute(f"SET SESSION SQL_SELECT_LIMIT={max_rows}")
+                with phase('session'):
+                    cursor.execute(f"SET SESSION MAX_EXECUTION_TIME={timeout}")
+                    cursor.execute(f"SET SESSION SQL_SELECT_LIMIT={max_rows}")
             except Exception as e:
                 logger.warning(f"Failed to set execution parameters: {e}")
             
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+            # Repeated parameterized statements run on their cached prepared cursor
+            prepared = self._prepared_statement(query, params)
+            result_cursor = cursor
+            with phase('execute'):
+                if prepared:
+                    _, (result_cursor, statement), values = prepared
+                    result_cursor.execute(statement, tuple(values))
+                elif params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
             
             # Check if this is a SELECT-type query (includes SHOW, DESCRIBE, EXPLAIN)
-            # Normalize the query by removing comments, extra whitespace
-            query_start = query.lower().strip()
-            
-            # Handle SQL comments that might be at the start of the query
-            if query_start.startswith("--"):
-                # Skip comment lines
-                lines = query_start.split("\n")
-                for line in lines:
-                    if not line.strip().startswith("--"):
-                        query_start = line.strip()
-                        break
-            
-            # Check for SELECT, SHOW, DESCRIBE, EXPLAIN at the start of the query
-            is_select_query = any(query_start.startswith(prefix) for prefix in 
-                                 ('select', 'show', 'describe', 'explain', 'with'))
+            is_select_query = preprocess(query, self.backend).returns_rows
             
             if is_select_query:
                 try:
                     # Fetch data and create DataFrame
-                    data = cursor.fetchall()
+                    with phase('fetch'):
+                        data = result_cursor.fetchall()
                     
                     # If no rows returned but it was a SELECT query, return empty DataFrame
                     if not data:
                         return pd.DataFrame()
                     
-                    df = pd.DataFrame(data)
+                    df = self._build_frame(result_cursor, data)
                     return df
                 except Exception as e:
                     logger.error(f"Error fetching results: {e}")
+                    if prepared:
+                        self.statement_cache.discard(prepared[0])
                     return pd.DataFrame()  # Return empty DataFrame on error
             else:
                 self.connection.commit()
                 return None
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
+            if prepared:
+                self.statement_cache.discard(prepared[0])
             return None
         finally:
             if cursor:
                 cursor.close()
 
+    def _server_times_out(self, query: str) -> bool:
+        # MAX_EXECUTION_TIME only applies to SELECT statements
+        info = preprocess(query, self.backend)
+        return info.kind == READ and info.keyword in ('select', 'with')
+
+    def _cancel_running(self) -> None:
+        # KILL QUERY has to come from another session; it stops the statement and
+        # keeps this connection open
+        side = self.clone()
+        if not side.connect():
+            raise ConnectionError("Failed to open a side connection")
+        try:
+            cursor = side.connection.cursor()
+            cursor.execute(f"KILL QUERY {int(self._connection_id)}")
+            cursor.close()
+        finally:
+            side.disconnect()
+
+    def _prepare(self, statement: str) -> Any:
+        # mysql.connector prepares on the first execute and re-executes the same
+        # operation on the same cursor without preparing it again
+        return self.connection.cursor(prepared=True), statement
+
+    def _release_prepared(self, handle: Any) -> None:
+        # Closing a prepared cursor deallocates its statement on the server
+        handle[0].close()
+
+    def _stream_cursor(self) -> Any:
+        # execute_query leaves SQL_SELECT_LIMIT set on the session, so reset it before
+        # streaming and use an unbuffered cursor so rows are read from the wire lazily.
+        with self.connection.cursor() as reset_cursor:
+            reset_cursor.execute("SET SESSION SQL_SELECT_LIMIT=DEFAULT")
+        return self.connection.cursor(buffered=False)
+
+    def _run_script(self, cursor: Any, statements: List[str]) -> List[pd.DataFrame]:
+        # Scripts return complete result sets, not the max_rows cap of execute_query
+        cursor.execute("SET SESSION SQL_SELECT_LIMIT=DEFAULT")
+
+        # Compound statements (procedure bodies written with DELIMITER) are sent one by one
+        if any(is_compound(statement, self.backend) for statement in statements):
+            return super()._run_script(cursor, statements)
+
+        try:
+            result_iterator = cursor.execute(";\n".join(statements), multi=True)
+        except TypeError:
+            # mysql-connector-python 9.2+ dropped multi=True
+            return super()._run_script(cursor, statements)
+
+        # Send every statement in one round trip and collect each result set
+        results = []
+        for result in result_iterator:
+            if result.with_rows:
+                results.append(self._cursor_frame(result))
+        return results
+
+    def _create_staging_table(self, cursor: Any, staging_table: str, table: str) -> None:
+        cursor.execute(f"CREATE TEMPORARY TABLE {staging_table} LIKE {table}")
+
+    def _bulk_load(
+        self,
+        cursor: Any,
+        table: str,
+        columns: List[str],
+        chunk: pd.DataFrame,
+        load_id: str
+    ) -> None:
+        if not self.config.get('allow_local_infile'):
+            # mysql.connector rewrites executemany INSERTs into multi-row statements
+            super()._bulk_load(cursor, table, columns, chunk, load_id)
+            return
+
+        # mysql.connector only streams LOCAL INFILE data from a named file, so the
+        # in-memory data is spooled to a temporary file for the duration of the load
+        with tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8') as data_file:
+            data_file.write(_mysql_load_text(chunk))
+            data_file.flush()
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE '{data_file.name}' INTO TABLE {table} "
+                f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' ENCLOSED BY '' "
+                f"ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({', '.join(columns)})"
+            )
+
+    def _upsert_from_staging(
+        self,
+        cursor: Any,
+        table: str,
+        staging_table: str,
+        columns: List[str],
+        key_columns: List[str]
+    ) -> None:
+        column_list = ", ".join(columns)
+        updates = ", ".join(
+            f"{column} = VALUES({column})" for column in columns if column not in key_columns
+        ) or f"{key_columns[0]} = {key_columns[0]}"
+        cursor.execute(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging_table} "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+
     def switch_database(self, database: str) -> bool:
         """
         Switch to a different database on the same connection.
@@ -191,6 +1041,11 @@ class MySQLConnection(DatabaseConnection):
 
 
 class PostgreSQLConnection(DatabaseConnection):    
+    backend = 'postgres'
+    prepared_style = 'numeric'
+    explain_prefix = 'EXPLAIN (FORMAT JSON) '
+    supports_cancel = True
+
     def __init__(self):
         """Initialize PostgreSQL connection."""
         super().__init__()
@@ -208,42 +1063,69 @@ class PostgreSQLConnection(DatabaseConnection):
         try:
             import psycopg2
             
+            # Prepared statements belong to the previous session
+            self.statement_cache.invalidate()
             self.connection = psycopg2.connect(**self.config)
             return True
         except Exception as e:
             logger.error(f"Failed to connect to PostgreSQL database: {e}")
             return False
     
-    def execute_query(
+    def _execute_query(
         self, 
         query: str, 
         params: Optional[Union[tuple, dict]] = None,
         timeout: int = 3000,
+        max_rows: int = 1000,
+        itersize: int = DEFAULT_POSTGRES_ITERSIZE
     ) -> Optional[pd.DataFrame]:
         if not self.is_connected():
             if not self.connect():
                 return None
         
         cursor = None
+        prepared = None
         try:
-            cursor = self.connection.cursor()
-            
             # Set statement timeout
-            with self.connection.cursor() as timeout_cursor:
+            with phase('session'), self.connection.cursor() as timeout_cursor:
                 timeout_cursor.execute(f"SET statement_timeout = {timeout}")
             
-            cursor = self.connection.cursor()
+            statement = preprocess(query, self.backend)
+            is_select_query = statement.returns_rows
             
-            if params:
-                cursor.execute(query, params)
+            # Repeated parameterized statements other than plain SELECTs are EXECUTEd
+            # from a server-side PREPARE (see _preparable)
+            prepared = self._prepared_statement(query, params)
+            if prepared:
+                _, statement_name, values = prepared
+                cursor = self.connection.cursor()
+                placeholders = ", ".join(["%s"] * len(values))
+                with phase('execute'):
+                    cursor.execute(f"EXECUTE {statement_name} ({placeholders})", values)
             else:
-                cursor.execute(query)
+                # Plain SELECTs run on a server-side named cursor so only max_rows rows
+                # are transferred; SHOW and EXPLAIN cannot be declared as cursors
+                if statement.keyword == 'select':
+                    cursor = self._named_cursor(itersize)
+                else:
+                    cursor = self.connection.cursor()
+                
+                with phase('execute'):
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
             
-            if query.lower().strip().startswith(('select', 'show', 'explain')):
+            if is_select_query:
                 try:
-                    columns = [desc[0] for desc in cursor.description]
-                    data = cursor.fetchmany(max_rows)
-                    df = pd.DataFrame(data, columns=columns)
+                    # Named cursors only expose description after the first fetch (for
+                    # them the server-side execution is part of this phase)
+                    with phase('fetch'):
+                        data = self._fetch_rows(cursor, max_rows, itersize)
+                    df = self._build_frame(cursor, data)
+                    if statement.kind != READ:
+                        # e.g. WITH d AS (DELETE ... RETURNING *) SELECT * FROM d
+                        self.connection.commit()
                     return df
                 except Exception as e:
                     logger.error(f"Error fetching results: {e}")
@@ -253,13 +1135,175 @@ class PostgreSQLConnection(DatabaseConnection):
                 return None
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
+            if prepared:
+                # The failed EXECUTE aborted the transaction, in which the DEALLOCATE
+                # of the discarded statement would fail as well
+                try:
+                    self.connection.rollback()
+                except Exception as rollback_error:
+                    logger.error(f"Rollback failed: {rollback_error}")
+                self.statement_cache.discard(prepared[0])
             return None
         finally:
             if cursor:
                 cursor.close()
 
+    def _server_times_out(self, query: str) -> bool:
+        # statement_timeout applies to every statement
+        return True
+
+    def _cancel_running(self) -> None:
+        # libpq sends the cancel request over its own connection
+        self.connection.cancel()
+
+    def _recover_from_cancel(self) -> None:
+        # The cancelled statement aborted the transaction
+        try:
+            self.connection.rollback()
+        except Exception as e:
+            logger.error(f"Rollback after cancel failed: {e}")
+
+    def _recover_from_error(self) -> None:
+        # A failed statement aborts the open transaction as well
+        self._recover_from_cancel()
+
+    def _preparable(self, query: str) -> bool:
+        # EXECUTE cannot be declared as a cursor, so a prepared SELECT would buffer its
+        # whole result client-side instead of fetching max_rows from a named cursor
+        return preprocess(query, self.backend).keyword != 'select'
+
+    def _prepare(self, statement: str) -> Any:
+        name = f"ca_stmt_{uuid.uuid4().hex[:12]}"
+        # A failed PREPARE (e.g. an untyped parameter) must not abort the open transaction
+        use_savepoint = not self.connection.autocommit
+        with self.connection.cursor() as cursor:
+            if use_savepoint:
+                cursor.execute("SAVEPOINT ca_prepare")
+            try:
+                cursor.execute(f"PREPARE {name} AS {statement}")
+            except Exception:
+                if use_savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT ca_prepare")
+                raise
+            if use_savepoint:
+                cursor.execute("RELEASE SAVEPOINT ca_prepare")
+        return name
+
+    def _release_prepared(self, handle: Any) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DEALLOCATE {handle}")
+
+    def copy_to_arrow(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        timeout: int = 0
+    ) -> Optional[Any]:
+        """
+        Extract a query result with COPY ... TO STDOUT and parse it into Arrow.
+
+        COPY streams CSV text without per-row protocol overhead, which is much faster
+        than fetching tuples for wide or large results.
+
+        Args:
+            query: SELECT statement to extract
+            params: Optional parameters, bound client-side before the COPY
+            timeout: Statement timeout in milliseconds (0 disables it)
+
+        Returns:
+            Optional[pyarrow.Table]: The full result, or None on failure
+        """
+        if not self.is_connected():
+            if not self.connect():
+                return None
+
+        try:
+            import pyarrow.csv as pa_csv
+
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"SET statement_timeout = {timeout}")
+                if params:
+                    query = cursor.mogrify(query, params).decode()
+                buffer = io.BytesIO()
+                cursor.copy_expert(
+                    f"COPY ({query.strip().rstrip(';')}) TO STDOUT WITH (FORMAT csv, HEADER true)",
+                    buffer
+                )
+            extracted_bytes = buffer.tell()
+            buffer.seek(0)
+            table = pa_csv.read_csv(buffer)
+            logger.info(
+                f"COPY extract returned {table.num_rows} rows "
+                f"({extracted_bytes / 1024 / 1024:.2f} MB of CSV)"
+            )
+            return table
+        except Exception as e:
+            logger.error(f"COPY extract failed: {e}")
+            return None
+
+    def _fetch_rows(self, cursor: Any, max_rows: int, itersize: int) -> List[tuple]:
+        # fetchmany on a named cursor is a single FETCH of that many rows (itersize
+        # only applies to iteration), so max_rows is read in FETCHes of itersize rows
+        if cursor.name is None:
+            return cursor.fetchmany(max_rows)
+        rows: List[tuple] = []
+        while True:
+            size = min(itersize, max_rows - len(rows))
+            batch = cursor.fetchmany(size)
+            rows.extend(batch)
+            if len(batch) < size or len(rows) >= max_rows:
+                return rows
+
+    def _named_cursor(self, itersize: int = DEFAULT_POSTGRES_ITERSIZE) -> Any:
+        cursor = self.connection.cursor(name=f"cursor_analytics_{uuid.uuid4().hex}")
+        cursor.itersize = itersize
+        return cursor
+
+    def _stream_cursor(self) -> Any:
+        return self._named_cursor()
+
+    def _run_script(self, cursor: Any, statements: List[str]) -> List[pd.DataFrame]:
+        # psycopg2 only exposes the last result of a multi-statement execute, so runs of
+        # statements without result sets are batched into one round trip and each
+        # row-returning statement is executed on its own
+        results = []
+        pending: List[str] = []
+        for statement in statements:
+            if not returns_rows(statement, self.backend):
+                pending.append(statement)
+                continue
+            if pending:
+                cursor.execute(";\n".join(pending))
+                pending = []
+            cursor.execute(statement)
+            results.append(self._cursor_frame(cursor))
+        if pending:
+            cursor.execute(";\n".join(pending))
+        return results
+
+    def _create_staging_table(self, cursor: Any, staging_table: str, table: str) -> None:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging_table} (LIKE {table} INCLUDING DEFAULTS)"
+        )
+
+    def _bulk_load(
+        self,
+        cursor: Any,
+        table: str,
+        columns: List[str],
+        chunk: pd.DataFrame,
+        load_id: str
+    ) -> None:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            io.StringIO(_postgres_copy_csv(chunk))
+        )
+
 
 class SnowflakeConnection(DatabaseConnection):
+    backend = 'snowflake'
+    explain_prefix = 'EXPLAIN USING JSON '
+    supports_cancel = True
     
     def __init__(self):
         super().__init__()
@@ -273,6 +1317,9 @@ class SnowflakeConnection(DatabaseConnection):
             'database': os.getenv('SNOWFLAKE_DATABASE'),
             'schema': os.getenv('SNOWFLAKE_SCHEMA')
         }
+        self.fetch_workers = int(
+            os.getenv('SNOWFLAKE_FETCH_WORKERS', str(DEFAULT_SNOWFLAKE_FETCH_WORKERS))
+        )
     
     def connect(self) -> bool:
         try:
@@ -284,7 +1331,7 @@ class SnowflakeConnection(DatabaseConnection):
             logger.error(f"Failed to connect to Snowflake database: {e}")
             return False
     
-    def execute_query(
+    def _execute_query(
         self, 
         query: str, 
         params: Optional[Union[tuple, dict]] = None,
@@ -300,21 +1347,28 @@ class SnowflakeConnection(DatabaseConnection):
             cursor = self.connection.cursor()
             
             # Set query timeout
-            with self.connection.cursor() as timeout_cursor:
+            with phase('session'), self.connection.cursor() as timeout_cursor:
                 timeout_cursor.execute(f"ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS = {timeout // 1000}")
             
             cursor = self.connection.cursor()
+            self._active_cursor = cursor
             
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+            with phase('execute'):
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
             
-            if query.lower().strip().startswith(('select', 'show', 'describe', 'explain')):
+            if preprocess(query, self.backend).returns_rows:
                 try:
-                    columns = [desc[0] for desc in cursor.description]
-                    data = cursor.fetchmany(max_rows)
-                    df = pd.DataFrame(data, columns=columns)
+                    # Arrow batches are downloaded and converted in one step
+                    with phase('fetch'):
+                        df = self._fetch_result_batches(cursor, max_rows)
+                    if df is not None:
+                        return self._finalize_frame(df, cursor.description)
+                    with phase('fetch'):
+                        data = cursor.fetchmany(max_rows)
+                    df = self._build_frame(cursor, data)
                     return df
                 except Exception as e:
                     logger.error(f"Error fetching results: {e}")
@@ -329,6 +1383,317 @@ class SnowflakeConnection(DatabaseConnection):
             if cursor:
                 cursor.close()
 
+    def _server_times_out(self, query: str) -> bool:
+        # STATEMENT_TIMEOUT_IN_SECONDS applies to every statement
+        return True
+
+    def _cancel_running(self) -> None:
+        # The query id is only known once Snowflake accepted the query; until then
+        # everything running in this session is cancelled
+        query_id = getattr(self._active_cursor, 'sfqid', None)
+        side = self.clone()
+        if not side.connect():
+            raise ConnectionError("Failed to open a side connection")
+        try:
+            with side.connection.cursor() as cursor:
+                if query_id:
+                    cursor.execute("SELECT SYSTEM$CANCEL_QUERY(%s)", (query_id,))
+                else:
+                    cursor.execute("SELECT SYSTEM$CANCEL_ALL_QUERIES(%s)",
+                                   (self.connection.session_id,))
+        finally:
+            side.disconnect()
+
+    def _fetch_result_batches(self, cursor: Any, max_rows: Optional[int]) -> Optional[pd.DataFrame]:
+        # Downloads the query's Arrow result batches concurrently instead of fetching
+        # Python tuples row by row. Returns None when the result is not available as
+        # Arrow batches so the caller can fall back to fetchmany().
+        try:
+            batches = cursor.get_result_batches()
+        except Exception as e:
+            logger.debug(f"Result batches unavailable, falling back to fetchmany: {e}")
+            return None
+        if batches is None:
+            return None
+
+        # Only download the batches needed to cover max_rows
+        selected = []
+        total_rows = 0
+        for batch in batches:
+            if max_rows is not None and total_rows >= max_rows:
+                break
+            selected.append(batch)
+            total_rows += batch.rowcount
+
+        columns = [desc[0] for desc in cursor.description]
+        if not selected:
+            return pd.DataFrame(columns=columns)
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(selected))) as executor:
+                frames = list(executor.map(lambda batch: batch.to_pandas(), selected))
+        except Exception as e:
+            logger.debug(f"Arrow batch download failed, falling back to fetchmany: {e}")
+            return None
+
+        df = pd.concat(frames, ignore_index=True)
+        if max_rows is not None:
+            df = df.head(max_rows)
+        logger.info(f"Fetched {len(df)} rows from {len(selected)} Arrow result batches")
+        return df
+
+    def submit_async(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None
+    ) -> Optional[str]:
+        if not self.is_connected():
+            if not self.connect():
+                return None
+
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute_async(query, params)
+            logger.info(f"Submitted async query {cursor.sfqid}")
+            return cursor.sfqid
+        except Exception as e:
+            logger.error(f"Async query submission failed: {e}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+
+    def wait_for_queries(
+        self,
+        query_ids: List[str],
+        poll_interval: float = 1.0,
+        timeout: Optional[float] = None
+    ) -> Dict[str, bool]:
+        """
+        Poll submitted queries until they all finish.
+
+        Args:
+            query_ids: Query IDs returned by submit_async
+            poll_interval: Seconds between status checks
+            timeout: Give up after this many seconds (wait forever if None)
+
+        Returns:
+            Dict[str, bool]: Query ID to whether it finished successfully
+        """
+        pending = list(query_ids)
+        outcomes: Dict[str, bool] = {}
+        deadline = time.time() + timeout if timeout is not None else None
+
+        while pending:
+            for query_id in list(pending):
+                try:
+                    status = self.connection.get_query_status_throw_if_error(query_id)
+                except Exception as e:
+                    logger.error(f"Async query {query_id} failed: {e}")
+                    outcomes[query_id] = False
+                    pending.remove(query_id)
+                    continue
+                if not self.connection.is_still_running(status):
+                    outcomes[query_id] = True
+                    pending.remove(query_id)
+
+            if not pending:
+                break
+            if deadline is not None and time.time() >= deadline:
+                logger.warning(f"Timed out waiting for {len(pending)} async queries")
+                for query_id in pending:
+                    outcomes[query_id] = False
+                break
+            time.sleep(poll_interval)
+
+        return outcomes
+
+    def fetch_async_result(
+        self,
+        query_id: str,
+        max_rows: Optional[int] = None
+    ) -> Optional[pd.DataFrame]:
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+            cursor.get_results_from_sfqid(query_id)
+            df = self._fetch_result_batches(cursor, max_rows)
+            if df is not None:
+                return self._finalize_frame(df, cursor.description)
+            data = cursor.fetchall() if max_rows is None else cursor.fetchmany(max_rows)
+            return self._build_frame(cursor, data)
+        except Exception as e:
+            logger.error(f"Failed to fetch results for async query {query_id}: {e}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+
+    def run_async_queries(
+        self,
+        queries: List[str],
+        poll_interval: float = 1.0,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = 1000
+    ) -> List[Optional[pd.DataFrame]]:
+        # Submit everything first so the warehouse runs the queries concurrently
+        query_ids = [self.submit_async(query) for query in queries]
+        outcomes = self.wait_for_queries(
+            [query_id for query_id in query_ids if query_id], poll_interval, timeout
+        )
+        return [
+            self.fetch_async_result(query_id, max_rows)
+            if query_id and outcomes.get(query_id) else None
+            for query_id in query_ids
+        ]
+
+    def _begin_transaction(self, cursor: Any) -> None:
+        # The connector runs in autocommit mode, so open an explicit transaction
+        cursor.execute("BEGIN")
+
+    def _run_script(self, cursor: Any, statements: List[str]) -> List[pd.DataFrame]:
+        # Submit the whole script as one multi-statement request; each statement's
+        # result is then reached with nextset()
+        cursor.execute(";\n".join(statements), num_statements=len(statements))
+        results = []
+        for index, statement in enumerate(statements):
+            if index > 0 and not cursor.nextset():
+                break
+            if returns_rows(statement, self.backend):
+                results.append(self._cursor_frame(cursor))
+        return results
+
+    def _create_staging_table(self, cursor: Any, staging_table: str, table: str) -> None:
+        cursor.execute(f"CREATE TEMPORARY TABLE {staging_table} LIKE {table}")
+
+    def _bulk_load(
+        self,
+        cursor: Any,
+        table: str,
+        columns: List[str],
+        chunk: pd.DataFrame,
+        load_id: str
+    ) -> None:
+        # Chunks are uploaded to the table stage as Parquet and loaded with a single
+        # COPY INTO once every chunk is staged (see _finish_bulk_load)
+        with tempfile.TemporaryDirectory() as staging_dir:
+            path = os.path.join(staging_dir, f"{load_id}_{uuid.uuid4().hex[:8]}.parquet")
+            chunk.to_parquet(path, index=False)
+            cursor.execute(f"PUT 'file://{path}' @%{table} AUTO_COMPRESS=FALSE OVERWRITE=TRUE")
+
+    def _finish_bulk_load(self, cursor: Any, table: str, columns: List[str], load_id: str) -> None:
+        cursor.execute(
+            f"COPY INTO {table} FROM @%{table} FILE_FORMAT = (TYPE = PARQUET) "
+            f"MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE PATTERN = '.*{load_id}.*' PURGE = TRUE"
+        )
+
+    def _upsert_from_staging(
+        self,
+        cursor: Any,
+        table: str,
+        staging_table: str,
+        columns: List[str],
+        key_columns: List[str]
+    ) -> None:
+        condition = " AND ".join(f"t.{column} = s.{column}" for column in key_columns)
+        updates = ", ".join(
+            f"t.{column} = s.{column}" for column in columns if column not in key_columns
+        )
+        update_clause = f"WHEN MATCHED THEN UPDATE SET {updates} " if updates else ""
+        cursor.execute(
+            f"MERGE INTO {table} t USING {staging_table} s ON {condition} "
+            f"{update_clause}"
+            f"WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}) "
+            f"VALUES ({', '.join(f's.{column}' for column in columns)})"
+        )
+
+class DuckDBConnection(DatabaseConnection):
+    backend = 'duckdb'
+    placeholder = '?'
+    explain_prefix = 'EXPLAIN (FORMAT JSON) '
+    supports_cancel = True
+
+    def __init__(self, database: str = None, read_only: bool = False):
+        super().__init__()
+
+        # Get configuration from environment variables
+        self.config = {
+            'database': database or os.getenv('DUCKDB_PATH', ':memory:'),
+            'read_only': read_only
+        }
+        self._parent: Optional['DuckDBConnection'] = None
+
+    def clone(self) -> 'DuckDBConnection':
+        # An in-memory database only exists inside its connection, so clones open
+        # cursors (independent connections to the same database) on the original
+        cloned = super().clone()
+        cloned._parent = self
+        return cloned
+
+    def connect(self) -> bool:
+        try:
+            import duckdb
+
+            parent = self._parent
+            if parent is not None and self.config['database'] == ':memory:':
+                if not parent.is_connected() and not parent.connect():
+                    return False
+                self.connection = parent.connection.cursor()
+            else:
+                self.connection = duckdb.connect(**self.config)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect to DuckDB database: {e}")
+            return False
+
+    def _cancel_running(self) -> None:
+        # Queries run on a cursor, which is a connection of its own
+        (self._active_cursor or self.connection).interrupt()
+
+    def _execute_query(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        timeout: int = 3000,
+        max_rows: int = 1000
+    ) -> Optional[pd.DataFrame]:
+        # DuckDB runs in-process, so there is no server-side statement timeout to set;
+        # with QUERY_WATCHDOG=all the watchdog interrupts queries that outlive it
+        # (see db/cancel.py)
+        if not self.is_connected():
+            if not self.connect():
+                return None
+
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+            self._active_cursor = cursor
+
+            with phase('execute'):
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+            if returns_rows(query, self.backend):
+                try:
+                    with phase('fetch'):
+                        data = cursor.fetchmany(max_rows)
+                    df = self._build_frame(cursor, data)
+                    return df
+                except Exception as e:
+                    logger.error(f"Error fetching results: {e}")
+                    return pd.DataFrame()  # Return empty DataFrame on error
+            else:
+                return None
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+
 # Helper functions to create and connect database instances
 
 def get_mysql_connection(for_schema_analysis: bool = False, database: str = None) -> MySQLConnection:
@@ -346,6 +1711,11 @@ def get_snowflake_connection() -> SnowflakeConnection:
     connection.connect()
     return connection 
 
+def get_duckdb_connection(database: str = None, read_only: bool = False) -> DuckDBConnection:
+    connection = DuckDBConnection(database=database, read_only=read_only)
+    connection.connect()
+    return connection
+
 def execute_query(connection: DatabaseConnection, query: str, params: Optional[Union[tuple, dict]] = None, timeout: int = 3000, max_rows: int = 1000, database: str = None) -> Optional[pd.DataFrame]:
     """
     Execute a query on the given database connection.
@@ -0,0 +1,184 @@
+"""
+Driver Value Conversion Module
+
+This module builds DataFrames from driver rows column by column. mysql.connector,
+psycopg2 and the other drivers return DECIMAL, TIME, binary and JSON values as
+individual Python objects (Decimal, timedelta/time, bytes, str); converting them
+afterwards with Series.apply runs Python code per cell. Here each column is
+converted in bulk through Arrow kernels before the DataFrame is constructed:
+
+- Decimal -> float64, or exact scaled int64 (decimal_mode='fixed')
+- timedelta / time -> timedelta64
+- bytes in text columns -> str (UTF-8 decoded in one pass)
+- JSON text -> parsed objects (orjson when installed)
+
+Functions:
+    build_converted_frame: Build a DataFrame from rows with bulk value conversion
+"""
+
+import json
+import decimal
+import datetime
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from cursor_analytics.db.dtypes import plan_dtypes, JSON, STRING
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    _json_loads: Callable[[Any], Any] = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _first_value(values: Sequence[Any]) -> Any:
+    for value in values:
+        if value is not None:
+            return value
+    return None
+
+
+def _decimal_scale(values: Sequence[Any]) -> int:
+    exponents = [
+        value.as_tuple().exponent for value in values if isinstance(value, decimal.Decimal)
+    ]
+    finite = [exponent for exponent in exponents if isinstance(exponent, int)]
+    return max(0, -min(finite)) if finite else 0
+
+
+def _convert_decimals(
+    values: Sequence[Any],
+    scale: Optional[int],
+    decimal_mode: str
+) -> Tuple[Any, Optional[int]]:
+    import pyarrow as pa
+
+    array = pa.array(values)
+    if decimal_mode == 'fixed':
+        scale = scale if scale is not None else _decimal_scale(values)
+        try:
+            fixed = array.cast(pa.decimal128(38, scale))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            fixed = None
+        if fixed is not None:
+            # decimal128 stores the unscaled integer as two little-endian 64-bit words;
+            # the low word is the value whenever the high word is only sign extension
+            words = np.frombuffer(fixed.buffers()[1], dtype=np.int64)[
+                2 * fixed.offset:2 * (fixed.offset + len(fixed))
+            ].reshape(-1, 2)
+            low, high = words[:, 0], words[:, 1]
+            if np.array_equal(high, np.where(low < 0, -1, 0)):
+                mask = np.asarray(fixed.is_null().to_numpy(zero_copy_only=False), dtype=bool)
+                return pd.arrays.IntegerArray(low.copy(), mask), scale
+    return array.cast(pa.float64()).to_numpy(zero_copy_only=False), None
+
+
+def _convert_durations(values: Sequence[Any]) -> Any:
+    import pyarrow as pa
+
+    sample = _first_value(values)
+    if isinstance(sample, datetime.time):
+        # TIME of day (psycopg2) becomes the offset since midnight
+        microseconds = pa.array(values, type=pa.time64('us')).cast(pa.int64())
+        return pd.to_timedelta(microseconds.to_numpy(zero_copy_only=False), unit='us')
+    durations = pa.array(values, type=pa.duration('us'))
+    return durations.to_pandas()
+
+
+def _decode_text(values: Sequence[Any]) -> Any:
+    import pyarrow as pa
+
+    binary = pa.array(
+        [bytes(value) if isinstance(value, bytearray) else value for value in values],
+        type=pa.binary()
+    )
+    return binary.cast(pa.string()).to_numpy(zero_copy_only=False)
+
+
+def _parse_json(values: Sequence[Any]) -> List[Any]:
+    return [
+        _json_loads(value) if isinstance(value, (str, bytes, bytearray)) else value
+        for value in values
+    ]
+
+
+def _convert_column(
+    values: Sequence[Any],
+    kind: Optional[str],
+    scale: Optional[int],
+    decimal_mode: str
+) -> Tuple[Any, Optional[int]]:
+    sample = _first_value(values)
+    if sample is None:
+        return values, None
+    if isinstance(sample, decimal.Decimal):
+        return _convert_decimals(values, scale, decimal_mode)
+    if isinstance(sample, (datetime.timedelta, datetime.time)):
+        return _convert_durations(values), None
+    if kind == JSON:
+        if isinstance(sample, (bytes, bytearray)):
+            values = _decode_text(values)
+        return _parse_json(values), None
+    if kind == STRING and isinstance(sample, (bytes, bytearray)):
+        return _decode_text(values), None
+    return values, None
+
+
+def build_converted_frame(
+    data: Sequence[Any],
+    description: Sequence[Sequence[Any]],
+    backend: str,
+    decimal_mode: str = 'float',
+    column_types: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    Build a DataFrame from driver rows, converting driver-native values per column.
+
+    Args:
+        data: Rows as tuples or dicts (dictionary cursors)
+        description: cursor.description of the executed query
+        backend: 'mysql', 'postgres', 'snowflake' or 'duckdb'
+        decimal_mode: 'float' for float64 or 'fixed' for scaled integers; the scale of
+            fixed-point columns is recorded in df.attrs['decimal_scales']
+        column_types: Optional column name to MySQL COLUMN_TYPE string (see plan_dtypes)
+
+    Returns:
+        pd.DataFrame: Result frame with converted columns
+    """
+    columns = [desc[0] for desc in description]
+    if not data:
+        return pd.DataFrame(columns=columns)
+
+    if isinstance(data[0], dict):
+        column_values = [[row.get(column) for row in data] for column in columns]
+    else:
+        column_values = [list(values) for values in zip(*data)]
+
+    plan = plan_dtypes(description, backend, column_types)
+    converted: Dict[int, Any] = {}
+    decimal_scales: Dict[str, int] = {}
+    for index, (column, values) in enumerate(zip(columns, column_values)):
+        entry = plan.get(column, {})
+        try:
+            values, fixed_scale = _convert_column(
+                values, entry.get('kind'), entry.get('scale'), decimal_mode
+            )
+        except Exception as e:
+            # Mixed or unexpected values: keep the driver objects for this column
+            logger.debug(f"Bulk conversion skipped for column {column}: {e}")
+            fixed_scale = None
+        if fixed_scale is not None:
+            decimal_scales[column] = fixed_scale
+        converted[index] = values
+
+    # Integer keys keep duplicate column names (e.g. from joins) intact
+    df = pd.DataFrame(converted)
+    df.columns = columns
+    if decimal_scales:
+        df.attrs['decimal_scales'] = decimal_scales
+    return df
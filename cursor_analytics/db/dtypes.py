@@ -0,0 +1,271 @@
+"""
+Result Dtype Planning Module
+
+This module picks compact pandas dtypes for query results. Column types are taken
+from the driver's cursor.description type codes (optionally refined with MySQL
+COLUMN_TYPE strings from MySQLSchemaAnalyzer) and mapped to a logical kind, which
+then decides the conversion: downcast integers, boolean for tinyint(1)/bool,
+float64 or scaled fixed-point integers for DECIMAL, datetime64 for dates and
+categoricals for ENUMs and low-cardinality strings.
+
+Functions:
+    plan_dtypes: Map result columns to logical kinds
+    optimize_dtypes: Convert a DataFrame according to a plan and report memory saved
+"""
+
+import re
+import decimal
+import logging
+from typing import Any, Dict, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Logical column kinds
+INTEGER = 'integer'
+FLOAT = 'float'
+DECIMAL = 'decimal'
+BOOLEAN = 'boolean'
+STRING = 'string'
+CATEGORY = 'category'
+DATETIME = 'datetime'
+DATE = 'date'
+TIME = 'time'
+JSON = 'json'
+BINARY = 'binary'
+
+# mysql.connector FieldType codes
+MYSQL_TYPE_KINDS = {
+    0: DECIMAL, 1: INTEGER, 2: INTEGER, 3: INTEGER, 4: FLOAT, 5: FLOAT, 7: DATETIME,
+    8: INTEGER, 9: INTEGER, 10: DATE, 11: TIME, 12: DATETIME, 13: INTEGER, 14: DATE,
+    15: STRING, 16: INTEGER, 245: JSON, 246: DECIMAL, 247: CATEGORY, 248: STRING,
+    # TEXT columns are reported as BLOB types with a character set
+    249: STRING, 250: STRING, 251: STRING, 252: STRING, 253: STRING, 254: STRING,
+    255: BINARY
+}
+MYSQL_ENUM_FLAG = 256
+MYSQL_BINARY_CHARSET = 63
+
+# PostgreSQL type OIDs
+POSTGRES_TYPE_KINDS = {
+    16: BOOLEAN, 20: INTEGER, 21: INTEGER, 23: INTEGER, 700: FLOAT, 701: FLOAT, 1700: DECIMAL,
+    18: STRING, 19: STRING, 25: STRING, 1042: STRING, 1043: STRING, 1082: DATE, 1083: TIME,
+    1114: DATETIME, 1184: DATETIME, 114: JSON, 3802: JSON, 17: BINARY
+}
+
+# snowflake.connector FIELD_TYPES indexes
+SNOWFLAKE_TYPE_KINDS = {
+    0: DECIMAL, 1: FLOAT, 2: STRING, 3: DATE, 4: DATETIME, 5: JSON, 6: DATETIME, 7: DATETIME,
+    8: DATETIME, 9: JSON, 10: JSON, 11: BINARY, 12: TIME, 13: BOOLEAN
+}
+
+# DuckDB reports type names; matched by prefix
+DUCKDB_TYPE_KINDS = [
+    ('BOOLEAN', BOOLEAN), ('TINYINT', INTEGER), ('SMALLINT', INTEGER), ('INTEGER', INTEGER),
+    ('BIGINT', INTEGER), ('HUGEINT', INTEGER), ('UTINYINT', INTEGER), ('USMALLINT', INTEGER),
+    ('UINTEGER', INTEGER), ('UBIGINT', INTEGER), ('FLOAT', FLOAT), ('DOUBLE', FLOAT),
+    ('DECIMAL', DECIMAL), ('VARCHAR', STRING), ('ENUM', CATEGORY), ('DATE', DATE),
+    ('TIMESTAMP', DATETIME), ('TIME', TIME), ('JSON', JSON), ('BLOB', BINARY)
+]
+
+DEFAULT_CATEGORY_RATIO = 0.5
+_COLUMN_TYPE = re.compile(r'^(\w+)(?:\((\d+)(?:,\s*(\d+))?\))?', re.IGNORECASE)
+
+
+def _schema_kind(column_type: str) -> Tuple[Optional[str], Optional[int]]:
+    # Refines a kind from a MySQL COLUMN_TYPE such as "tinyint(1)" or "decimal(12,4)"
+    match = _COLUMN_TYPE.match(column_type.strip())
+    if not match:
+        return None, None
+    base = match.group(1).lower()
+    if base == 'tinyint' and match.group(2) == '1':
+        return BOOLEAN, None
+    if base == 'enum':
+        return CATEGORY, None
+    if base in ('decimal', 'numeric'):
+        return DECIMAL, int(match.group(3) or 0)
+    return None, None
+
+
+def _description_kind(backend: str, desc: Sequence[Any]) -> Tuple[Optional[str], Optional[int]]:
+    type_code = desc[1]
+    scale = desc[5] if len(desc) > 5 and isinstance(desc[5], int) else None
+
+    if backend == 'mysql':
+        kind = MYSQL_TYPE_KINDS.get(type_code)
+        flags = desc[7] if len(desc) > 7 and isinstance(desc[7], int) else 0
+        if flags & MYSQL_ENUM_FLAG:
+            kind = CATEGORY
+        charset = desc[8] if len(desc) > 8 else None
+        if kind == STRING and type_code in (249, 250, 251, 252) and charset == MYSQL_BINARY_CHARSET:
+            kind = BINARY
+        return kind, scale
+    if backend == 'postgres':
+        return POSTGRES_TYPE_KINDS.get(type_code), scale
+    if backend == 'snowflake':
+        kind = SNOWFLAKE_TYPE_KINDS.get(type_code)
+        if kind == DECIMAL and scale == 0:
+            kind = INTEGER
+        return kind, scale
+    if backend == 'duckdb':
+        type_name = str(type_code).upper()
+        for prefix, kind in DUCKDB_TYPE_KINDS:
+            if type_name.startswith(prefix):
+                if kind == DECIMAL:
+                    match = re.search(r',\s*(\d+)\)', type_name)
+                    scale = int(match.group(1)) if match else None
+                return kind, scale
+    return None, None
+
+
+def plan_dtypes(
+    description: Sequence[Sequence[Any]],
+    backend: str,
+    column_types: Optional[Dict[str, str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Map each result column to a logical kind.
+
+    Args:
+        description: cursor.description of the executed query
+        backend: 'mysql', 'postgres', 'snowflake' or 'duckdb'
+        column_types: Optional column name to MySQL COLUMN_TYPE string, e.g. from
+            MySQLSchemaAnalyzer.get_table_columns, used to detect tinyint(1) and ENUMs
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Column name to {'kind': ..., 'scale': ...}
+    """
+    plan = {}
+    column_types = column_types or {}
+    for desc in description:
+        name = desc[0]
+        kind, scale = _description_kind(backend, desc)
+        if name in column_types:
+            schema_kind, schema_scale = _schema_kind(column_types[name])
+            kind = schema_kind or kind
+            scale = schema_scale if schema_scale is not None else scale
+        if kind is not None:
+            plan[name] = {'kind': kind, 'scale': scale}
+    return plan
+
+
+def _smallest_integer_dtype(series: pd.Series, nullable: bool) -> Optional[str]:
+    if series.empty:
+        return None
+    lo, hi = series.min(), series.max()
+    for bits in (8, 16, 32, 64):
+        info = np.iinfo(f'int{bits}')
+        if info.min <= lo and hi <= info.max:
+            return f'Int{bits}' if nullable else f'int{bits}'
+    return None
+
+
+def _convert_column(
+    series: pd.Series,
+    kind: str,
+    scale: Optional[int],
+    decimal_mode: str,
+    category_ratio: float
+) -> pd.Series:
+    non_null = series.dropna()
+
+    if kind in (INTEGER, BOOLEAN) and series.dtype != object and series.dtype.kind not in 'iufb':
+        return series
+    if kind == INTEGER:
+        values = pd.to_numeric(non_null)
+        # Integer columns containing NULLs arrive as float64
+        if values.dtype.kind == 'f' and (values % 1 == 0).all():
+            values = values.astype('int64')
+        if values.dtype.kind not in 'iu':
+            return series
+        dtype = _smallest_integer_dtype(values, nullable=len(non_null) < len(series))
+        return series.astype(dtype) if dtype else series
+    if kind == BOOLEAN:
+        if not set(pd.unique(non_null)).issubset({0, 1, True, False}):
+            return series
+        return series.astype('boolean' if len(non_null) < len(series) else bool)
+    if kind == FLOAT:
+        return pd.to_numeric(series, errors='coerce') if series.dtype == object else series
+    if kind == DECIMAL:
+        if series.dtype != object:
+            # Already converted in bulk when the frame was built (db/convert.py)
+            return series
+        if decimal_mode == 'fixed' and scale is not None:
+            # Scaled integers keep DECIMAL values exact; the scale is recorded in df.attrs
+            scaled = non_null.map(
+                lambda value: int(decimal.Decimal(str(value)).scaleb(scale).to_integral_value())
+            )
+            dtype = _smallest_integer_dtype(scaled, nullable=True)
+            if dtype:
+                return scaled.reindex(series.index).astype(dtype)
+        return pd.to_numeric(series, errors='coerce').astype('float64')
+    if kind in (DATETIME, DATE):
+        if series.dtype.kind == 'M':
+            return series
+        return pd.to_datetime(series, errors='coerce')
+    if kind == CATEGORY:
+        return series.astype('category')
+    if kind == STRING:
+        if len(non_null) and non_null.nunique() / len(series) <= category_ratio:
+            return series.astype('category')
+        return series
+    return series
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    plan: Dict[str, Dict[str, Any]],
+    decimal_mode: str = 'float',
+    category_ratio: float = DEFAULT_CATEGORY_RATIO
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Convert DataFrame columns to compact dtypes according to a plan.
+
+    Args:
+        df: Query result
+        plan: Output of plan_dtypes
+        decimal_mode: 'float' for float64 or 'fixed' for scaled integers
+        category_ratio: Maximum distinct/total ratio for strings to become categoricals
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: Converted frame and a report with memory
+        before/after/saved in bytes and the dtype changes per column
+    """
+    memory_before = int(df.memory_usage(deep=True).sum())
+    converted: Dict[str, pd.Series] = {}
+    changes: Dict[str, Tuple[str, str]] = {}
+    decimal_scales: Dict[str, int] = {}
+
+    for column, entry in plan.items():
+        if column not in df.columns or isinstance(df[column], pd.DataFrame):
+            continue
+        series = df[column]
+        try:
+            new_series = _convert_column(
+                series, entry['kind'], entry.get('scale'), decimal_mode, category_ratio
+            )
+        except (TypeError, ValueError, OverflowError) as e:
+            logger.debug(f"Keeping dtype of column {column}: {e}")
+            continue
+        if new_series is not series and str(new_series.dtype) != str(series.dtype):
+            converted[column] = new_series
+            changes[column] = (str(series.dtype), str(new_series.dtype))
+            if entry['kind'] == DECIMAL and str(new_series.dtype).startswith('Int'):
+                decimal_scales[column] = entry['scale']
+
+    if converted:
+        df = df.copy(deep=False)
+        for column, series in converted.items():
+            df[column] = series
+        if decimal_scales:
+            df.attrs['decimal_scales'] = {**df.attrs.get('decimal_scales', {}), **decimal_scales}
+
+    memory_after = int(df.memory_usage(deep=True).sum())
+    report = {
+        'memory_before': memory_before,
+        'memory_after': memory_after,
+        'memory_saved': memory_before - memory_after,
+        'columns': changes
+    }
+    return df, report
@@ -0,0 +1,212 @@
+"""
+Lookup Join Module
+
+This module enriches a local DataFrame with columns from a remote table. Only the
+distinct join keys are sent to the server: small key sets are pushed as batched
+IN (...) lookups that run concurrently over pooled connections, and large key sets
+are bulk-loaded into a temporary table and joined server-side in one query.
+
+Functions:
+    enrich: Left-join (by default) a DataFrame to a remote table on a key column
+"""
+
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+import pandas as pd
+
+from cursor_analytics.db.connection import DatabaseConnection, MySQLConnection, SnowflakeConnection
+from cursor_analytics.db.pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMP_TABLE_THRESHOLD = 50000
+DEFAULT_MAX_BATCH_KEYS = 10000
+# Share of max_allowed_packet a single IN (...) statement may use
+PACKET_HEADROOM = 0.5
+TEMP_KEYS_TABLE = '_enrich_keys'
+
+
+def enrich(
+    df: pd.DataFrame,
+    connection: DatabaseConnection,
+    table: str,
+    key: str,
+    columns: Optional[List[str]] = None,
+    how: str = 'left',
+    batch_size: Optional[int] = None,
+    temp_table_threshold: int = DEFAULT_TEMP_TABLE_THRESHOLD,
+    max_workers: int = 4,
+    pool: Optional[ConnectionPool] = None
+) -> pd.DataFrame:
+    """
+    Join a local DataFrame to a remote table by pushing its keys to the server.
+
+    Args:
+        df: Local DataFrame containing the key column
+        connection: Connection to the database holding the lookup table
+        table: Remote table to enrich from
+        key: Join column, present both in df and in the remote table
+        columns: Remote columns to fetch (all columns if None)
+        how: pandas merge strategy used for the final join
+        batch_size: Keys per IN (...) batch (derived from the packet limit if None)
+        temp_table_threshold: Distinct key count from which a temp table join is used
+        max_workers: Number of concurrent lookup batches
+        pool: Optional pool to run batches on (a temporary pool is created if None)
+
+    Returns:
+        pd.DataFrame: df joined with the matching remote rows
+    """
+    if key not in df.columns:
+        raise KeyError(f"Key column not found in DataFrame: {key}")
+
+    start_time = time.time()
+    keys = [_to_python(value) for value in df[key].dropna().unique()]
+    projection = _projection(key, columns)
+
+    if not keys:
+        remote = pd.DataFrame(columns=[key] + [c for c in (columns or []) if c != key])
+    elif len(keys) >= temp_table_threshold and not isinstance(connection, SnowflakeConnection):
+        remote = _enrich_via_temp_table(connection, table, key, projection, keys, batch_size)
+    else:
+        batch_size = batch_size or _max_batch_keys(connection, keys)
+        remote = _enrich_via_batches(connection, table, key, projection, keys, batch_size,
+                                     max_workers, pool)
+
+    logger.info(
+        f"Enriched {len(df)} rows from {table} using {len(keys)} distinct keys "
+        f"({len(remote)} remote rows) in {time.time() - start_time:.2f} seconds"
+    )
+    return df.merge(remote, on=key, how=how)
+
+
+def _projection(key: str, columns: Optional[List[str]]) -> str:
+    if not columns:
+        return "*"
+    return ", ".join([key] + [column for column in columns if column != key])
+
+
+def _to_python(value: Any) -> Any:
+    # Drivers cannot bind NumPy scalars, so unwrap them to plain Python values
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _max_batch_keys(connection: DatabaseConnection, keys: List[Any]) -> int:
+    if not isinstance(connection, MySQLConnection):
+        return DEFAULT_MAX_BATCH_KEYS
+
+    packet_limit = None
+    try:
+        if connection.is_connected() or connection.connect():
+            with connection.connection.cursor() as cursor:
+                cursor.execute("SELECT @@max_allowed_packet")
+                packet_limit = int(cursor.fetchone()[0])
+    except Exception as e:
+        logger.warning(f"Failed to read max_allowed_packet, using default batch size: {e}")
+
+    if not packet_limit:
+        return DEFAULT_MAX_BATCH_KEYS
+
+    # Estimate the encoded size of a key from a sample, plus quoting and separator
+    sample = keys[:1000]
+    bytes_per_key = max(len(str(value)) for value in sample) + 4
+    return max(1, min(DEFAULT_MAX_BATCH_KEYS, int(packet_limit * PACKET_HEADROOM) // bytes_per_key))
+
+
+def _enrich_via_batches(
+    connection: DatabaseConnection,
+    table: str,
+    key: str,
+    projection: str,
+    keys: List[Any],
+    batch_size: int,
+    max_workers: int,
+    pool: Optional[ConnectionPool]
+) -> pd.DataFrame:
+    batches = [keys[i:i + batch_size] for i in range(0, len(keys), batch_size)]
+    logger.info(f"Looking up {len(keys)} keys in {len(batches)} batches of up to {batch_size}")
+
+    def fetch_batch(batch: List[Any], batch_connection: DatabaseConnection) -> pd.DataFrame:
+        placeholders = ", ".join([batch_connection.placeholder] * len(batch))
+        query = f"SELECT {projection} FROM {table} WHERE {key} IN ({placeholders})"
+        frames = list(batch_connection.stream_query(query, tuple(batch)))
+        return pd.concat(frames, ignore_index=True)
+
+    if len(batches) == 1:
+        return fetch_batch(batches[0], connection)
+
+    owns_pool = pool is None
+    pool = pool or ConnectionPool(connection, max_size=max_workers)
+
+    def run_batch(batch: List[Any]) -> pd.DataFrame:
+        with pool.connection() as pooled_connection:
+            return fetch_batch(batch, pooled_connection)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(run_batch, batches))
+    finally:
+        if owns_pool:
+            pool.close()
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def _enrich_via_temp_table(
+    connection: DatabaseConnection,
+    table: str,
+    key: str,
+    projection: str,
+    keys: List[Any],
+    batch_size: Optional[int]
+) -> pd.DataFrame:
+    # Temporary tables are session-scoped, so every step runs on the caller's connection
+    if not connection.is_connected() and not connection.connect():
+        raise ConnectionError(f"Failed to connect to {type(connection).__name__} database")
+
+    logger.info(f"Loading {len(keys)} keys into temporary table {TEMP_KEYS_TABLE}")
+    insert_batch = batch_size or DEFAULT_MAX_BATCH_KEYS
+    if projection == "*":
+        remote_projection = "r.*"
+    else:
+        remote_projection = ", ".join(f"r.{column.strip()}" for column in projection.split(","))
+    query = (
+        f"SELECT {remote_projection} FROM {table} r "
+        f"JOIN {TEMP_KEYS_TABLE} k ON r.{key} = k.{key}"
+    )
+    failed = True
+    try:
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(f"DROP TABLE IF EXISTS {TEMP_KEYS_TABLE}")
+            # Copy the key column definition from the lookup table so the join can use its index
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {TEMP_KEYS_TABLE} AS SELECT {key} FROM {table} WHERE 1 = 0"
+            )
+            # Reuse the backend's bulk-load path (COPY / LOAD DATA / executemany)
+            key_frame = pd.DataFrame({key: keys})
+            load_id = uuid.uuid4().hex
+            for i in range(0, len(keys), insert_batch):
+                connection._bulk_load(
+                    cursor, TEMP_KEYS_TABLE, [key], key_frame.iloc[i:i + insert_batch], load_id
+                )
+            connection._finish_bulk_load(cursor, TEMP_KEYS_TABLE, [key], load_id)
+        finally:
+            cursor.close()
+        frames = list(connection.stream_query(query))
+        failed = False
+    finally:
+        # The table must not outlive the call on a pooled or reused connection; on
+        # PostgreSQL a failed load aborted the transaction, which is rolled back first
+        if failed:
+            connection._recover_from_error()
+        cleanup = connection.connection.cursor()
+        try:
+            cleanup.execute(f"DROP TABLE IF EXISTS {TEMP_KEYS_TABLE}")
+            connection.connection.commit()
+        finally:
+            cleanup.close()
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,240 @@
+"""
+Query Plan Module
+
+This module interprets the JSON plans returned by DatabaseConnection.explain():
+`EXPLAIN FORMAT=JSON` on MySQL, `EXPLAIN (FORMAT JSON)` on PostgreSQL and DuckDB and
+`EXPLAIN USING JSON` on Snowflake. Each backend nests its plan differently, so the
+plan is walked as a tree of JSON objects and every object is checked against the
+backend's rules for expensive operations:
+
+    full_scan        every row of a table is read (MySQL access_type ALL, PostgreSQL
+                     Seq Scan, an unfiltered DuckDB SEQ_SCAN, a Snowflake TableScan
+                     that prunes no partitions)
+    filesort         the result is sorted rather than read in index order
+    temporary_table  an intermediate result is materialized
+
+The plans also carry the optimizer's estimates, which estimate_rows() extracts as
+rows scanned, rows returned and (Snowflake) bytes scanned.
+
+Functions:
+    explainable: Whether a query can be explained
+    plan_nodes: Every JSON object of a plan, depth first
+    plan_issues: Expensive operations found in a plan
+    postgres_seq_scans: Relations a PostgreSQL plan scans in full
+    estimate_rows: Optimizer estimates of rows scanned and returned
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from cursor_analytics.db.sql_parser import preprocess, READ
+
+FULL_SCAN = 'full_scan'
+FILESORT = 'filesort'
+TEMPORARY_TABLE = 'temporary_table'
+# Leading keywords of single statements that EXPLAIN accepts (EXPLAIN or SHOW cannot
+# be explained themselves); only reads are explained
+EXPLAINABLE_KEYWORDS = ('select', 'with', 'table', 'values')
+
+
+def explainable(query: str, dialect: Optional[str] = None) -> bool:
+    info = preprocess(query, dialect)
+    return info.keyword in EXPLAINABLE_KEYWORDS and info.kind == READ and not info.is_multi
+
+
+def plan_nodes(plan: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(plan, dict):
+        yield plan
+        children = plan.values()
+    elif isinstance(plan, list):
+        children = plan
+    else:
+        return
+    for child in children:
+        yield from plan_nodes(child)
+
+
+def _issue(kind: str, table: Optional[str] = None) -> Dict[str, Optional[str]]:
+    return {'issue': kind, 'table': table}
+
+
+def _mysql_issues(node: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+    issues = []
+    if node.get('access_type') == 'ALL':
+        issues.append(_issue(FULL_SCAN, node.get('table_name')))
+    if node.get('using_filesort'):
+        issues.append(_issue(FILESORT))
+    if node.get('using_temporary_table'):
+        issues.append(_issue(TEMPORARY_TABLE))
+    return issues
+
+
+def _postgres_issues(node: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+    node_type = node.get('Node Type')
+    if node_type == 'Seq Scan':
+        return [_issue(FULL_SCAN, node.get('Relation Name'))]
+    if node_type in ('Sort', 'Incremental Sort'):
+        return [_issue(FILESORT)]
+    if node_type == 'Materialize':
+        return [_issue(TEMPORARY_TABLE)]
+    return []
+
+
+def _snowflake_issues(node: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+    operation = node.get('operation')
+    if operation == 'TableScan':
+        total = node.get('partitionsTotal') or 0
+        if total > 1 and (node.get('partitionsAssigned') or 0) >= total:
+            objects = node.get('objects') or [None]
+            return [_issue(FULL_SCAN, objects[0])]
+    elif operation in ('Sort', 'SortWithLimit'):
+        return [_issue(FILESORT)]
+    elif operation == 'WithClause':
+        return [_issue(TEMPORARY_TABLE)]
+    return []
+
+
+def _duckdb_issues(node: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+    name = str(node.get('name', '')).strip()
+    extra = node.get('extra_info') if isinstance(node.get('extra_info'), dict) else {}
+    if name == 'SEQ_SCAN':
+        # DuckDB always scans sequentially; only scans without a pushed-down filter read
+        # everything ('optional:' dynamic filters, e.g. for TOP_N, may not prune at all)
+        filters = extra.get('Filters') or []
+        filters = filters if isinstance(filters, list) else [filters]
+        if not any(not str(condition).startswith('optional:') for condition in filters):
+            return [_issue(FULL_SCAN, extra.get('Table'))]
+        return []
+    if name in ('ORDER_BY', 'TOP_N'):
+        return [_issue(FILESORT)]
+    if name in ('CTE', 'MATERIALIZED_CTE'):
+        return [_issue(TEMPORARY_TABLE)]
+    return []
+
+
+_RULES: Dict[str, Callable[[Dict[str, Any]], List[Dict[str, Optional[str]]]]] = {
+    'mysql': _mysql_issues,
+    'postgres': _postgres_issues,
+    'snowflake': _snowflake_issues,
+    'duckdb': _duckdb_issues
+}
+
+
+def plan_issues(backend: str, plan: Any) -> List[Dict[str, Optional[str]]]:
+    """
+    Find the expensive operations in a query plan.
+
+    Args:
+        backend: Backend name of the plan, e.g. 'mysql'
+        plan: Parsed JSON plan as returned by DatabaseConnection.explain()
+
+    Returns:
+        List[Dict[str, Optional[str]]]: One {'issue', 'table'} entry per operation found,
+        without duplicates; empty for unknown backends
+    """
+    rules = _RULES.get(backend)
+    if rules is None or plan is None:
+        return []
+    issues: List[Dict[str, Optional[str]]] = []
+    for node in plan_nodes(plan):
+        for issue in rules(node):
+            if issue not in issues:
+                issues.append(issue)
+    return issues
+
+
+def postgres_seq_scans(plan: Any) -> List[str]:
+    # Relations a PostgreSQL plan reads in full, whose row counts estimate_rows needs
+    relations = []
+    for node in plan_nodes(plan):
+        relation = node.get('Relation Name')
+        if node.get('Node Type') == 'Seq Scan' and relation and relation not in relations:
+            relations.append(relation)
+    return relations
+
+
+def _number(value: Any) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _sum(values: List[Optional[int]]) -> Optional[int]:
+    values = [value for value in values if value is not None]
+    return sum(values) if values else None
+
+
+def _postgres_scanned(node: Dict[str, Any], table_rows: Dict[str, int]) -> Optional[int]:
+    # A Seq Scan reads the whole relation however selective its filter; Plan Rows only
+    # counts the rows the filter passes on
+    if node.get('Node Type') == 'Seq Scan':
+        if node.get('Relation Name') in table_rows:
+            return table_rows[node['Relation Name']]
+        if 'Rows Removed by Filter' in node:
+            # EXPLAIN ANALYZE plans count the rows the filter dropped
+            return _sum([
+                _number(node.get('Actual Rows', node.get('Plan Rows'))),
+                _number(node['Rows Removed by Filter'])
+            ])
+    return _number(node.get('Plan Rows'))
+
+
+def estimate_rows(
+    backend: str,
+    plan: Any,
+    table_rows: Optional[Dict[str, int]] = None
+) -> Dict[str, Optional[int]]:
+    """
+    Extract the optimizer's size estimates from a query plan.
+
+    Scan estimates come from the scan nodes. PostgreSQL and DuckDB only estimate the
+    rows a scan passes on after its filter, so for a PostgreSQL Seq Scan the table's
+    row count is used when table_rows gives it; otherwise (and for DuckDB)
+    rows_scanned is a lower bound.
+
+    Args:
+        backend: Backend name of the plan, e.g. 'mysql'
+        plan: Parsed JSON plan as returned by DatabaseConnection.explain()
+        table_rows: Row counts of scanned tables by relation name, e.g. PostgreSQL's
+            pg_class.reltuples (see postgres_seq_scans)
+
+    Returns:
+        Dict[str, Optional[int]]: rows_scanned, rows_returned and bytes_scanned, each
+        None when the backend's plan does not estimate it
+    """
+    estimate: Dict[str, Optional[int]] = {
+        'rows_scanned': None, 'rows_returned': None, 'bytes_scanned': None
+    }
+    if plan is None:
+        return estimate
+    nodes = list(plan_nodes(plan))
+
+    if backend == 'mysql':
+        tables = [node for node in nodes if 'rows_examined_per_scan' in node]
+        estimate['rows_scanned'] = _sum([
+            _number(node['rows_examined_per_scan']) for node in tables
+        ])
+        if tables:
+            # Tables are listed in join order; the last one produces the joined rows
+            estimate['rows_returned'] = _number(tables[-1].get('rows_produced_per_join'))
+    elif backend == 'postgres':
+        top = next((node for node in nodes if 'Plan Rows' in node), None)
+        estimate['rows_returned'] = _number(top.get('Plan Rows')) if top else None
+        estimate['rows_scanned'] = _sum([
+            _postgres_scanned(node, table_rows or {}) for node in nodes if 'Relation Name' in node
+        ])
+    elif backend == 'snowflake':
+        stats = next((node['GlobalStats'] for node in nodes if 'GlobalStats' in node), {})
+        estimate['bytes_scanned'] = _number(stats.get('bytesAssigned'))
+    elif backend == 'duckdb':
+        def cardinality(node: Dict[str, Any]) -> Optional[int]:
+            extra = node.get('extra_info')
+            return _number(extra.get('Estimated Cardinality')) if isinstance(extra, dict) else None
+
+        # Operators that do not estimate their output report 0
+        estimates = [cardinality(node) for node in nodes if 'name' in node]
+        estimate['rows_returned'] = next((rows for rows in estimates if rows), None)
+        estimate['rows_scanned'] = _sum([
+            cardinality(node) for node in nodes if str(node.get('name', '')).strip() == 'SEQ_SCAN'
+        ])
+    return estimate
@@ -0,0 +1,216 @@
+"""
+Table Export Module
+
+This module extracts complete tables to Parquet using keyset pagination: each page
+is read with WHERE key > last_key ORDER BY key LIMIT n, so every page costs the same
+regardless of how deep into the table it is (unlike OFFSET paging). Progress is
+checkpointed after each Parquet part file, and an interrupted export resumes from
+the last key that was safely written.
+
+Functions:
+    export_table: Export a table to a directory of Parquet part files
+    discover_key_columns: Find a table's primary key through the schema analyzer
+"""
+
+import os
+import json
+import time
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+
+from cursor_analytics.config.settings import settings
+from cursor_analytics.db.connection import DatabaseConnection, MySQLConnection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50000
+DEFAULT_PAGES_PER_FILE = 20
+DEFAULT_PAGE_TIMEOUT = 60000  # milliseconds
+CHECKPOINT_FILE = '_checkpoint.json'
+
+
+def discover_key_columns(connection: DatabaseConnection, table: str) -> List[str]:
+    if not isinstance(connection, MySQLConnection):
+        raise ValueError(
+            f"Primary key discovery is only supported for MySQL; pass key_columns for {table}"
+        )
+
+    from cursor_analytics.db.schema import MySQLSchemaAnalyzer
+
+    key_columns = MySQLSchemaAnalyzer(connection).get_primary_key(table)
+    if not key_columns:
+        raise ValueError(f"Table {table} has no primary key; pass key_columns explicitly")
+    return key_columns
+
+
+def _keyset_condition(
+    key_columns: List[str],
+    last_key: List[Any],
+    placeholder: str
+) -> Tuple[str, List[Any]]:
+    # Expands (a, b) > (x, y) into a > x OR (a = x AND b > y), which every backend
+    # supports and which can still use the key index
+    clauses = []
+    params: List[Any] = []
+    for i, column in enumerate(key_columns):
+        parts = [f"{key_columns[j]} = {placeholder}" for j in range(i)]
+        parts.append(f"{column} > {placeholder}")
+        params.extend(last_key[:i + 1])
+        clauses.append("(" + " AND ".join(parts) + ")")
+    return " OR ".join(clauses), params
+
+
+def _to_python(value: Any) -> Any:
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _load_checkpoint(output_dir: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _save_checkpoint(output_dir: str, checkpoint: Dict[str, Any]) -> None:
+    # Write-then-rename so a crash never leaves a truncated checkpoint behind
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(checkpoint, f, default=str)
+    os.replace(path + '.tmp', path)
+
+
+def export_table(
+    connection: DatabaseConnection,
+    table: str,
+    key_columns: Optional[List[str]] = None,
+    output_dir: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    pages_per_file: int = DEFAULT_PAGES_PER_FILE,
+    timeout: int = DEFAULT_PAGE_TIMEOUT,
+    resume: bool = True
+) -> Dict[str, Any]:
+    """
+    Export a full table to Parquet using keyset pagination.
+
+    Args:
+        connection: Connection to the database holding the table
+        table: Table to export
+        key_columns: Unique, ordered key to page by (the primary key if None, MySQL only)
+        output_dir: Directory for part files and the checkpoint
+            (defaults to <output_dir>/<table>_export)
+        columns: Columns to export (all columns if None)
+        page_size: Rows fetched per query
+        pages_per_file: Pages written to each Parquet part file
+        timeout: Per-page query timeout in milliseconds
+        resume: Continue from an existing checkpoint instead of starting over
+
+    Returns:
+        Dict[str, Any]: Export summary (rows, files, output_dir, complete)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    key_columns = key_columns or discover_key_columns(connection, table)
+    output_dir = output_dir or os.path.join(settings.output_dir, f"{table}_export")
+    os.makedirs(output_dir, exist_ok=True)
+
+    checkpoint = _load_checkpoint(output_dir) if resume else None
+    if checkpoint and checkpoint.get('key_columns') != key_columns:
+        raise ValueError(f"Checkpoint in {output_dir} was written with different key columns")
+    if checkpoint and checkpoint.get('complete'):
+        logger.info(f"Export of {table} is already complete in {output_dir}")
+        return checkpoint
+    checkpoint = checkpoint or {
+        'table': table,
+        'key_columns': key_columns,
+        'last_key': None,
+        'next_part': 0,
+        'rows': 0,
+        'complete': False
+    }
+    if checkpoint['last_key'] is not None:
+        logger.info(f"Resuming export of {table} after key {checkpoint['last_key']}")
+
+    projection = "*"
+    if columns:
+        projection = ", ".join(columns + [key for key in key_columns if key not in columns])
+    order_by = ", ".join(key_columns)
+
+    start_time = time.time()
+    last_key = checkpoint['last_key']
+    writer = None
+    part_path = None
+    pages_in_file = 0
+    rows_in_file = 0
+
+    def close_part() -> None:
+        # A part only becomes visible, and the checkpoint only advances, once the
+        # file is complete on disk
+        nonlocal writer, pages_in_file, rows_in_file
+        if writer is None:
+            return
+        writer.close()
+        os.replace(part_path + '.tmp', part_path)
+        checkpoint['last_key'] = last_key
+        checkpoint['next_part'] += 1
+        checkpoint['rows'] += rows_in_file
+        _save_checkpoint(output_dir, checkpoint)
+        writer = None
+        pages_in_file = 0
+        rows_in_file = 0
+
+    while True:
+        query = f"SELECT {projection} FROM {table}"
+        params: List[Any] = []
+        if last_key is not None:
+            condition, params = _keyset_condition(key_columns, last_key, connection.placeholder)
+            query += f" WHERE {condition}"
+        query += f" ORDER BY {order_by} LIMIT {page_size}"
+
+        page = connection.execute_query(
+            query, tuple(params) or None, timeout=timeout, max_rows=page_size
+        )
+        if page is None:
+            close_part()
+            raise RuntimeError(
+                f"Export of {table} failed after {checkpoint['rows']} rows; "
+                f"rerun to resume from key {checkpoint['last_key']}"
+            )
+        if page.empty:
+            break
+
+        page_table = pa.Table.from_pandas(page, preserve_index=False)
+        if writer is not None and not page_table.schema.equals(writer.schema):
+            try:
+                page_table = page_table.cast(writer.schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError):
+                # e.g. a column that was all NULL in earlier pages; start a new part
+                close_part()
+        if writer is None:
+            part_path = os.path.join(output_dir, f"part-{checkpoint['next_part']:05d}.parquet")
+            writer = pq.ParquetWriter(part_path + '.tmp', page_table.schema)
+        writer.write_table(page_table)
+        pages_in_file += 1
+        rows_in_file += len(page)
+
+        last_key = [_to_python(value) for value in page[key_columns].iloc[-1].tolist()]
+        if pages_in_file >= pages_per_file:
+            close_part()
+        if len(page) < page_size:
+            break
+
+    close_part()
+    checkpoint['complete'] = True
+    _save_checkpoint(output_dir, checkpoint)
+
+    elapsed_time = time.time() - start_time
+    logger.info(
+        f"Exported {checkpoint['rows']} rows of {table} to {checkpoint['next_part']} "
+        f"part files in {output_dir} ({elapsed_time:.2f} seconds)"
+    )
+    return dict(checkpoint, output_dir=output_dir, files=checkpoint['next_part'])
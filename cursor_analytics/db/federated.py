@@ -0,0 +1,188 @@
+"""
+Federated Query Module
+
+This module joins tables that live in different databases without pulling every
+side fully into pandas first. Each referenced table is read from its own backend
+with the requested columns and filter pushed down into the remote SELECT, streamed
+in batches into a local DuckDB engine, and the cross-database query is then run
+by DuckDB, which spills to disk when the working set exceeds its memory limit.
+
+Classes:
+    FederatedQuery: Registers remote sources and runs a query across them locally
+
+Functions:
+    federated_query: Convenience wrapper for one-off federated queries
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Union, List
+import pandas as pd
+
+from cursor_analytics.db.connection import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50000
+DEFAULT_MEMORY_LIMIT = '2GB'
+
+
+class FederatedQuery:
+    def __init__(
+        self,
+        memory_limit: str = DEFAULT_MEMORY_LIMIT,
+        temp_directory: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = 4
+    ):
+        self.memory_limit = memory_limit
+        self.temp_directory = temp_directory
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.sources: Dict[str, Dict[str, Any]] = {}
+
+        # Per-source transfer statistics, populated by execute()
+        self.bytes_pulled: Dict[str, int] = {}
+        self.rows_pulled: Dict[str, int] = {}
+
+    def add_source(
+        self,
+        alias: str,
+        connection: DatabaseConnection,
+        table: str,
+        columns: Optional[List[str]] = None,
+        where: Optional[str] = None,
+        params: Optional[Union[tuple, dict]] = None
+    ) -> 'FederatedQuery':
+        if alias in self.sources:
+            raise ValueError(f"Source alias already registered: {alias}")
+
+        self.sources[alias] = {
+            'connection': connection,
+            'table': table,
+            'columns': columns,
+            'where': where,
+            'params': params
+        }
+        return self
+
+    def build_source_query(self, alias: str) -> str:
+        source = self.sources[alias]
+        projection = ", ".join(source['columns']) if source['columns'] else "*"
+        query = f"SELECT {projection} FROM {source['table']}"
+        if source['where']:
+            query += f" WHERE {source['where']}"
+        return query
+
+    def execute(self, query: str) -> pd.DataFrame:
+        if not self.sources:
+            raise ValueError("No sources registered for federated query")
+
+        import duckdb
+
+        engine = duckdb.connect(':memory:')
+        try:
+            engine.execute(f"SET memory_limit = '{self.memory_limit}'")
+            # Insertion order does not matter for joins and relaxing it lets DuckDB spill
+            engine.execute("SET preserve_insertion_order = false")
+            if self.temp_directory:
+                engine.execute(f"SET temp_directory = '{self.temp_directory}'")
+
+            self.bytes_pulled = {}
+            self.rows_pulled = {}
+            self._load_sources(engine)
+
+            start_time = time.time()
+            results = engine.execute(query).fetch_df()
+            logger.info(
+                f"Federated query returned {len(results)} rows in "
+                f"{time.time() - start_time:.2f} seconds"
+            )
+            return results
+        finally:
+            engine.close()
+
+    def _load_sources(self, engine: Any) -> None:
+        # Sources sharing one DatabaseConnection must be read one after another, but
+        # sources on different connections are pulled concurrently.
+        groups: Dict[int, List[str]] = {}
+        for alias, source in self.sources.items():
+            groups.setdefault(id(source['connection']), []).append(alias)
+
+        stats_lock = threading.Lock()
+
+        def load_group(aliases: List[str]) -> None:
+            # DuckDB connections are not shared across threads; each worker gets a cursor
+            local_engine = engine.cursor()
+            try:
+                for alias in aliases:
+                    self._load_source(local_engine, alias, stats_lock)
+            finally:
+                local_engine.close()
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups))) as executor:
+            futures = [executor.submit(load_group, aliases) for aliases in groups.values()]
+            for future in futures:
+                future.result()
+
+    def _load_source(self, engine: Any, alias: str, stats_lock: threading.Lock) -> None:
+        source = self.sources[alias]
+        source_query = self.build_source_query(alias)
+        logger.info(f"Pulling federated source '{alias}': {source_query}")
+
+        start_time = time.time()
+        bytes_pulled = 0
+        rows_pulled = 0
+        created = False
+        batch_name = f"_federated_batch_{alias}"
+
+        for batch in source['connection'].stream_query(
+            source_query, source['params'], batch_size=self.batch_size
+        ):
+            bytes_pulled += int(batch.memory_usage(deep=True).sum())
+            rows_pulled += len(batch)
+
+            engine.register(batch_name, batch)
+            try:
+                if created:
+                    engine.execute(f'INSERT INTO "{alias}" SELECT * FROM {batch_name}')
+                else:
+                    engine.execute(f'CREATE TABLE "{alias}" AS SELECT * FROM {batch_name}')
+                    created = True
+            finally:
+                engine.unregister(batch_name)
+
+        with stats_lock:
+            self.bytes_pulled[alias] = bytes_pulled
+            self.rows_pulled[alias] = rows_pulled
+
+        logger.info(
+            f"Source '{alias}' pulled {rows_pulled} rows ({bytes_pulled / 1024 / 1024:.2f} MB) "
+            f"in {time.time() - start_time:.2f} seconds"
+        )
+
+
+def federated_query(
+    query: str,
+    sources: Dict[str, Dict[str, Any]],
+    memory_limit: str = DEFAULT_MEMORY_LIMIT,
+    temp_directory: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Run a query that joins tables from several databases.
+
+    Args:
+        query: SQL executed by the local engine, referring to sources by alias
+        sources: Mapping of alias to add_source() keyword arguments
+        memory_limit: Memory limit for the local engine before it spills to disk
+        temp_directory: Directory used by the local engine for spilling
+
+    Returns:
+        pd.DataFrame: Result of the federated query
+    """
+    federated = FederatedQuery(memory_limit=memory_limit, temp_directory=temp_directory)
+    for alias, source in sources.items():
+        federated.add_source(alias, **source)
+    return federated.execute(query)
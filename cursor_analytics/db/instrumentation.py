@@ -0,0 +1,310 @@
+"""
+Query Instrumentation Module
+
+This module records where the time of each query execution goes. The connection
+layer marks its phases with phase():
+
+    queue    waiting for an admission slot (see admission.py)
+    connect  opening the connection
+    session  session setup (timeouts, row limits)
+    execute  sending the statement and waiting for the server
+    fetch    transferring result rows
+    build    constructing and converting the DataFrame
+
+and each execution is summarized as a QueryTrace with the result's rows, columns
+and in-memory bytes. Traces go to pluggable sinks: in memory, a JSON Lines file or
+a Prometheus text-format file (for node_exporter's textfile collector). Without a
+sink nothing is recorded; with one, a phase costs two perf_counter() calls.
+
+Sinks are registered with add_sink() or through QUERY_TRACE_SINKS, a comma separated
+list of `memory`, `jsonl:<path>` and `prometheus:<path>`.
+
+Classes:
+    QueryTrace: Phase timings and result size of one query execution
+    TraceSink: Base class of trace sinks
+    MemorySink: Keeps the most recent traces in memory
+    JsonLinesSink: Appends one JSON object per trace to a file
+    PrometheusSink: Maintains counters in a Prometheus text-format file
+
+Functions:
+    phase: Context manager timing one phase of the current trace
+    trace_query: Context manager recording a QueryTrace for one execution
+    add_sink: Register a sink
+    remove_sink: Unregister a sink
+    get_sinks: The registered sinks
+"""
+
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from cursor_analytics.db.sql_parser import preprocess
+
+logger = logging.getLogger(__name__)
+
+PHASES = ('queue', 'connect', 'session', 'execute', 'fetch', 'build')
+DEFAULT_MEMORY_TRACES = 1000
+DEFAULT_PROMETHEUS_INTERVAL = 15.0  # seconds between rewrites of the metrics file
+
+_current: contextvars.ContextVar[Optional['QueryTrace']] = contextvars.ContextVar(
+    'query_trace', default=None
+)
+
+
+class QueryTrace:
+    __slots__ = (
+        'backend', 'query', 'started_at', 'spans', 'total_seconds', 'rows', 'columns',
+        'bytes', 'error'
+    )
+
+    def __init__(self, backend: str, query: str):
+        self.backend = backend
+        self.query = query
+        self.started_at = time.time()
+        self.spans: Dict[str, float] = {}
+        self.total_seconds = 0.0
+        self.rows: Optional[int] = None
+        self.columns: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        return preprocess(self.query, self.backend).fingerprint
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def set_result(self, result: Any) -> None:
+        # Shallow memory usage: cheap, and exact for numeric and Arrow-backed columns
+        if result is None or not hasattr(result, 'memory_usage'):
+            return
+        self.rows = len(result)
+        self.columns = len(result.columns)
+        self.bytes = int(result.memory_usage(index=False).sum())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'backend': self.backend,
+            'fingerprint': self.fingerprint,
+            'started_at': self.started_at,
+            'total_seconds': round(self.total_seconds, 6),
+            'spans': {name: round(seconds, 6) for name, seconds in self.spans.items()},
+            'rows': self.rows,
+            'columns': self.columns,
+            'bytes': self.bytes,
+            'error': self.error
+        }
+
+
+class TraceSink:
+    def emit(self, trace: QueryTrace) -> None:
+        raise NotImplementedError("Subclasses must implement emit()")
+
+    def close(self) -> None:
+        pass
+
+
+class MemorySink(TraceSink):
+    def __init__(self, max_traces: int = DEFAULT_MEMORY_TRACES):
+        self._traces: deque = deque(maxlen=max_traces)
+
+    def emit(self, trace: QueryTrace) -> None:
+        self._traces.append(trace)
+
+    def traces(self) -> List[QueryTrace]:
+        return list(self._traces)
+
+    def clear(self) -> None:
+        self._traces.clear()
+
+
+class JsonLinesSink(TraceSink):
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', buffering=1)
+        self._lock = threading.Lock()
+
+    def emit(self, trace: QueryTrace) -> None:
+        line = json.dumps(trace.to_dict())
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class PrometheusSink(TraceSink):
+    def __init__(self, path: str, write_interval: float = DEFAULT_PROMETHEUS_INTERVAL):
+        self.path = path
+        self.write_interval = write_interval
+        self._queries: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._rows: Dict[str, int] = {}
+        self._bytes: Dict[str, int] = {}
+        self._phase_seconds: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+
+    def emit(self, trace: QueryTrace) -> None:
+        backend = trace.backend
+        with self._lock:
+            self._queries[backend] = self._queries.get(backend, 0) + 1
+            if trace.error:
+                self._errors[backend] = self._errors.get(backend, 0) + 1
+            self._rows[backend] = self._rows.get(backend, 0) + (trace.rows or 0)
+            self._bytes[backend] = self._bytes.get(backend, 0) + (trace.bytes or 0)
+            for name, seconds in trace.spans.items():
+                key = (backend, name)
+                self._phase_seconds[key] = self._phase_seconds.get(key, 0.0) + seconds
+            due = time.monotonic() - self._last_write >= self.write_interval
+        if due:
+            self.write()
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            counters = [
+                ('cursor_analytics_queries_total', 'Executed queries', self._queries),
+                ('cursor_analytics_query_errors_total', 'Failed queries', self._errors),
+                ('cursor_analytics_query_rows_total', 'Rows returned', self._rows),
+                ('cursor_analytics_query_bytes_total', 'Bytes of returned DataFrames', self._bytes)
+            ]
+            for name, help_text, values in counters:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                lines += [f'{name}{{backend="{backend}"}} {value}' for backend, value in
+                          sorted(values.items())]
+            name = 'cursor_analytics_query_phase_seconds_total'
+            lines += [f"# HELP {name} Time spent per query phase", f"# TYPE {name} counter"]
+            lines += [
+                f'{name}{{backend="{backend}",phase="{phase_name}"}} {seconds:.6f}'
+                for (backend, phase_name), seconds in sorted(self._phase_seconds.items())
+            ]
+        return '\n'.join(lines) + '\n'
+
+    def write(self) -> None:
+        # Written atomically so a collector never reads a partial file
+        content = self.render()
+        with self._lock:
+            self._last_write = time.monotonic()
+        try:
+            with open(self.path + '.tmp', 'w') as f:
+                f.write(content)
+            os.replace(self.path + '.tmp', self.path)
+        except OSError as e:
+            logger.warning(f"Failed to write query metrics to {self.path}: {e}")
+
+    def close(self) -> None:
+        self.write()
+
+
+_sinks: Optional[List[TraceSink]] = None
+_sinks_lock = threading.Lock()
+
+
+def _sinks_from_env() -> List[TraceSink]:
+    sinks: List[TraceSink] = []
+    for item in os.getenv('QUERY_TRACE_SINKS', '').split(','):
+        kind, _, path = item.strip().partition(':')
+        if kind == 'memory':
+            sinks.append(MemorySink())
+        elif kind == 'jsonl' and path:
+            sinks.append(JsonLinesSink(path))
+        elif kind == 'prometheus' and path:
+            sinks.append(PrometheusSink(path))
+        elif kind:
+            logger.warning(f"Ignoring unknown query trace sink: {item}")
+    return sinks
+
+
+def get_sinks() -> List[TraceSink]:
+    global _sinks
+    if _sinks is None:
+        with _sinks_lock:
+            if _sinks is None:
+                _sinks = _sinks_from_env()
+    return _sinks
+
+
+def add_sink(sink: TraceSink) -> TraceSink:
+    global _sinks
+    with _sinks_lock:
+        # The list is replaced, never mutated, so emitting threads need no lock
+        _sinks = (_sinks if _sinks is not None else _sinks_from_env()) + [sink]
+    return sink
+
+
+def remove_sink(sink: TraceSink) -> None:
+    global _sinks
+    with _sinks_lock:
+        _sinks = [registered for registered in (_sinks or []) if registered is not sink]
+    sink.close()
+
+
+@atexit.register
+def _close_sinks() -> None:
+    for sink in _sinks or []:
+        try:
+            sink.close()
+        except Exception as e:
+            logger.warning(f"Failed to close query trace sink: {e}")
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - start)
+
+
+@contextmanager
+def trace_query(backend: str, query: str) -> Iterator[Optional[QueryTrace]]:
+    """
+    Record a QueryTrace for the execution in the block and emit it to the sinks.
+
+    Args:
+        backend: Backend name, e.g. 'mysql'
+        query: SQL text of the execution
+
+    Yields:
+        Optional[QueryTrace]: The trace to annotate, or None when no sink is registered
+    """
+    sinks = get_sinks()
+    # Nested executions (e.g. a query issued while a script runs) keep the outer trace
+    if not sinks or _current.get() is not None:
+        yield None
+        return
+
+    trace = QueryTrace(backend, query)
+    token = _current.set(trace)
+    start = time.perf_counter()
+    try:
+        yield trace
+    except BaseException as e:
+        trace.error = repr(e)
+        raise
+    finally:
+        trace.total_seconds = time.perf_counter() - start
+        _current.reset(token)
+        for sink in sinks:
+            try:
+                sink.emit(trace)
+            except Exception as e:
+                logger.warning(f"Query trace sink {type(sink).__name__} failed: {e}")
@@ -0,0 +1,210 @@
+"""
+Partitioned Read Module
+
+This module reads a large table in parallel. The range of a numeric or date column
+is split into partitions (from its MIN/MAX, or from caller-supplied boundaries such
+as quantiles), each partition is streamed over its own pooled connection, and the
+batches are written straight to one Parquet file per partition or collected as
+Arrow tables and concatenated without copying.
+
+Functions:
+    read_partitioned: Read a table concurrently by ranges of one column
+    partition_bounds: Compute partition boundaries for a column
+"""
+
+import os
+import time
+import logging
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from cursor_analytics.db.connection import DatabaseConnection
+from cursor_analytics.db.pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50000
+
+
+def _to_python(value: Any) -> Any:
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value.item() if hasattr(value, 'item') else value
+
+
+def partition_bounds(
+    connection: DatabaseConnection,
+    table: str,
+    column: str,
+    partitions: int,
+    where: Optional[str] = None
+) -> List[Any]:
+    """
+    Split the MIN..MAX range of a column into equal-width partitions.
+
+    Args:
+        connection: Connection to the database holding the table
+        table: Table to read
+        column: Numeric, date or datetime column to partition on
+        partitions: Number of partitions
+        where: Optional filter applied to the whole read
+
+    Returns:
+        List[Any]: partitions + 1 ascending boundaries, starting at MIN and ending at MAX
+    """
+    query = f"SELECT MIN({column}) AS lo, MAX({column}) AS hi FROM {table}"
+    if where:
+        query += f" WHERE {where}"
+    bounds = connection.execute_query(query)
+    if bounds is None or bounds.empty:
+        raise RuntimeError(f"Failed to read the range of {table}.{column}")
+
+    lo, hi = bounds.iloc[0]['lo'], bounds.iloc[0]['hi']
+    if lo is None or pd.isna(lo):
+        return []
+
+    if isinstance(lo, (datetime.date, pd.Timestamp)):
+        is_date = isinstance(lo, datetime.date) and not isinstance(lo, datetime.datetime)
+        edges = pd.date_range(pd.Timestamp(lo), pd.Timestamp(hi), periods=partitions + 1)
+        boundaries = [edge.date() if is_date else edge.to_pydatetime() for edge in edges]
+    elif isinstance(lo, (int, np.integer)):
+        lo, hi = int(lo), int(hi)
+        step = max(1, -(-(hi - lo) // partitions))
+        boundaries = list(range(lo, hi, step)) + [hi]
+    else:
+        lo, hi = float(lo), float(hi)
+        boundaries = [lo + (hi - lo) * i / partitions for i in range(partitions + 1)]
+
+    # Collapse duplicate edges produced by narrow ranges
+    unique = [boundaries[0]]
+    for boundary in boundaries[1:]:
+        if boundary != unique[-1]:
+            unique.append(boundary)
+    return unique if len(unique) > 1 else [unique[0], unique[0]]
+
+
+def _partition_predicates(
+    column: str,
+    boundaries: List[Any],
+    placeholder: str
+) -> List[Tuple[str, List[Any]]]:
+    predicates = []
+    last = len(boundaries) - 2
+    for i in range(len(boundaries) - 1):
+        upper = "<=" if i == last else "<"
+        predicate = f"{column} >= {placeholder} AND {column} {upper} {placeholder}"
+        if i == 0:
+            # Rows with a NULL partition column belong to no range; read them with the first
+            predicate = f"({predicate}) OR {column} IS NULL"
+        predicates.append(
+            (predicate, [_to_python(boundaries[i]), _to_python(boundaries[i + 1])])
+        )
+    return predicates
+
+
+def read_partitioned(
+    connection: DatabaseConnection,
+    table: str,
+    column: str,
+    partitions: int = 4,
+    columns: Optional[List[str]] = None,
+    where: Optional[str] = None,
+    boundaries: Optional[List[Any]] = None,
+    output_dir: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pool: Optional[ConnectionPool] = None
+) -> Union[Any, List[str]]:
+    """
+    Read a table concurrently by ranges of one column.
+
+    Args:
+        connection: Connection to the database holding the table
+        table: Table to read
+        column: Numeric, date or datetime column to partition on
+        partitions: Number of partitions and concurrent connections
+        columns: Columns to read (all columns if None)
+        where: Optional filter applied to every partition
+        boundaries: Explicit ascending partition edges (e.g. quantiles) instead of MIN/MAX
+        output_dir: Write one Parquet file per partition here instead of returning data
+        batch_size: Rows fetched per round trip within a partition
+        pool: Optional pool to read on (a temporary pool is created if None)
+
+    Returns:
+        pyarrow.Table with all rows, or the list of Parquet files when output_dir is set
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    start_time = time.time()
+    boundaries = boundaries or partition_bounds(connection, table, column, partitions, where)
+    if not boundaries:
+        logger.info(f"{table}.{column} has no values to partition")
+        return [] if output_dir else pa.table({})
+
+    projection = ", ".join(columns) if columns else "*"
+    predicates = _partition_predicates(column, boundaries, connection.placeholder)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    def read_partition(index: int, predicate: str, params: List[Any],
+                       partition_connection: DatabaseConnection) -> Dict[str, Any]:
+        query = f"SELECT {projection} FROM {table} WHERE ({predicate})"
+        if where:
+            query += f" AND ({where})"
+
+        tables = []
+        writer = None
+        path = os.path.join(output_dir, f"part-{index:03d}.parquet") if output_dir else None
+        rows = 0
+        try:
+            for batch in partition_connection.stream_query(query, tuple(params), batch_size):
+                batch_table = pa.Table.from_pandas(batch, preserve_index=False)
+                rows += batch_table.num_rows
+                if path is None:
+                    tables.append(batch_table)
+                    continue
+                if not batch_table.num_rows:
+                    continue
+                if writer is None:
+                    writer = pq.ParquetWriter(path, batch_table.schema)
+                writer.write_table(batch_table.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return {'index': index, 'rows': rows, 'path': path if writer else None, 'tables': tables}
+
+    owns_pool = pool is None
+    pool = pool or ConnectionPool(connection, max_size=len(predicates))
+
+    def run_partition(item: Tuple[int, Tuple[str, List[Any]]]) -> Dict[str, Any]:
+        index, (predicate, params) = item
+        with pool.connection() as partition_connection:
+            return read_partition(index, predicate, params, partition_connection)
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(predicates)) as executor:
+            results = list(executor.map(run_partition, enumerate(predicates)))
+    finally:
+        if owns_pool:
+            pool.close()
+
+    total_rows = sum(result['rows'] for result in results)
+    logger.info(
+        f"Read {total_rows} rows from {table} in {len(results)} partitions on {column} "
+        f"in {time.time() - start_time:.2f} seconds"
+    )
+
+    if output_dir:
+        return [result['path'] for result in results if result['path']]
+
+    # concat_tables only stitches the existing chunks together; no data is copied
+    tables = [table_part for result in results for table_part in result['tables']]
+    try:
+        return pa.concat_tables(tables, promote_options='permissive')
+    except TypeError:
+        # pyarrow < 14 has no promote_options
+        return pa.concat_tables(tables)
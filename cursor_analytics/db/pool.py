@@ -0,0 +1,102 @@
+"""
+Connection Pool Module
+
+This module provides a small thread-safe pool of database connections. Pooled
+connections are disconnected clones of a template DatabaseConnection, opened
+lazily up to a maximum size and handed out one thread at a time.
+
+Classes:
+    ConnectionPool: Bounded pool of connections to the same database
+"""
+
+import logging
+import threading
+from queue import LifoQueue, Empty
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from cursor_analytics.db.connection import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    def __init__(self, template: DatabaseConnection, max_size: int = 4):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.template = template
+        self.max_size = max_size
+        self._idle: LifoQueue = LifoQueue()
+        self._all: List[DatabaseConnection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return len(self._all)
+
+    def acquire(self, timeout: Optional[float] = None) -> DatabaseConnection:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        # Prefer a warm idle connection, open a new one if the pool may still grow,
+        # otherwise wait for another thread to release one
+        try:
+            connection = self._idle.get_nowait()
+        except Empty:
+            connection = self._open_connection()
+            if connection is None:
+                try:
+                    connection = self._idle.get(timeout=timeout)
+                except Empty:
+                    raise TimeoutError(
+                        f"No pooled connection was released within {timeout}s "
+                        f"(all {self.max_size} in use)"
+                    ) from None
+
+        if not connection.is_connected() and not connection.connect():
+            self.release(connection)
+            raise ConnectionError(f"Failed to open pooled {type(self.template).__name__}")
+        return connection
+
+    def release(self, connection: DatabaseConnection) -> None:
+        if self._closed:
+            connection.disconnect()
+            return
+        self._idle.put(connection)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[DatabaseConnection]:
+        connection = self.acquire(timeout=timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for connection in self._all:
+                if connection.is_connected():
+                    connection.disconnect()
+            self._all = []
+
+    def _open_connection(self) -> Optional[DatabaseConnection]:
+        with self._lock:
+            if len(self._all) >= self.max_size:
+                return None
+            connection = self.template.clone()
+            self._all.append(connection)
+
+        logger.info(
+            f"Opening pooled {type(connection).__name__} ({len(self._all)}/{self.max_size})"
+        )
+        connection.connect()
+        return connection
+
+    def __enter__(self) -> 'ConnectionPool':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
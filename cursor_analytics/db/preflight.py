@@ -0,0 +1,206 @@
+"""
+Query Pre-flight Module
+
+This module checks a query's cost before it runs. max_rows and SQL_SELECT_LIMIT only
+truncate a result after the server has done the full work, so a pre-flight check
+EXPLAINs the query first, on the connection it is about to run on (see
+DatabaseConnection.explain), and compares the optimizer's estimates with configured
+limits:
+
+    max_scan        rows scanned (PREFLIGHT_MAX_SCAN or the CLI's --max-scan)
+    max_scan_bytes  bytes scanned, for Snowflake whose plans estimate bytes rather
+                    than rows (PREFLIGHT_MAX_SCAN_BYTES)
+
+A query over a limit is refused unless the caller's confirm callback accepts it; the
+refusal suggests sampling the table, filtering the scanned tables or reading them in
+partitions. A result estimated to exceed max_rows only logs a truncation warning.
+Queries that cannot be explained (scripts, SHOW) or whose EXPLAIN fails are allowed.
+
+Classes:
+    PreflightResult: Estimates of one query and the limits it exceeds
+
+Functions:
+    preflight_query: EXPLAIN a query and compare its estimates with limits
+    guard_query: Run the pre-flight check and decide whether the query may run
+"""
+
+import os
+import logging
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from cursor_analytics.db.explain import (
+    FULL_SCAN, estimate_rows, explainable, plan_issues, postgres_seq_scans
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ROWS = 1000  # execute_query's default result cap
+
+# Clauses that read a sample of a table instead of all of it
+SAMPLE_CLAUSES = {
+    'postgres': "FROM <table> TABLESAMPLE SYSTEM (1)",
+    'snowflake': "FROM <table> SAMPLE (1)",
+    'duckdb': "FROM <table> USING SAMPLE 1%",
+    'mysql': "a primary key range (WHERE id BETWEEN ... AND ...)"
+}
+
+
+class PreflightResult:
+    def __init__(
+        self,
+        backend: str,
+        estimate: Dict[str, Optional[int]],
+        issues: List[Dict[str, Optional[str]]]
+    ):
+        self.backend = backend
+        self.estimate = estimate
+        self.issues = issues
+        # Limits exceeded; the query is refused unless confirmed
+        self.reasons: List[str] = []
+        self.warnings: List[str] = []
+        self.suggestions: List[str] = []
+
+    @property
+    def allowed(self) -> bool:
+        return not self.reasons
+
+    def message(self) -> str:
+        lines = [f"Pre-flight check: {reason}" for reason in self.reasons + self.warnings]
+        lines += [f"  - {suggestion}" for suggestion in self.suggestions]
+        return '\n'.join(lines)
+
+
+def _table_rows(connection: Any, plan: Any) -> Dict[str, int]:
+    # PostgreSQL plans estimate Seq Scans after their filter; the planner's table
+    # statistics give the rows actually read (-1 for tables never analyzed)
+    relations = postgres_seq_scans(plan) if connection.backend == 'postgres' else []
+    if not relations:
+        return {}
+    counts = connection.execute_query(
+        "SELECT name AS relation, c.reltuples FROM unnest(%s::text[]) AS name "
+        "JOIN pg_class c ON c.oid = to_regclass(name)",
+        (relations,)
+    )
+    if counts is None:
+        return {}
+    return {
+        relation: int(rows) for relation, rows in zip(counts['relation'], counts['reltuples'])
+        if rows >= 0
+    }
+
+
+def _suggestions(backend: str, issues: List[Dict[str, Optional[str]]]) -> List[str]:
+    suggestions = []
+    for issue in issues:
+        if issue['issue'] == FULL_SCAN and issue['table']:
+            suggestions.append(
+                f"Filter {issue['table']} on an indexed or clustering column (e.g. a date range)"
+            )
+    suggestions.append(
+        f"Try the query on a sample first: {SAMPLE_CLAUSES.get(backend, 'a LIMIT')}"
+    )
+    suggestions.append(
+        "Read large tables in key ranges with read_partitioned() or export_table()"
+    )
+    return suggestions
+
+
+def preflight_query(
+    connection: Any,
+    query: str,
+    params: Optional[Union[tuple, dict]] = None,
+    max_scan: Optional[int] = None,
+    max_scan_bytes: Optional[int] = None,
+    max_rows: Optional[int] = DEFAULT_MAX_ROWS
+) -> Optional[PreflightResult]:
+    """
+    EXPLAIN a query and compare the optimizer's estimates with limits.
+
+    Args:
+        connection: DatabaseConnection the query will run on
+        query: SQL query, with placeholders in the connection's style
+        params: Query parameters
+        max_scan: Maximum estimated rows scanned (None for no limit)
+        max_scan_bytes: Maximum estimated bytes scanned (None for no limit)
+        max_rows: Result cap of the execution, for the truncation warning
+
+    Returns:
+        Optional[PreflightResult]: The estimates and exceeded limits, or None if the
+        query could not be explained
+    """
+    if not explainable(query, connection.backend):
+        return None
+    # The query runs next on the same connection, which is idle in the meantime
+    plan = connection.explain(query, params, reuse_connection=True)
+    if plan is None:
+        return None
+
+    result = PreflightResult(
+        connection.backend,
+        estimate_rows(connection.backend, plan, _table_rows(connection, plan)),
+        plan_issues(connection.backend, plan)
+    )
+    scanned = result.estimate['rows_scanned']
+    scanned_bytes = result.estimate['bytes_scanned']
+    returned = result.estimate['rows_returned']
+    if max_scan is not None and scanned is not None and scanned > max_scan:
+        result.reasons.append(f"query would scan ~{scanned:,} rows (limit {max_scan:,})")
+    if max_scan_bytes is not None and scanned_bytes is not None and scanned_bytes > max_scan_bytes:
+        result.reasons.append(
+            f"query would scan ~{scanned_bytes / 1024 ** 3:.2f} GB "
+            f"(limit {max_scan_bytes / 1024 ** 3:.2f} GB)"
+        )
+    if max_rows is not None and returned is not None and returned > max_rows:
+        result.warnings.append(
+            f"query would return ~{returned:,} rows; the result is truncated to {max_rows:,}"
+        )
+    if result.reasons:
+        result.suggestions = _suggestions(connection.backend, result.issues)
+    return result
+
+
+def guard_query(
+    connection: Any,
+    query: str,
+    params: Optional[Union[tuple, dict]] = None,
+    max_scan: Optional[int] = None,
+    confirm: Optional[Callable[[str], bool]] = None
+) -> bool:
+    """
+    Run the pre-flight check of a query and decide whether it may run.
+
+    Nothing is explained unless a limit is set, here or through PREFLIGHT_MAX_SCAN and
+    PREFLIGHT_MAX_SCAN_BYTES.
+
+    Args:
+        connection: DatabaseConnection the query will run on
+        query: SQL query, with placeholders in the connection's style
+        params: Query parameters
+        max_scan: Maximum estimated rows scanned (defaults to PREFLIGHT_MAX_SCAN)
+        confirm: Called with the explanation when a limit is exceeded; the query runs
+            if it returns True. Without it, such queries are refused.
+
+    Returns:
+        bool: Whether the query may run
+    """
+    if max_scan is None and os.getenv('PREFLIGHT_MAX_SCAN'):
+        max_scan = int(os.getenv('PREFLIGHT_MAX_SCAN'))
+    max_scan_bytes = os.getenv('PREFLIGHT_MAX_SCAN_BYTES')
+    max_scan_bytes = int(max_scan_bytes) if max_scan_bytes else None
+    if max_scan is None and max_scan_bytes is None:
+        return True
+
+    result = preflight_query(connection, query, params, max_scan, max_scan_bytes)
+    if result is None:
+        logger.info("Pre-flight check skipped: the query could not be explained")
+        return True
+    logger.info(f"Pre-flight estimate: {result.estimate}")
+    if result.allowed:
+        for warning in result.warnings:
+            logger.warning(f"Pre-flight check: {warning}")
+        return True
+    if confirm is not None and confirm(result.message()):
+        logger.warning("Pre-flight limits exceeded; running the query as confirmed")
+        return True
+    logger.error(f"Query refused.\n{result.message()}")
+    return False
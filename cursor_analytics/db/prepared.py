@@ -0,0 +1,114 @@
+"""
+Prepared Statement Cache Module
+
+This module keeps server-side prepared statements for parameterized queries that are
+executed repeatedly on one connection, so the server parses and plans them once.
+Statements are keyed by their normalized SQL text (see sql_parser.preprocess),
+evicted least recently used first, and dropped wholesale when the connection is
+re-established because server-side handles do not survive a reconnect.
+
+Classes:
+    PreparedStatementCache: Per-connection LRU cache of prepared statement handles
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 64
+# A statement is prepared on its second execution; one-off queries never pay for it
+DEFAULT_PREPARE_THRESHOLD = 2
+
+
+class PreparedStatementCache:
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        prepare_threshold: int = DEFAULT_PREPARE_THRESHOLD,
+        on_evict: Optional[Callable[[Any], None]] = None
+    ):
+        self.max_size = max_size
+        self.prepare_threshold = prepare_threshold
+        self.on_evict = on_evict
+        self._statements: 'OrderedDict[str, Any]' = OrderedDict()
+        # Execution counts of statements that are not prepared yet, bounded like the cache
+        self._seen: 'OrderedDict[str, int]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            handle = self._statements.get(key)
+            if handle is None:
+                self.misses += 1
+                return None
+            self._statements.move_to_end(key)
+            self.hits += 1
+            return handle
+
+    def should_prepare(self, key: str) -> bool:
+        # Counts an unprepared execution and reports whether the statement has now
+        # repeated often enough to be worth preparing
+        with self._lock:
+            count = self._seen.pop(key, 0) + 1
+            if count >= self.prepare_threshold:
+                return True
+            self._seen[key] = count
+            if len(self._seen) > 4 * self.max_size:
+                self._seen.popitem(last=False)
+            return False
+
+    def put(self, key: str, handle: Any) -> None:
+        evicted = []
+        with self._lock:
+            self._statements[key] = handle
+            self._statements.move_to_end(key)
+            while len(self._statements) > self.max_size:
+                evicted.append(self._statements.popitem(last=False)[1])
+                self.evictions += 1
+        for old_handle in evicted:
+            self._release(old_handle)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            handle = self._statements.pop(key, None)
+        if handle is not None:
+            self._release(handle)
+
+    def invalidate(self) -> None:
+        # Server-side statements die with their session, so handles are forgotten
+        # without releasing them
+        with self._lock:
+            self._statements.clear()
+            self._seen.clear()
+
+    def _release(self, handle: Any) -> None:
+        if self.on_evict is None:
+            return
+        try:
+            self.on_evict(handle)
+        except Exception as e:
+            logger.warning(f"Failed to release prepared statement: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._statements),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
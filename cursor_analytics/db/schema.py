@@ -1,5 +1,6 @@
 import os
 import time
+import logging
 import pandas as pd
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union, Tuple
@@ -7,10 +8,10 @@ from typing import List, Dict, Any, Optional, Union, Tuple
 # Import modules
 from cursor_analytics.config.settings import settings
 from cursor_analytics.db.connection import MySQLConnection, get_mysql_connection
-from cursor_analytics.utils.logger import logger, setup_logger
+from cursor_analytics.utils.logger import logger
 
-# Create schema-specific logger
-schema_logger = setup_logger('cursor_analytics.db.schema')
+# Create schema-specific logger; logging is configured by the application
+schema_logger = logging.getLogger(__name__)
 
 
 class SchemaAnalyzer:
@@ -62,6 +63,31 @@ class MySQLSchemaAnalyzer(SchemaAnalyzer):
         """
         return self.connection.execute_query(query, params=(table_name,), timeout=10000)
     
+    def get_column_types(self, table_name: str) -> Dict[str, str]:
+        # COLUMN_TYPE strings (e.g. "tinyint(1)", "enum('a','b')") used as dtype hints
+        # by DatabaseConnection.column_types
+        columns_df = self.get_table_columns(table_name)
+        if columns_df is None or columns_df.empty:
+            return {}
+        return dict(zip(columns_df['COLUMN_NAME'], columns_df['COLUMN_TYPE']))
+    
+    def get_primary_key(self, table_name: str) -> List[str]:
+        # Columns in index order, which can differ from the table's column order;
+        # keyset pagination must sort by this order to read the index without a filesort
+        query = """
+        SELECT COLUMN_NAME
+        FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+        WHERE
+            TABLE_SCHEMA = DATABASE() AND
+            TABLE_NAME = %s AND
+            CONSTRAINT_NAME = 'PRIMARY'
+        ORDER BY ORDINAL_POSITION
+        """
+        key_df = self.connection.execute_query(query, params=(table_name,), timeout=10000)
+        if key_df is None or key_df.empty:
+            return []
+        return key_df['COLUMN_NAME'].tolist()
+    
     def get_table_foreign_keys(self, table_name: str) -> pd.DataFrame:
         query = """
         SELECT 
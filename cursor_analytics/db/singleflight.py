@@ -0,0 +1,157 @@
+"""
+Single-Flight Module
+
+This module coalesces identical concurrent work. While a call for a key is in
+flight, later calls for the same key wait for its result instead of starting their
+own, which DatabaseConnection uses so that dashboards and scheduled jobs firing the
+same read at the same moment run it on the server once. Keys are only shared while
+the call is running; nothing is cached after it finishes.
+
+Threads wait on the call directly and asyncio tasks await it without blocking their
+event loop, so both execution paths share the same in-flight calls.
+
+Classes:
+    SingleFlight: Registry of in-flight calls keyed by fingerprint
+
+Functions:
+    get_singleflight: Process-wide registry used by DatabaseConnection
+"""
+
+import asyncio
+import logging
+import threading
+import contextvars
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, Future] = {}
+        # Callers that joined each in-flight call
+        self._followers: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        # Returns the in-flight call for key and whether the caller must run it
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                self._followers[key] = self._followers.get(key, 0) + 1
+                return future, False
+            future = Future()
+            # A running future cannot be cancelled, so an async follower that gives up
+            # (wrap_future propagates its cancellation) leaves the call to the others
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            self.executions += 1
+            return future, True
+
+    def _run(
+        self,
+        key: Hashable,
+        future: Future,
+        fn: Callable[[], Any],
+        share: Optional[Callable[[Any], Any]]
+    ) -> Any:
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            # Callers joining after this point start their own call, so the follower
+            # count is final here
+            with self._lock:
+                self._calls.pop(key, None)
+                shared = self._followers.pop(key, 0) > 0
+        return share(result) if share is not None and shared else result
+
+    def do(
+        self,
+        key: Optional[Hashable],
+        fn: Callable[[], Any],
+        share: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """
+        Run fn, or wait for the in-flight call with the same key.
+
+        Args:
+            key: Fingerprint of the call; None runs fn without coalescing
+            fn: The work to run
+            share: Applied to the result for every caller when other callers joined
+                the call, e.g. to give each its own copy; a caller that ran alone
+                gets the result untouched
+
+        Returns:
+            Any: The result of fn, shared by every caller of the same flight
+        """
+        if key is None:
+            return fn()
+        future, leader = self._join(key)
+        if leader:
+            return self._run(key, future, fn, share)
+        logger.debug("Joined an in-flight query")
+        result = future.result()
+        return share(result) if share is not None else result
+
+    async def do_async(
+        self,
+        key: Optional[Hashable],
+        fn: Callable[[], Any],
+        share: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """
+        Asyncio counterpart of do(); blocking work runs in the default executor.
+
+        Args:
+            key: Fingerprint of the call; None runs fn without coalescing
+            fn: The blocking work to run
+            share: Applied to the result for every caller when the call was shared
+
+        Returns:
+            Any: The result of fn, shared by every caller of the same flight
+        """
+        loop = asyncio.get_running_loop()
+        # Executor threads do not inherit context variables such as the query priority
+        context = contextvars.copy_context()
+        if key is None:
+            return await loop.run_in_executor(None, context.run, fn)
+        future, leader = self._join(key)
+        if leader:
+            return await loop.run_in_executor(
+                None, context.run, self._run, key, future, fn, share
+            )
+        logger.debug("Joined an in-flight query")
+        result = await asyncio.wrap_future(future)
+        return share(result) if share is not None else result
+
+    def shared(self, key: Hashable) -> bool:
+        # Whether other callers joined the in-flight call for key
+        with self._lock:
+            return self._followers.get(key, 0) > 0
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'in_flight': self.in_flight()
+        }
+
+
+_singleflight = SingleFlight()
+
+
+def get_singleflight() -> SingleFlight:
+    return _singleflight
@@ -0,0 +1,310 @@
+"""
+Slow Query Log Module
+
+This module keeps a local slow-query log, so queries can be tuned without access to
+the server's own slow log. When an execute_query call takes longer than
+SLOW_QUERY_SECONDS, the query is EXPLAINed on a side connection (see
+DatabaseConnection.explain) and its text, timing and JSON plan are appended to a
+JSON Lines file (SLOW_QUERY_LOG, by default slow_queries.jsonl in the output
+directory) that rotates at SLOW_QUERY_LOG_MAX_BYTES.
+
+Plans are captured on a background thread so the slow query's caller is not slowed
+down further, and each fingerprint is explained at most once per
+SLOW_QUERY_EXPLAIN_INTERVAL seconds; captures in between are logged without a plan.
+Only reads are explained. Capturing is off unless SLOW_QUERY_SECONDS is set.
+
+The log is analyzed offline: analyze_slow_log() groups the entries by fingerprint and
+flags full scans, filesorts and temporary tables in their latest plan (see
+db/explain.py).
+
+    python -m cursor_analytics.db.slowlog [--log PATH]
+
+Classes:
+    SlowQueryLog: Captures slow queries and their plans into a rotating log
+
+Functions:
+    get_slow_query_log: Process-wide log used by DatabaseConnection (None when off)
+    set_slow_query_log: Replace the process-wide log
+    read_slow_log: Entries of a log, oldest first, including rotated files
+    analyze_slow_log: Per-fingerprint summary of a log with flagged plan issues
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from cursor_analytics.db.sql_parser import preprocess
+from cursor_analytics.db.explain import explainable, plan_issues
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_NAME = 'slow_queries.jsonl'
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+DEFAULT_EXPLAIN_INTERVAL = 600.0  # seconds between EXPLAINs of the same fingerprint
+# Captures waiting for the background thread; further slow queries are not captured
+MAX_PENDING_CAPTURES = 16
+QUERY_TEXT_LIMIT = 10000
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        path: str,
+        threshold: float,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        explain_interval: float = DEFAULT_EXPLAIN_INTERVAL
+    ):
+        self.path = path
+        self.threshold = threshold
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.explain_interval = explain_interval
+        self._explained: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.captured = 0
+        self.dropped = 0
+
+    def observe(
+        self,
+        connection: Any,
+        query: str,
+        params: Optional[Union[tuple, dict]],
+        seconds: float,
+        rows: Optional[int] = None
+    ) -> bool:
+        """
+        Capture an execution in the background if it was slow.
+
+        Args:
+            connection: DatabaseConnection that ran the query
+            query: SQL text of the execution
+            params: Query parameters, reused for the EXPLAIN
+            seconds: Duration of the execution
+            rows: Rows returned
+
+        Returns:
+            bool: Whether the execution is being captured
+        """
+        if seconds < self.threshold:
+            return False
+        with self._lock:
+            if self._pending >= MAX_PENDING_CAPTURES:
+                self.dropped += 1
+                return False
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='slow-query-log'
+                )
+            executor = self._executor
+        executor.submit(self._capture_pending, connection, query, params, seconds, rows)
+        return True
+
+    def _capture_pending(self, *args: Any) -> None:
+        try:
+            self.capture(*args)
+        except Exception as e:
+            logger.warning(f"Failed to capture slow query: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def capture(
+        self,
+        connection: Any,
+        query: str,
+        params: Optional[Union[tuple, dict]],
+        seconds: float,
+        rows: Optional[int] = None
+    ) -> Dict[str, Any]:
+        info = preprocess(query, connection.backend)
+        plan = None
+        if explainable(query, connection.backend) and self._explain_due(info.fingerprint):
+            plan = connection.explain(query, params)
+
+        config = getattr(connection, 'config', {})
+        entry = {
+            'timestamp': time.time(),
+            'backend': connection.backend,
+            'host': connection.host,
+            'database': config.get('database'),
+            'fingerprint': info.fingerprint,
+            'query': query[:QUERY_TEXT_LIMIT],
+            'parameterized': bool(params),
+            'seconds': round(seconds, 6),
+            'rows': rows,
+            'plan': plan
+        }
+        self.write(entry)
+        logger.warning(
+            f"Slow {connection.backend} query ({seconds:.2f}s) logged to {self.path}",
+            extra={'query_fingerprint': info.fingerprint, 'duration_ms': round(seconds * 1000, 3)}
+        )
+        return entry
+
+    def _explain_due(self, fingerprint: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            last = self._explained.get(fingerprint)
+            if last is not None and now - last < self.explain_interval:
+                return False
+            self._explained[fingerprint] = now
+            return True
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, default=str) + '\n'
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if self.max_bytes > 0 and os.path.exists(self.path) and \
+                    os.path.getsize(self.path) + len(line) > self.max_bytes:
+                self._rotate()
+            with open(self.path, 'a') as f:
+                f.write(line)
+            self.captured += 1
+
+    def _rotate(self) -> None:
+        # slow_queries.jsonl -> .1 -> .2 ...; the oldest backup is dropped
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def flush(self) -> None:
+        # Waits for pending captures; the log keeps accepting new ones
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_slow_log: Optional[SlowQueryLog] = None
+_configured = False
+_slow_log_lock = threading.Lock()
+
+
+def _default_path() -> str:
+    from cursor_analytics.config.settings import get_settings
+
+    return os.getenv('SLOW_QUERY_LOG') or os.path.join(
+        get_settings().output_dir, DEFAULT_LOG_NAME
+    )
+
+
+def get_slow_query_log() -> Optional[SlowQueryLog]:
+    global _slow_log, _configured
+    if not _configured:
+        with _slow_log_lock:
+            if not _configured:
+                threshold = os.getenv('SLOW_QUERY_SECONDS')
+                if threshold:
+                    _slow_log = SlowQueryLog(
+                        _default_path(),
+                        float(threshold),
+                        int(os.getenv('SLOW_QUERY_LOG_MAX_BYTES', str(DEFAULT_MAX_BYTES))),
+                        int(os.getenv('SLOW_QUERY_LOG_BACKUPS', str(DEFAULT_BACKUP_COUNT))),
+                        float(os.getenv('SLOW_QUERY_EXPLAIN_INTERVAL',
+                                        str(DEFAULT_EXPLAIN_INTERVAL)))
+                    )
+                _configured = True
+    return _slow_log
+
+
+def set_slow_query_log(slow_log: Optional[SlowQueryLog]) -> Optional[SlowQueryLog]:
+    # Returns the previous log; None turns capturing off
+    global _slow_log, _configured
+    with _slow_log_lock:
+        previous = _slow_log
+        _slow_log, _configured = slow_log, True
+    return previous
+
+
+def read_slow_log(path: str, backup_count: int = DEFAULT_BACKUP_COUNT) -> Iterator[Dict[str, Any]]:
+    paths = [f"{path}.{index}" for index in range(backup_count, 0, -1)] + [path]
+    for log_path in paths:
+        if not os.path.exists(log_path):
+            continue
+        with open(log_path, 'r') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash
+
+
+def analyze_slow_log(path: str, backup_count: int = DEFAULT_BACKUP_COUNT) -> List[Dict[str, Any]]:
+    """
+    Summarize a slow-query log by fingerprint and flag expensive plan operations.
+
+    Args:
+        path: Path of the log
+        backup_count: Number of rotated files to include
+
+    Returns:
+        List[Dict[str, Any]]: One summary per fingerprint (captures, max and total
+        seconds, the latest query text, plan issues), slowest total first
+    """
+    summaries: Dict[str, Dict[str, Any]] = {}
+    for entry in read_slow_log(path, backup_count):
+        summary = summaries.setdefault(entry.get('fingerprint'), {
+            'fingerprint': entry.get('fingerprint'),
+            'backend': entry.get('backend'),
+            'captures': 0,
+            'total_seconds': 0.0,
+            'max_seconds': 0.0,
+            'query': None,
+            'issues': [],
+            'last_seen': None
+        })
+        seconds = entry.get('seconds') or 0.0
+        summary['captures'] += 1
+        summary['total_seconds'] += seconds
+        summary['max_seconds'] = max(summary['max_seconds'], seconds)
+        summary['query'] = entry.get('query')
+        summary['last_seen'] = entry.get('timestamp')
+        # The latest plan wins: an index added since then shows up as a fixed issue
+        if entry.get('plan') is not None:
+            summary['issues'] = plan_issues(entry.get('backend'), entry['plan'])
+    return sorted(summaries.values(), key=lambda summary: summary['total_seconds'], reverse=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Analyze the slow-query log')
+    parser.add_argument('--log', type=str, help='Log path (default: SLOW_QUERY_LOG)')
+    parser.add_argument('--limit', type=int, default=20, help='Number of fingerprints shown')
+    args = parser.parse_args()
+
+    path = args.log or _default_path()
+    summaries = analyze_slow_log(path)
+    if not summaries:
+        print(f"No slow queries logged in {path}")
+        return
+    for summary in summaries[:args.limit]:
+        issues = ', '.join(
+            issue['issue'] + (f" ({issue['table']})" if issue['table'] else '')
+            for issue in summary['issues']
+        ) or 'none found'
+        print(
+            f"{summary['fingerprint']}  {summary['backend']}  {summary['captures']} captures, "
+            f"max {summary['max_seconds']:.2f}s, total {summary['total_seconds']:.2f}s"
+        )
+        print(f"  issues: {issues}")
+        print(f"  {' '.join(summary['query'].split())[:200]}")
+
+
+if __name__ == "__main__":
+    main()
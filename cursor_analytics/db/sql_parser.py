@@ -0,0 +1,423 @@
+"""
+SQL Parsing Module
+
+This module provides a small lexical scanner for SQL text. It understands
+line comments (-- and #), block comments, single/double/backtick quoted strings,
+PostgreSQL dollar-quoted bodies and the MySQL client DELIMITER directive, which is
+enough to split scripts into statements and to find a statement's leading keyword
+without being fooled by semicolons or keywords inside comments and literals.
+
+Two rules depend on the dialect, passed as a backend name: '#' only starts a comment
+on MySQL (it is the JSON path operator on PostgreSQL), and a backslash only escapes
+the next character of a literal on MySQL and Snowflake (and in PostgreSQL/DuckDB
+E'...' strings). Without a dialect both rules apply.
+
+preprocess() combines these into one memoized pass per query text: every backend
+classifies statements through it, so repeated queries skip the scanning and all
+backends agree on what is a read, a write or a multi-statement script.
+
+Classes:
+    StatementInfo: Result of preprocess()
+
+Functions:
+    preprocess: Normalize, classify and fingerprint a query (LRU-cached)
+    fingerprint: Hash of a query with literals and placeholders replaced
+    convert_placeholders: Rewrite a query's placeholders to positional qmark/numeric/format
+    split_statements: Split a SQL script into individual statements
+    strip_comments: Remove comments from a SQL statement
+    first_keyword: Return the leading keyword of a statement
+    returns_rows: Whether a statement produces a result set
+    is_compound: Whether a statement contains its own semicolons (e.g. a procedure body)
+"""
+
+import re
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+ROW_RETURNING_KEYWORDS = ('select', 'show', 'describe', 'desc', 'explain', 'with', 'values')
+
+# Statement kinds by leading keyword
+READ = 'read'
+WRITE = 'write'
+DDL = 'ddl'
+TRANSACTION = 'transaction'
+SESSION = 'session'
+OTHER = 'other'
+STATEMENT_KINDS = {
+    **{keyword: READ for keyword in ROW_RETURNING_KEYWORDS + ('table',)},
+    **{keyword: WRITE for keyword in (
+        'insert', 'update', 'delete', 'merge', 'replace', 'upsert', 'copy', 'load', 'put', 'call'
+    )},
+    **{keyword: DDL for keyword in (
+        'create', 'alter', 'drop', 'truncate', 'rename', 'comment', 'grant', 'revoke'
+    )},
+    **{keyword: TRANSACTION for keyword in (
+        'begin', 'start', 'commit', 'rollback', 'savepoint', 'release'
+    )},
+    **{keyword: SESSION for keyword in ('set', 'use', 'reset')}
+}
+
+# Statements a WITH clause can be attached to, and the data-modifying ones that
+# PostgreSQL also allows inside the CTE list
+CTE_STATEMENT_KEYWORDS = ('select', 'insert', 'update', 'delete', 'merge', 'values', 'table')
+DATA_MODIFYING_KEYWORDS = ('insert', 'update', 'delete', 'merge')
+
+PREPROCESS_CACHE_SIZE = 1024
+
+# Dialects where '#' starts a line comment and where a backslash escapes the next
+# character of a quoted literal
+HASH_COMMENT_DIALECTS = ('mysql',)
+BACKSLASH_ESCAPE_DIALECTS = ('mysql', 'snowflake')
+
+_DELIMITER_DIRECTIVE = re.compile(r'^[ \t]*delimiter[ \t]+(\S+)[ \t]*$', re.IGNORECASE)
+_DOLLAR_TAG = re.compile(r'\$[A-Za-z_0-9]*\$')
+_WORD = re.compile(r'[A-Za-z_]+')
+_IDENTIFIER = re.compile(r'[A-Za-z_][\w$]*')
+_WHITESPACE = re.compile(r'\s+')
+_NUMBER = re.compile(r'(?<![\w.])[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?(?![\w.])')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+# Placeholders, tried in this order at each position outside literals and comments
+_PLACEHOLDERS = (
+    ('pyformat', re.compile(r'%\((\w+)\)s')),
+    ('format', re.compile(r'%s')),
+    ('numeric', re.compile(r'\$(\d+)')),
+    ('named', re.compile(r'(?<!:):([A-Za-z_]\w*)')),
+    ('qmark', re.compile(r'\?'))
+)
+
+
+def _escapes_backslash(sql: str, i: int, dialect: Optional[str]) -> bool:
+    # Whether backslashes escape inside the literal starting at sql[i]
+    if sql[i] == '`':
+        return False
+    if dialect is None or dialect in BACKSLASH_ESCAPE_DIALECTS:
+        return True
+    # PostgreSQL/DuckDB escape strings: E'...'
+    return sql[i] == "'" and i > 0 and sql[i - 1] in 'eE' and (
+        i == 1 or not (sql[i - 2].isalnum() or sql[i - 2] == '_')
+    )
+
+
+def _skip_quoted(sql: str, i: int, dialect: Optional[str] = None) -> int:
+    # Returns the index just past the literal starting at sql[i]; doubled quote
+    # characters and, where the dialect allows them, backslash escapes do not
+    # terminate the literal
+    quote = sql[i]
+    backslash_escapes = _escapes_backslash(sql, i, dialect)
+    i += 1
+    while i < len(sql):
+        char = sql[i]
+        if char == '\\' and backslash_escapes:
+            i += 2
+            continue
+        if char == quote:
+            if i + 1 < len(sql) and sql[i + 1] == quote:
+                i += 2
+                continue
+            return i + 1
+        i += 1
+    return i
+
+
+def _scan_token(sql: str, i: int, dialect: Optional[str] = None) -> Tuple[str, int]:
+    # Classifies the token starting at sql[i] as 'comment', 'literal' or 'char' and
+    # returns it with the index just past it
+    char = sql[i]
+    if sql.startswith('--', i) or (
+        char == '#' and (dialect is None or dialect in HASH_COMMENT_DIALECTS)
+    ):
+        end = sql.find('\n', i)
+        return 'comment', len(sql) if end == -1 else end
+    if sql.startswith('/*', i):
+        end = sql.find('*/', i + 2)
+        return 'comment', len(sql) if end == -1 else end + 2
+    if char in ("'", '"', '`'):
+        return 'literal', _skip_quoted(sql, i, dialect)
+    if char == '$':
+        match = _DOLLAR_TAG.match(sql, i)
+        if match:
+            end = sql.find(match.group(0), match.end())
+            return 'literal', len(sql) if end == -1 else end + len(match.group(0))
+    return 'char', i + 1
+
+
+def strip_comments(sql: str, dialect: Optional[str] = None) -> str:
+    parts = []
+    i = 0
+    while i < len(sql):
+        kind, end = _scan_token(sql, i, dialect)
+        # Keep a separator so tokens on either side of a comment do not merge
+        parts.append(' ' if kind == 'comment' else sql[i:end])
+        i = end
+    return ''.join(parts).strip()
+
+
+def _split_lines_with_directives(script: str) -> List[Tuple[str, str]]:
+    # Splits the script into chunks that share one delimiter. DELIMITER lines are
+    # client directives (mysql CLI), not SQL, and are dropped from the output.
+    chunks: List[Tuple[str, str]] = []
+    delimiter = ';'
+    current: List[str] = []
+    for line in script.splitlines(keepends=True):
+        match = _DELIMITER_DIRECTIVE.match(line.rstrip('\r\n'))
+        if match:
+            chunks.append((delimiter, ''.join(current)))
+            current = []
+            delimiter = match.group(1)
+            continue
+        current.append(line)
+    chunks.append((delimiter, ''.join(current)))
+    return chunks
+
+
+def split_statements(script: str, dialect: Optional[str] = None) -> List[str]:
+    """
+    Split a SQL script into statements.
+
+    Semicolons inside comments, string literals, quoted identifiers and dollar-quoted
+    bodies are ignored, and MySQL DELIMITER directives are honoured. Statements that
+    contain only comments or whitespace are dropped.
+
+    Args:
+        script: SQL text containing one or more statements
+        dialect: Backend name deciding the '#' comment and backslash escape rules
+            (None applies both)
+
+    Returns:
+        List[str]: Statements without their trailing delimiter
+    """
+    statements = []
+    for delimiter, chunk in _split_lines_with_directives(script):
+        start = 0
+        i = 0
+        while i < len(chunk):
+            if chunk.startswith(delimiter, i):
+                statements.append(chunk[start:i])
+                i += len(delimiter)
+                start = i
+                continue
+            _, i = _scan_token(chunk, i, dialect)
+        statements.append(chunk[start:])
+
+    return [
+        statement.strip() for statement in statements if strip_comments(statement, dialect)
+    ]
+
+
+def first_keyword(statement: str, dialect: Optional[str] = None) -> str:
+    # Leading parentheses are allowed, e.g. "(SELECT ...) UNION (SELECT ...)"
+    match = _WORD.match(strip_comments(statement, dialect).lstrip('( \t\r\n'))
+    return match.group(0).lower() if match else ''
+
+
+def _with_statement(statement: str, dialect: Optional[str] = None) -> Tuple[str, bool]:
+    # For a statement starting with WITH, returns the keyword of the statement the
+    # CTE list is attached to (the first one outside its parentheses) and whether a
+    # CTE modifies data, e.g. "WITH d AS (DELETE ... RETURNING *) SELECT ..."
+    depth = 0
+    modifies = False
+    seen_with = False
+    i = 0
+    while i < len(statement):
+        kind, end = _scan_token(statement, i, dialect)
+        if kind == 'char':
+            match = _IDENTIFIER.match(statement, i)
+            if statement[i] == '(':
+                depth += 1
+            elif statement[i] == ')':
+                depth -= 1
+            elif match:
+                word = match.group(0).lower()
+                end = match.end()
+                if depth > 0:
+                    modifies = modifies or word in DATA_MODIFYING_KEYWORDS
+                elif seen_with and word in CTE_STATEMENT_KEYWORDS:
+                    return word, modifies
+                seen_with = seen_with or word == 'with'
+        i = end
+    return 'with', modifies
+
+
+def returns_rows(statement: str, dialect: Optional[str] = None) -> bool:
+    return preprocess(statement, dialect).returns_rows
+
+
+def is_compound(statement: str, dialect: Optional[str] = None) -> bool:
+    i = 0
+    while i < len(statement):
+        kind, end = _scan_token(statement, i, dialect)
+        if kind == 'char' and statement[i] == ';':
+            return True
+        i = end
+    return False
+
+
+class StatementInfo(NamedTuple):
+    normalized: str
+    keyword: str
+    kind: str
+    returns_rows: bool
+    statement_count: int
+    is_compound: bool
+    param_style: Optional[str]
+    fingerprint: str
+
+    @property
+    def is_multi(self) -> bool:
+        return self.statement_count > 1
+
+
+def _match_placeholder(sql: str, i: int) -> Optional[Tuple[str, 're.Match[str]']]:
+    for style, pattern in _PLACEHOLDERS:
+        match = pattern.match(sql, i)
+        if match and (style != 'named' or i == 0 or sql[i - 1] != ':'):
+            return style, match
+    return None
+
+
+def _fingerprint_text(sql: str, dialect: Optional[str] = None) -> str:
+    parts = []
+    i = 0
+    while i < len(sql):
+        kind, end = _scan_token(sql, i, dialect)
+        if kind == 'comment':
+            parts.append(' ')
+        elif kind == 'literal' and sql[i] in ("'", '$'):
+            parts.append('?')
+        elif kind == 'char' and _match_placeholder(sql, i):
+            _, match = _match_placeholder(sql, i)
+            parts.append('?')
+            end = match.end()
+        else:
+            parts.append(sql[i:end])
+        i = end
+    text = _NUMBER.sub('?', ''.join(parts))
+    text = _WHITESPACE.sub(' ', text).strip().rstrip(';').strip().lower()
+    # IN lists of any length share a fingerprint
+    return _PLACEHOLDER_LIST.sub('(?+)', text)
+
+
+def fingerprint(query: str, dialect: Optional[str] = None) -> str:
+    return preprocess(query, dialect).fingerprint
+
+
+def _param_style(sql: str, dialect: Optional[str] = None) -> Optional[str]:
+    i = 0
+    while i < len(sql):
+        kind, end = _scan_token(sql, i, dialect)
+        if kind == 'char':
+            if sql.startswith('%%', i):
+                i += 2
+                continue
+            found = _match_placeholder(sql, i)
+            if found:
+                return found[0]
+        i = end
+    return None
+
+
+@lru_cache(maxsize=PREPROCESS_CACHE_SIZE)
+def preprocess(query: str, dialect: Optional[str] = None) -> StatementInfo:
+    """
+    Normalize and classify a query. Results are cached by query text and dialect.
+
+    Args:
+        query: SQL text with one or more statements
+        dialect: Backend name deciding the '#' comment and backslash escape rules
+            (None applies both)
+
+    Returns:
+        StatementInfo: Normalized text (comments removed, whitespace collapsed), the
+        leading keyword and kind of the first statement (a WITH statement has the kind
+        of its main statement), whether it returns rows, the number of statements, the
+        placeholder style and a literal-free fingerprint
+    """
+    statements = split_statements(query, dialect)
+    first = statements[0] if statements else ''
+    keyword = first_keyword(first, dialect)
+    # A WITH statement is classified by its main statement; CTEs that modify data
+    # make it a write even when it returns rows
+    main_keyword, modifies = keyword, False
+    if keyword == 'with':
+        main_keyword, modifies = _with_statement(first, dialect)
+    normalized = _WHITESPACE.sub(' ', strip_comments(query, dialect)).strip().rstrip(';').strip()
+    digest = hashlib.sha1(_fingerprint_text(query, dialect).encode()).hexdigest()[:16]
+    return StatementInfo(
+        normalized=normalized,
+        keyword=keyword,
+        kind=WRITE if modifies else STATEMENT_KINDS.get(main_keyword, OTHER),
+        returns_rows=main_keyword in ROW_RETURNING_KEYWORDS,
+        statement_count=len(statements),
+        is_compound=len(statements) == 1 and is_compound(first, dialect),
+        param_style=_param_style(query, dialect),
+        fingerprint=digest
+    )
+
+
+def convert_placeholders(
+    query: str,
+    params: Optional[Union[Sequence[Any], Dict[str, Any]]],
+    style: str = 'qmark',
+    dialect: Optional[str] = None
+) -> Tuple[str, List[Any]]:
+    """
+    Rewrite placeholders to positional form and order the parameters to match.
+
+    Any input style (%s, %(name)s, ?, :name, $1) is accepted. %% escapes of the
+    pyformat styles are unescaped for qmark/numeric output.
+
+    Args:
+        query: SQL with placeholders
+        params: Positional sequence or mapping of named parameters
+        style: 'qmark' (?), 'numeric' ($1, $2) or 'format' (%s)
+        dialect: Backend name deciding the '#' comment and backslash escape rules
+
+    Returns:
+        Tuple[str, List[Any]]: Rewritten SQL and the parameter values in order
+    """
+    source = preprocess(query, dialect).param_style
+    percent_escapes = source in ('pyformat', 'format')
+    positional = list(params) if params is not None and not isinstance(params, dict) else None
+    values: List[Any] = []
+
+    def placeholder() -> str:
+        if style == 'qmark':
+            return '?'
+        if style == 'numeric':
+            return f'${len(values)}'
+        return '%s'
+
+    parts = []
+    i = 0
+    next_position = 0
+    while i < len(query):
+        kind, end = _scan_token(query, i, dialect)
+        if kind == 'literal' and percent_escapes and style != 'format':
+            parts.append(query[i:end].replace('%%', '%'))
+        elif kind == 'char' and percent_escapes and query.startswith('%%', i):
+            end = i + 2
+            parts.append('%%' if style == 'format' else '%')
+        elif kind == 'char' and _match_placeholder(query, i):
+            found_style, match = _match_placeholder(query, i)
+            end = match.end()
+            if found_style in ('pyformat', 'named'):
+                if not isinstance(params, dict):
+                    raise ValueError(
+                        f"Named placeholder {match.group(0)} needs a mapping of params"
+                    )
+                values.append(params[match.group(1)])
+            elif positional is None:
+                raise ValueError(
+                    f"Positional placeholder {match.group(0)} needs a sequence of params"
+                )
+            elif found_style == 'numeric':
+                values.append(positional[int(match.group(1)) - 1])
+            else:
+                values.append(positional[next_position])
+                next_position += 1
+            parts.append(placeholder())
+        else:
+            parts.append(query[i:end])
+        i = end
+    return ''.join(parts), values
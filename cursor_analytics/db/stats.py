@@ -0,0 +1,344 @@
+"""
+Query Statistics Module
+
+This module keeps client-side, pg_stat_statements-style statistics of the queries
+passing through DatabaseConnection.execute_query. Executions are aggregated by the
+normalized query fingerprint (see sql_parser.fingerprint), so the same query with
+different literals or parameters shares one entry holding its call count, errors,
+rows and latency distribution. Latency percentiles come from a streaming quantile
+sketch with bounded relative error, so no individual timings are kept.
+
+The registry holds at most QUERY_STATS_MAX fingerprints (0 disables it); when it is
+full the least called ones are evicted. When QUERY_STATS_FILE is set, each process
+merges its statistics into that file at exit, so short-lived CLI runs add up to one
+view.
+
+Classes:
+    QuantileSketch: Mergeable streaming quantile sketch (relative-error buckets)
+    QueryStats: Aggregated statistics of one fingerprint
+    StatsRegistry: Bounded registry of QueryStats
+
+Functions:
+    get_stats_registry: Process-wide registry used by DatabaseConnection
+    load_stats: Registry stored in a statistics file
+"""
+
+import os
+import json
+import math
+import time
+import atexit
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from cursor_analytics.db.sql_parser import preprocess
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 1024
+# Fraction of entries evicted at once when the registry is full
+EVICTION_FRACTION = 0.05
+QUERY_TEXT_LIMIT = 500
+
+
+class QuantileSketch:
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS
+    ):
+        # A value v is counted in bucket ceil(log_gamma(v)); every value in a bucket
+        # is within relative_accuracy of the bucket's representative value
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 1e-9:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        # Merges the lowest buckets, so only the accuracy of the fastest values suffers
+        keys = sorted(self.buckets)
+        while len(keys) > self.max_buckets:
+            lowest = keys.pop(0)
+            self.buckets[keys[0]] += self.buckets.pop(lowest)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'zero_count': self.zero_count,
+            'buckets': {str(key): count for key, count in self.buckets.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuantileSketch':
+        sketch = cls(data.get('relative_accuracy', DEFAULT_RELATIVE_ACCURACY))
+        sketch.buckets = {int(key): count for key, count in data.get('buckets', {}).items()}
+        sketch.zero_count = data.get('zero_count', 0)
+        sketch.count = sketch.zero_count + sum(sketch.buckets.values())
+        return sketch
+
+
+class QueryStats:
+    def __init__(self, fingerprint: str, query: str):
+        self.fingerprint = fingerprint
+        self.query = query[:QUERY_TEXT_LIMIT]
+        self.backends: List[str] = []
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.latency = QuantileSketch()
+        self.last_seen = 0.0
+
+    def record(
+        self,
+        backend: str,
+        seconds: float,
+        rows: Optional[int] = None,
+        error: bool = False
+    ) -> None:
+        if backend not in self.backends:
+            self.backends.append(backend)
+        self.calls += 1
+        self.errors += error
+        self.rows += rows or 0
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.latency.add(seconds)
+        self.last_seen = time.time()
+
+    def merge(self, other: 'QueryStats') -> None:
+        self.backends += [backend for backend in other.backends if backend not in self.backends]
+        self.calls += other.calls
+        self.errors += other.errors
+        self.rows += other.rows
+        self.total_seconds += other.total_seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+        self.latency.merge(other.latency)
+        self.last_seen = max(self.last_seen, other.last_seen)
+
+    def summary(self) -> Dict[str, Any]:
+        def milliseconds(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None else round(seconds * 1000, 3)
+
+        return {
+            'fingerprint': self.fingerprint,
+            'backends': ','.join(self.backends),
+            'calls': self.calls,
+            'errors': self.errors,
+            'rows': self.rows,
+            'total_ms': milliseconds(self.total_seconds),
+            'mean_ms': milliseconds(self.total_seconds / self.calls if self.calls else None),
+            'p50_ms': milliseconds(self.latency.quantile(0.5)),
+            'p95_ms': milliseconds(self.latency.quantile(0.95)),
+            'p99_ms': milliseconds(self.latency.quantile(0.99)),
+            'max_ms': milliseconds(self.max_seconds),
+            'query': self.query
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'fingerprint': self.fingerprint,
+            'query': self.query,
+            'backends': self.backends,
+            'calls': self.calls,
+            'errors': self.errors,
+            'rows': self.rows,
+            'total_seconds': self.total_seconds,
+            'max_seconds': self.max_seconds,
+            'latency': self.latency.to_dict(),
+            'last_seen': self.last_seen
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QueryStats':
+        stats = cls(data['fingerprint'], data.get('query', ''))
+        stats.backends = list(data.get('backends', []))
+        stats.calls = data.get('calls', 0)
+        stats.errors = data.get('errors', 0)
+        stats.rows = data.get('rows', 0)
+        stats.total_seconds = data.get('total_seconds', 0.0)
+        stats.max_seconds = data.get('max_seconds', 0.0)
+        stats.latency = QuantileSketch.from_dict(data.get('latency', {}))
+        stats.last_seen = data.get('last_seen', 0.0)
+        return stats
+
+
+class StatsRegistry:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: Dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(
+        self,
+        backend: str,
+        query: str,
+        seconds: float,
+        rows: Optional[int] = None,
+        error: bool = False
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        info = preprocess(query, backend)
+        with self._lock:
+            stats = self._entries.get(info.fingerprint)
+            if stats is None:
+                if len(self._entries) >= self.max_entries:
+                    self._evict()
+                stats = self._entries[info.fingerprint] = QueryStats(
+                    info.fingerprint, info.normalized
+                )
+            stats.record(backend, seconds, rows, error)
+
+    def _evict(self) -> None:
+        # Drops the least called fingerprints (least recently seen first among equals)
+        count = max(1, int(self.max_entries * EVICTION_FRACTION))
+        rare = sorted(self._entries.values(), key=lambda stats: (stats.calls, stats.last_seen))
+        for stats in rare[:count]:
+            del self._entries[stats.fingerprint]
+        self.evictions += count
+
+    def merge(self, other: 'StatsRegistry') -> None:
+        with self._lock:
+            for fingerprint, stats in other._entries.items():
+                if fingerprint in self._entries:
+                    self._entries[fingerprint].merge(stats)
+                else:
+                    if len(self._entries) >= self.max_entries:
+                        self._evict()
+                    self._entries[fingerprint] = QueryStats.from_dict(stats.to_dict())
+
+    def top(self, limit: Optional[int] = 20, sort_by: str = 'total_ms') -> List[Dict[str, Any]]:
+        """
+        Summaries of the most expensive fingerprints.
+
+        Args:
+            limit: Number of entries to return (None for all)
+            sort_by: Summary field to sort by, descending (e.g. 'total_ms', 'p99_ms', 'calls')
+
+        Returns:
+            List[Dict[str, Any]]: One summary per fingerprint
+        """
+        with self._lock:
+            summaries = [stats.summary() for stats in self._entries.values()]
+        summaries.sort(key=lambda summary: summary[sort_by] or 0, reverse=True)
+        return summaries[:limit] if limit else summaries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'entries': [stats.to_dict() for stats in self._entries.values()]}
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> 'StatsRegistry':
+        registry = cls(max_entries)
+        for entry in data.get('entries', []):
+            stats = QueryStats.from_dict(entry)
+            registry._entries[stats.fingerprint] = stats
+        return registry
+
+    def save(self, path: str) -> None:
+        # Merges into the existing file under an exclusive lock so concurrent
+        # processes do not lose each other's statistics
+        lock_file = open(path + '.lock', 'w')
+        try:
+            try:
+                import fcntl
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except ImportError:
+                pass  # no advisory locks on this platform
+            merged = load_stats(path, self.max_entries)
+            merged.merge(self)
+            with open(path + '.tmp', 'w') as f:
+                json.dump(merged.to_dict(), f)
+            os.replace(path + '.tmp', path)
+        finally:
+            lock_file.close()
+
+
+def load_stats(path: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> StatsRegistry:
+    try:
+        with open(path, 'r') as f:
+            return StatsRegistry.from_dict(json.load(f), max_entries)
+    except FileNotFoundError:
+        return StatsRegistry(max_entries)
+    except ValueError as e:
+        logger.warning(f"Ignoring unreadable query statistics file {path}: {e}")
+        return StatsRegistry(max_entries)
+
+
+_registry: Optional[StatsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_stats_registry() -> StatsRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = StatsRegistry(
+                    int(os.getenv('QUERY_STATS_MAX', str(DEFAULT_MAX_ENTRIES)))
+                )
+    return _registry
+
+
+@atexit.register
+def _save_on_exit() -> None:
+    path = os.getenv('QUERY_STATS_FILE')
+    if not path or _registry is None or not len(_registry):
+        return
+    try:
+        _registry.save(path)
+    except OSError as e:
+        logger.warning(f"Failed to save query statistics to {path}: {e}")
@@ -0,0 +1,198 @@
+"""
+Parameter Sweep Module
+
+This module runs one query over many parameter sets (one per market, client, date,
+...) without a connection and round trip per set. Row-returning queries are
+collapsed into a single UNION ALL of tagged copies of the query, each with its own
+renamed parameters, so the whole sweep is one statement; anything else is pipelined
+over a single (pooled) connection, where repeated executions reuse the prepared
+statement cache. Results come back as one frame with a tag column identifying the
+parameter set of every row.
+
+Functions:
+    execute_many_params: Run a query once per parameter set and combine the results
+"""
+
+import re
+import time
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import pandas as pd
+
+from cursor_analytics.db.connection import DatabaseConnection
+from cursor_analytics.db.pool import ConnectionPool
+from cursor_analytics.db.sql_parser import preprocess, returns_rows
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAG_COLUMN = 'param_set'
+# Parameter sets collapsed into one UNION ALL statement
+DEFAULT_MAX_UNION = 100
+SWEEP_STRATEGIES = ('auto', 'union', 'pipeline')
+
+_NAMED_PLACEHOLDER = re.compile(r'%\((\w+)\)s')
+
+ParamSet = Union[tuple, list, dict]
+
+
+def _union_query(
+    query: str,
+    param_sets: Sequence[ParamSet],
+    offset: int,
+    tag_column: str,
+    max_rows: int
+) -> Tuple[str, Union[tuple, dict]]:
+    # Each copy of the query gets a literal tag and, for named parameters, its own
+    # suffixed parameter names so the sets cannot collide. Every branch is limited on
+    # its own, as in the pipeline, so one large set cannot use up the others' rows
+    body = query.strip().rstrip(';')
+    named = isinstance(param_sets[0], dict)
+    branches = []
+    merged_named: Dict[str, Any] = {}
+    merged_positional: List[Any] = []
+    for i, params in enumerate(param_sets):
+        index = offset + i
+        branch = body
+        if named:
+            branch = _NAMED_PLACEHOLDER.sub(rf'%(\1__{index})s', body)
+            merged_named.update({f"{name}__{index}": value for name, value in params.items()})
+        else:
+            merged_positional.extend(params)
+        branches.append(
+            f"SELECT * FROM (SELECT {index} AS {tag_column}, sweep_q.* FROM ({branch}) sweep_q "
+            f"LIMIT {int(max_rows)}) sweep_{index}"
+        )
+    merged = merged_named if named else tuple(merged_positional)
+    return "\nUNION ALL\n".join(branches), merged
+
+
+def _run_union(
+    connection: DatabaseConnection,
+    query: str,
+    param_sets: Sequence[ParamSet],
+    tag_column: str,
+    max_union: int,
+    timeout: int,
+    max_rows: int
+) -> Optional[List[pd.DataFrame]]:
+    frames = []
+    for offset in range(0, len(param_sets), max_union):
+        chunk = param_sets[offset:offset + max_union]
+        union_query, params = _union_query(query, chunk, offset, tag_column, max_rows)
+        df = connection.execute_query(
+            union_query, params, timeout=timeout, max_rows=max_rows * len(chunk)
+        )
+        if df is None:
+            return None
+        frames.append(df)
+    return frames
+
+
+def _run_pipeline(
+    connection: DatabaseConnection,
+    query: str,
+    param_sets: Sequence[ParamSet],
+    tag_column: str,
+    timeout: int,
+    max_rows: int
+) -> List[pd.DataFrame]:
+    frames = []
+    for index, params in enumerate(param_sets):
+        df = connection.execute_query(query, params, timeout=timeout, max_rows=max_rows)
+        if df is None:
+            if returns_rows(query, connection.backend):
+                logger.warning(f"Parameter set {index} failed: {params}")
+            continue
+        df.insert(0, tag_column, index)
+        frames.append(df)
+    return frames
+
+
+def execute_many_params(
+    connection: DatabaseConnection,
+    query: str,
+    param_sets: Sequence[ParamSet],
+    strategy: str = 'auto',
+    tag_column: str = DEFAULT_TAG_COLUMN,
+    max_union: int = DEFAULT_MAX_UNION,
+    timeout: int = 3000,
+    max_rows: int = 1000,
+    pool: Optional[ConnectionPool] = None
+) -> pd.DataFrame:
+    """
+    Run one parameterized query over many parameter sets and combine the results.
+
+    Args:
+        connection: Connection to run the sweep on
+        query: Single statement using the connection's placeholders
+        param_sets: One tuple (positional) or dict (named) of parameters per run
+        strategy: 'union' to collapse the sweep into UNION ALL statements, 'pipeline'
+            to execute each set in turn on one connection, or 'auto' to use 'union' for
+            row-returning queries and fall back to 'pipeline' if it fails
+        tag_column: Column identifying the parameter set (its index) of each row
+        max_union: Parameter sets per UNION ALL statement
+        timeout: Query timeout in milliseconds
+        max_rows: Maximum rows per parameter set
+        pool: Optional pool; the pipeline runs on one connection taken from it
+
+    Returns:
+        pd.DataFrame: Combined rows with tag_column, plus one column per named
+        parameter holding that set's value (unless it clashes with a result column)
+    """
+    if strategy not in SWEEP_STRATEGIES:
+        raise ValueError(
+            f"Unsupported sweep strategy: {strategy}. Use one of {SWEEP_STRATEGIES}"
+        )
+    if preprocess(query, connection.backend).statement_count != 1:
+        raise ValueError("execute_many_params runs a single statement")
+    if not param_sets:
+        return pd.DataFrame(columns=[tag_column])
+    if len({type(params) is dict for params in param_sets}) > 1:
+        raise ValueError("Parameter sets must be all tuples or all dicts")
+
+    start_time = time.time()
+    param_sets = list(param_sets)
+    frames = None
+    used = strategy
+    # Named parameters can only be renamed per branch in pyformat (%(name)s) style
+    named = isinstance(param_sets[0], dict)
+    can_union = returns_rows(query, connection.backend) and (
+        not named or _NAMED_PLACEHOLDER.search(query)
+    )
+    if strategy in ('auto', 'union') and can_union:
+        used = 'union'
+        frames = _run_union(
+            connection, query, param_sets, tag_column, max_union, timeout, max_rows
+        )
+        if frames is None:
+            if strategy == 'union':
+                raise RuntimeError("Parameter sweep failed as a UNION ALL query")
+            logger.warning("UNION ALL sweep failed, executing parameter sets one by one")
+
+    if frames is None:
+        used = 'pipeline'
+        if pool is not None:
+            with pool.connection() as pooled_connection:
+                frames = _run_pipeline(pooled_connection, query, param_sets, tag_column,
+                                       timeout, max_rows)
+        else:
+            frames = _run_pipeline(connection, query, param_sets, tag_column, timeout, max_rows)
+
+    frames = [frame for frame in frames if not frame.empty]
+    if frames:
+        result = pd.concat(frames, ignore_index=True)
+    else:
+        result = pd.DataFrame(columns=[tag_column])
+
+    if named:
+        param_table = pd.DataFrame(param_sets)
+        param_table = param_table[[c for c in param_table.columns if c not in result.columns]]
+        if not param_table.empty and not result.empty:
+            param_table.index.name = tag_column
+            result = result.join(param_table, on=tag_column)
+
+    logger.info(
+        f"Ran {len(param_sets)} parameter sets with the {used} strategy "
+        f"({len(result)} rows) in {time.time() - start_time:.2f} seconds"
+    )
+    return result
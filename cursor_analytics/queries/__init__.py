@@ -2,24 +2,25 @@ import os
 from pathlib import Path
 from typing import Optional, Dict, List
 
+from cursor_analytics.queries.catalog import QueryCatalog, CompiledQuery
+
+_catalog: Optional[QueryCatalog] = None
+
+def get_catalog() -> QueryCatalog:
+    # The queries directory is indexed once, on first use
+    global _catalog
+    if _catalog is None:
+        _catalog = QueryCatalog(Path(__file__).parent)
+    return _catalog
+
 def get_query_path(query_name: str) -> Optional[Path]:
-    queries_dir = Path(__file__).parent
-    
-    # Normalize the query name
-    if not query_name.endswith('.sql'):
-        query_name = f"{query_name}.sql"
-    
-    query_path = queries_dir / query_name
-    return query_path if query_path.exists() else None
+    return get_catalog().path(query_name)
+
+def get_query(query_name: str) -> Optional[CompiledQuery]:
+    return get_catalog().get(query_name)
 
 def load_query(query_name: str) -> Optional[str]:
-    query_path = get_query_path(query_name)
-    if not query_path:
-        return None
-        
-    with open(query_path, 'r') as f:
-        return f.read().strip()
+    return get_catalog().load(query_name)
         
 def list_available_queries() -> List[str]:
-    queries_dir = Path(__file__).parent
-    return [f.name for f in queries_dir.glob('*.sql')] 
\ No newline at end of file
+    return [f"{name}.sql" for name in get_catalog().names()]
@@ -0,0 +1,270 @@
+"""
+Query Catalog Module
+
+This module indexes the .sql files of a queries directory (including nested
+directories) and compiles them once. A query may start with a header block of
+"-- @" comment lines declaring its parameters and metadata:
+
+    -- @param market str us
+    -- @param since date 2024-01-01
+    -- @param limit int 100
+    -- @backend mysql
+    -- @ttl 3600
+    -- @depends reports/daily_sales, markets
+    SELECT * FROM sales WHERE market = {{ market }} AND day >= {{ since }} LIMIT {{ limit }}
+
+Template references ({{ name }}) compile to driver placeholders, so values are always
+bound by the driver, never pasted into the SQL; in parameterized queries, literal %
+signs are escaped as %% for the driver's pyformat interpolation. Compiled queries are cached and a
+file is only re-read when its modification time changes.
+
+Classes:
+    QueryParam: A declared template parameter
+    CompiledQuery: A parsed query with its parameters and metadata
+    QueryCatalog: Index of a queries directory with mtime-based reloading
+"""
+
+import re
+import datetime
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_HEADER_LINE = re.compile(r'^\s*--\s*@(\w+)\s*(.*?)\s*$')
+_TEMPLATE_REF = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+
+def _to_bool(value: Any) -> bool:
+    return value if isinstance(value, bool) else str(value).lower() in ('1', 'true', 'yes')
+
+
+def _to_date(value: Any) -> datetime.date:
+    return value if isinstance(value, datetime.date) else datetime.date.fromisoformat(str(value))
+
+
+def _to_datetime(value: Any) -> datetime.datetime:
+    if isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.fromisoformat(str(value))
+
+
+PARAM_TYPES: Dict[str, Callable[[Any], Any]] = {
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': _to_bool,
+    'date': _to_date,
+    'datetime': _to_datetime
+}
+
+
+class QueryParam:
+    def __init__(self, name: str, type_name: str = 'str', default: Optional[str] = None):
+        if type_name not in PARAM_TYPES:
+            raise ValueError(f"Unsupported parameter type {type_name} for {name}")
+        self.name = name
+        self.type_name = type_name
+        self.required = default is None
+        self.default = None if default is None else self.coerce(default)
+
+    def coerce(self, value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            return PARAM_TYPES[self.type_name](value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(
+                f"Invalid value for parameter {self.name} ({self.type_name}): {value}"
+            ) from e
+
+    def __repr__(self) -> str:
+        return f"QueryParam({self.name!r}, {self.type_name!r}, default={self.default!r})"
+
+
+class CompiledQuery:
+    def __init__(self, name: str, path: Path, source: str, mtime: float):
+        self.name = name
+        self.path = path
+        self.source = source
+        self.mtime = mtime
+        self.params: Dict[str, QueryParam] = {}
+        # Header metadata other than parameters, e.g. ttl, backend, depends, description
+        self.meta: Dict[str, Any] = {}
+        self.sql = self._compile(source)
+
+    def _compile(self, source: str) -> str:
+        body_start = 0
+        lines = source.splitlines(keepends=True)
+        for line in lines:
+            match = _HEADER_LINE.match(line)
+            if not match:
+                # Plain comments may surround the declarations; SQL ends the header
+                if line.strip() and not line.lstrip().startswith('--'):
+                    break
+                body_start += len(line)
+                continue
+            body_start += len(line)
+            key, value = match.group(1).lower(), match.group(2)
+            if key == 'param':
+                parts = value.split(None, 2)
+                if not parts:
+                    raise ValueError(f"Empty @param declaration in {self.path}")
+                param = QueryParam(parts[0], *parts[1:])
+                self.params[param.name] = param
+            elif key == 'depends':
+                self.meta['depends'] = [item.strip() for item in value.split(',') if item.strip()]
+            elif key == 'ttl':
+                self.meta['ttl'] = int(value)
+            else:
+                self.meta[key] = value
+
+        body = source[body_start:].strip()
+        for reference in _TEMPLATE_REF.findall(body):
+            if reference not in self.params:
+                self.params[reference] = QueryParam(reference)
+        if not self.params:
+            return body
+        # Each reference becomes a named driver placeholder. pyformat drivers interpolate
+        # the whole text, so a literal % (LIKE 'a%', modulo) must be written as %%
+        parts = _TEMPLATE_REF.split(body)
+        return ''.join(
+            f"%({part})s" if i % 2 else part.replace('%', '%%') for i, part in enumerate(parts)
+        )
+
+    @property
+    def ttl(self) -> Optional[int]:
+        return self.meta.get('ttl')
+
+    @property
+    def backend(self) -> Optional[str]:
+        return self.meta.get('backend')
+
+    @property
+    def depends(self) -> List[str]:
+        return self.meta.get('depends', [])
+
+    def bind(
+        self,
+        values: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Bind parameter values, applying declared types and defaults.
+
+        Args:
+            values: Parameter values; strings (e.g. from the command line) are coerced
+
+        Returns:
+            Tuple[str, Optional[Dict[str, Any]]]: SQL with %(name)s placeholders and the
+            parameters to pass to execute_query (None for queries without parameters)
+        """
+        values = values or {}
+        unknown = set(values) - set(self.params)
+        if unknown:
+            raise ValueError(f"Unknown parameters for {self.name}: {', '.join(sorted(unknown))}")
+        if not self.params:
+            return self.sql, None
+
+        bound = {}
+        for name, param in self.params.items():
+            if name in values:
+                bound[name] = param.coerce(values[name])
+            elif not param.required:
+                bound[name] = param.default
+            else:
+                raise ValueError(f"Missing required parameter {name} for query {self.name}")
+        return self.sql, bound
+
+
+class QueryCatalog:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._entries: Dict[str, CompiledQuery] = {}
+        self._paths: Dict[str, Path] = {}
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> None:
+        # Rescans the directory tree; compiled entries stay cached until their mtime changes
+        paths = {
+            path.relative_to(self.root).with_suffix('').as_posix(): path
+            for path in sorted(self.root.rglob('*.sql'))
+        }
+        with self._lock:
+            self._paths = paths
+            self._entries = {name: entry for name, entry in self._entries.items() if name in paths}
+
+    def _resolve(self, name: str) -> Optional[str]:
+        name = name[:-4] if name.endswith('.sql') else name
+        if name in self._paths:
+            return name
+        # A bare file name also finds a query in a subdirectory when it is unique
+        matches = [key for key in self._paths if key.rsplit('/', 1)[-1] == name]
+        return matches[0] if len(matches) == 1 else None
+
+    def path(self, name: str) -> Optional[Path]:
+        key = self._resolve(name)
+        if key is None:
+            # The file may have been added since the last scan
+            self.refresh()
+            key = self._resolve(name)
+        return self._paths.get(key) if key else None
+
+    def get(self, name: str) -> Optional[CompiledQuery]:
+        path = self.path(name)
+        if path is None:
+            return None
+        key = self._resolve(name)
+
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            self.refresh()
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.mtime == mtime:
+                return entry
+
+        logger.debug(f"Compiling query {key} from {path}")
+        entry = CompiledQuery(key, path, path.read_text(), mtime)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def load(self, name: str) -> Optional[str]:
+        """
+        Load the compiled SQL of a query that takes no parameters.
+
+        Header comments are dropped. Parameter values are never pasted into the SQL,
+        so parameterized queries must be bound with get(name).bind() instead.
+
+        Args:
+            name: Query name, relative to the catalog root, with or without .sql
+
+        Returns:
+            Optional[str]: The SQL, or None if no such query exists
+
+        Raises:
+            ValueError: If the query declares parameters
+        """
+        entry = self.get(name)
+        if entry is None:
+            return None
+        if entry.params:
+            raise ValueError(
+                f"Query {entry.name} takes parameters ({', '.join(entry.params)}); "
+                f"bind them with get_query('{entry.name}').bind()"
+            )
+        return entry.sql
+
+    def names(self) -> List[str]:
+        # Rescanned on every call so a long-lived process (the daemon) lists new files
+        self.refresh()
+        return list(self._paths)
+
+    def entries(self) -> List[CompiledQuery]:
+        return [entry for entry in (self.get(name) for name in self.names()) if entry]
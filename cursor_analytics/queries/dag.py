@@ -0,0 +1,385 @@
+"""
+Query DAG Module
+
+This module runs a directory of dependent queries as a DAG. Dependencies and target
+backends come from the query headers (-- @depends, -- @backend, see catalog.py) or
+from a JSON manifest that overrides them. Ready queries run concurrently within a
+per-backend concurrency limit on pooled connections, failed reads are retried with
+backoff (other statements only when the node sets retry, e.g. -- @retry true), and
+each result is written to the output directory as soon as its node finishes. With
+skip_unchanged, nodes that declare a TTL are skipped while it lasts if their SQL,
+parameters and upstream results are unchanged since the last run; nodes without a
+TTL always run, since their source tables may have changed.
+
+Classes:
+    QueryNode: One query of the DAG
+    DAGRunner: Executes a DAG of QueryNodes
+
+Functions:
+    build_dag: Build the nodes of a DAG from a catalog and an optional manifest
+    topological_order: Order nodes so that dependencies come first
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import datetime
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Set
+import pandas as pd
+
+from cursor_analytics.config.settings import DEFAULT_MAX_ROWS
+from cursor_analytics.db.connection import (
+    DatabaseConnection,
+    MySQLConnection,
+    PostgreSQLConnection,
+    SnowflakeConnection,
+    DuckDBConnection
+)
+from cursor_analytics.db.pool import ConnectionPool
+from cursor_analytics.db.admission import query_priority, query_client
+from cursor_analytics.db.sql_parser import (
+    preprocess, convert_placeholders, split_statements, READ
+)
+from cursor_analytics.queries.catalog import QueryCatalog, CompiledQuery
+
+logger = logging.getLogger(__name__)
+
+BACKEND_CLASSES: Dict[str, Callable[[], DatabaseConnection]] = {
+    'mysql': MySQLConnection,
+    'postgres': PostgreSQLConnection,
+    'snowflake': SnowflakeConnection,
+    'duckdb': DuckDBConnection
+}
+DEFAULT_CONCURRENCY = 2
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_DELAY = 5.0  # seconds, doubled on every retry
+STATE_FILE = '_dag_state.json'
+
+SUCCESS = 'success'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+UPSTREAM_FAILED = 'upstream_failed'
+
+
+class QueryNode:
+    def __init__(
+        self,
+        name: str,
+        query: CompiledQuery,
+        backend: str,
+        depends: Optional[List[str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        retry: Optional[bool] = None
+    ):
+        self.name = name
+        self.query = query
+        self.backend = backend
+        self.depends = list(depends or [])
+        self.params = dict(params or {})
+        # Whether failures are retried; None retries reads only, since a write may
+        # have been applied before its failure was reported
+        self.retry = retry
+
+    def __repr__(self) -> str:
+        return f"QueryNode({self.name!r}, backend={self.backend!r}, depends={self.depends!r})"
+
+
+def _load_manifest(manifest: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    # {"queries": {"name": {"depends": [...], "backend": "...", "params": {...},
+    #                       "retry": true}}}
+    if not manifest:
+        return {}
+    with open(manifest, 'r') as f:
+        return json.load(f).get('queries', {})
+
+
+def build_dag(
+    catalog: QueryCatalog,
+    names: Optional[List[str]] = None,
+    manifest: Optional[str] = None,
+    default_backend: str = 'mysql'
+) -> Dict[str, QueryNode]:
+    """
+    Build DAG nodes from catalog queries.
+
+    Args:
+        catalog: Catalog of the queries directory
+        names: Queries to run, together with everything they depend on (all if None)
+        manifest: Optional JSON manifest overriding depends/backend/params/retry per query
+        default_backend: Backend of queries that do not declare one
+
+    Returns:
+        Dict[str, QueryNode]: Nodes by catalog name
+    """
+    overrides = _load_manifest(manifest)
+    pending = list(names) if names else catalog.names() + list(overrides)
+    nodes: Dict[str, QueryNode] = {}
+    while pending:
+        name = pending.pop()
+        query = catalog.get(name)
+        if query is None:
+            raise ValueError(f"Query not found in {catalog.root}: {name}")
+        if query.name in nodes:
+            continue
+        override = overrides.get(query.name, overrides.get(name, {}))
+        retry = override.get('retry', query.meta.get('retry'))
+        node = QueryNode(
+            query.name,
+            query,
+            override.get('backend') or query.backend or default_backend,
+            override.get('depends', query.depends),
+            override.get('params'),
+            None if retry is None else str(retry).lower() in ('1', 'true', 'yes')
+        )
+        # Dependencies may be given by bare file name; store the catalog names
+        resolved = []
+        for dependency in node.depends:
+            dependency_query = catalog.get(dependency)
+            if dependency_query is None:
+                raise ValueError(f"{node.name} depends on unknown query {dependency}")
+            resolved.append(dependency_query.name)
+            pending.append(dependency_query.name)
+        node.depends = resolved
+        nodes[node.name] = node
+    topological_order(nodes)
+    return nodes
+
+
+def topological_order(nodes: Dict[str, QueryNode]) -> List[str]:
+    remaining = {name: set(node.depends) for name, node in nodes.items()}
+    order: List[str] = []
+    while remaining:
+        ready = sorted(name for name, depends in remaining.items() if not depends)
+        if not ready:
+            raise ValueError(f"Dependency cycle between queries: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+            order.append(name)
+        for depends in remaining.values():
+            depends.difference_update(ready)
+    return order
+
+
+def _frame_hash(df: pd.DataFrame) -> str:
+    digest = hashlib.sha1(repr(list(df.columns)).encode())
+    if not df.empty:
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class DAGRunner:
+    def __init__(
+        self,
+        nodes: Dict[str, QueryNode],
+        output_dir: str,
+        concurrency: Optional[Dict[str, int]] = None,
+        retries: int = DEFAULT_RETRIES,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        skip_unchanged: bool = False,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        priority: str = 'batch',
+        connection_factories: Optional[Dict[str, Callable[[], DatabaseConnection]]] = None
+    ):
+        self.nodes = nodes
+        self.output_dir = output_dir
+        self.concurrency = concurrency or {}
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.skip_unchanged = skip_unchanged
+        self.max_rows = max_rows
+        self.priority = priority
+        self.connection_factories = connection_factories or BACKEND_CLASSES
+        self.state_path = os.path.join(output_dir, STATE_FILE)
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self._pools: Dict[str, ConnectionPool] = {}
+
+    def _limit(self, backend: str) -> int:
+        return max(1, self.concurrency.get(backend, DEFAULT_CONCURRENCY))
+
+    def _pool(self, backend: str) -> ConnectionPool:
+        if backend not in self._pools:
+            if backend not in self.connection_factories:
+                raise ValueError(f"Unsupported backend: {backend}")
+            template = self.connection_factories[backend]()
+            self._pools[backend] = ConnectionPool(template, max_size=self._limit(backend))
+        return self._pools[backend]
+
+    def _load_state(self) -> None:
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r') as f:
+                self.state = json.load(f)
+
+    def _save_state(self) -> None:
+        with open(self.state_path + '.tmp', 'w') as f:
+            json.dump(self.state, f, indent=2, default=str)
+        os.replace(self.state_path + '.tmp', self.state_path)
+
+    def _input_hash(self, node: QueryNode, sql: str, params: Optional[Dict[str, Any]]) -> str:
+        upstream = [self.state.get(name, {}).get('output_hash') for name in node.depends]
+        payload = json.dumps([sql, params, node.backend, upstream], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _is_unchanged(self, node: QueryNode, input_hash: str) -> bool:
+        previous = self.state.get(node.name)
+        if not self.skip_unchanged or not previous or previous.get('input_hash') != input_hash:
+            return False
+        if not previous.get('output') or not os.path.exists(previous['output']):
+            return False
+        # Without a TTL there is no signal that the source tables are unchanged
+        ttl = node.query.ttl
+        return ttl is not None and time.time() - previous.get('finished_at', 0) < ttl
+
+    def _output_path(self, node: QueryNode) -> str:
+        today = datetime.datetime.now().strftime('%Y-%m-%d')
+        return os.path.join(self.output_dir, f"{node.name.replace('/', '__')}_{today}.pkl")
+
+    def _execute(self, node: QueryNode, sql: str, params: Optional[Dict[str, Any]]) -> pd.DataFrame:
+        pool = self._pool(node.backend)
+        retry = node.retry
+        if retry is None:
+            retry = all(
+                preprocess(statement, node.backend).kind == READ
+                for statement in split_statements(sql, node.backend)
+            )
+        retries = self.retries if retry else 0
+        for attempt in range(retries + 1):
+            try:
+                with pool.connection() as connection:
+                    query, query_params = sql, params
+                    if params and connection.placeholder == '?':
+                        query, query_params = convert_placeholders(
+                            sql, params, 'qmark', connection.backend
+                        )
+                    if not params and preprocess(sql, connection.backend).is_multi:
+                        result_sets = connection.execute_script(sql)
+                        result = None if result_sets is None else (
+                            result_sets[-1] if result_sets else pd.DataFrame()
+                        )
+                    else:
+                        result = connection.execute_query(
+                            query, query_params, max_rows=self.max_rows
+                        )
+                        if result is None and not preprocess(sql, connection.backend).returns_rows:
+                            result = pd.DataFrame()
+                if result is None:
+                    raise RuntimeError(f"Query {node.name} failed")
+                return result
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                delay = self.retry_delay * 2 ** attempt
+                logger.warning(
+                    f"{node.name} failed (attempt {attempt + 1}/{retries + 1}): {e}; "
+                    f"retrying in {delay:.1f} seconds"
+                )
+                time.sleep(delay)
+        raise RuntimeError(f"Query {node.name} failed")
+
+    def _run_node(self, node: QueryNode) -> Dict[str, Any]:
+        # Scheduled queries queue behind interactive ones (see db/admission.py)
+        with query_priority(self.priority), query_client('dag'):
+            return self._run_node_admitted(node)
+
+    def _run_node_admitted(self, node: QueryNode) -> Dict[str, Any]:
+        start_time = time.time()
+        sql, params = node.query.bind(node.params)
+        input_hash = self._input_hash(node, sql, params)
+        if self._is_unchanged(node, input_hash):
+            logger.info(f"Skipping {node.name}: inputs unchanged since the last run")
+            return {'status': SKIPPED, 'output': self.state[node.name]['output'], 'seconds': 0.0}
+
+        result = self._execute(node, sql, params)
+        output = self._output_path(node)
+        result.to_pickle(output + '.tmp')
+        os.replace(output + '.tmp', output)
+        # The state entry is recorded by the scheduling thread, which owns self.state
+        return {
+            'status': SUCCESS,
+            'output': output,
+            'rows': len(result),
+            'seconds': time.time() - start_time,
+            'state': {
+                'input_hash': input_hash,
+                'output_hash': _frame_hash(result),
+                'output': output,
+                'rows': len(result),
+                'finished_at': time.time()
+            }
+        }
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Run every node once its dependencies have succeeded.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per node status (success, skipped, failed or
+            upstream_failed), output path, row count and seconds
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._load_state()
+        start_time = time.time()
+        order = topological_order(self.nodes)
+        waiting: Dict[str, Set[str]] = {name: set(self.nodes[name].depends) for name in order}
+        running: Dict[Future, str] = {}
+        active: Dict[str, int] = {}
+        backends = {node.backend for node in self.nodes.values()}
+        workers = sum(self._limit(backend) for backend in backends)
+        # Pools are created up front so worker threads only ever read self._pools
+        for backend in backends:
+            self._pool(backend)
+
+        def mark_upstream_failed(name: str) -> None:
+            for dependent, depends in list(waiting.items()):
+                if name in depends:
+                    del waiting[dependent]
+                    self.results[dependent] = {'status': UPSTREAM_FAILED}
+                    logger.error(f"Not running {dependent}: upstream {name} failed")
+                    mark_upstream_failed(dependent)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                while waiting or running:
+                    for name in [n for n in order if n in waiting and not waiting[n]]:
+                        backend = self.nodes[name].backend
+                        if active.get(backend, 0) >= self._limit(backend):
+                            continue
+                        del waiting[name]
+                        active[backend] = active.get(backend, 0) + 1
+                        running[executor.submit(self._run_node, self.nodes[name])] = name
+
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        active[self.nodes[name].backend] -= 1
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            logger.error(f"Query {name} failed: {e}")
+                            self.results[name] = {'status': FAILED, 'error': str(e)}
+                            mark_upstream_failed(name)
+                            continue
+                        # Outputs and state are persisted as each node finishes
+                        if 'state' in result:
+                            self.state[name] = result.pop('state')
+                            self._save_state()
+                        self.results[name] = result
+                        for depends in waiting.values():
+                            depends.discard(name)
+        finally:
+            for pool in self._pools.values():
+                pool.close()
+
+        counts: Dict[str, int] = {}
+        for result in self.results.values():
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        logger.info(
+            f"DAG of {len(self.nodes)} queries finished in {time.time() - start_time:.2f} seconds: "
+            + ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        )
+        return self.results
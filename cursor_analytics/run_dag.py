@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Script to run a directory of dependent queries as a DAG (see queries/dag.py).
+"""
+
+import sys
+import os
+import argparse
+from pathlib import Path
+# Add parent directory to path to ensure imports work
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cursor_analytics.config.settings import load_environment
+from cursor_analytics.utils.logger import configure_logging
+from cursor_analytics.queries import get_catalog
+from cursor_analytics.queries.catalog import QueryCatalog
+from cursor_analytics.queries.dag import (
+    build_dag, DAGRunner, DEFAULT_RETRIES, DEFAULT_RETRY_DELAY, FAILED, UPSTREAM_FAILED
+)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Run dependent queries as a DAG')
+    parser.add_argument('queries', nargs='*',
+                        help='Queries to run with their dependencies (default: all)')
+    parser.add_argument('--dir', type=str, help='Queries directory (default: the queries package)')
+    parser.add_argument('--manifest', type=str,
+                        help='JSON manifest overriding depends/backend/params/retry per query')
+    parser.add_argument('--db', '-d', type=str, default='mysql',
+                        choices=['mysql', 'postgres', 'snowflake', 'duckdb'],
+                        help='Backend of queries without an @backend header')
+    parser.add_argument('--concurrency', '-c', action='append', metavar='BACKEND=N',
+                        help='Concurrent queries per backend (repeatable, default 2)')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES)
+    parser.add_argument('--retry-delay', type=float, default=DEFAULT_RETRY_DELAY)
+    parser.add_argument('--skip-unchanged', action='store_true',
+                        help='Skip queries within their @ttl whose SQL, parameters and '
+                             'inputs are unchanged')
+    parser.add_argument('--output-dir', '-o', type=str, default='outputs')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    load_environment()
+    configure_logging()
+
+    concurrency = {}
+    for item in args.concurrency or []:
+        backend, _, limit = item.partition('=')
+        concurrency[backend] = int(limit)
+
+    catalog = QueryCatalog(Path(args.dir)) if args.dir else get_catalog()
+    nodes = build_dag(catalog, args.queries or None, args.manifest, default_backend=args.db)
+    print(f"Running {len(nodes)} queries...")
+
+    runner = DAGRunner(
+        nodes,
+        args.output_dir,
+        concurrency=concurrency,
+        retries=args.retries,
+        retry_delay=args.retry_delay,
+        skip_unchanged=args.skip_unchanged
+    )
+    results = runner.run()
+
+    for name, result in sorted(results.items()):
+        detail = result.get('output') or result.get('error', '')
+        print(f"  {result['status']:<16} {name} {detail}")
+    if any(result['status'] in (FAILED, UPSTREAM_FAILED) for result in results.values()):
+        sys.exit(1)
@@ -9,8 +9,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from cursor_analytics.db.schema import MySQLSchemaAnalyzer
+from cursor_analytics.utils.logger import configure_logging
 
 if __name__ == "__main__":
+    configure_logging()
     print("Starting MySQL schema analysis...")
     
     # Create the analyzer instance
@@ -0,0 +1,29 @@
+from typing import Callable, Iterator, List
+
+import pytest
+
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+@pytest.fixture
+def sqlite_connection() -> Iterator[SQLiteConnection]:
+    connection = SQLiteConnection()
+    connection.connect()
+    yield connection
+    connection.disconnect()
+
+
+@pytest.fixture
+def sqlite_connection_factory() -> Iterator[Callable[..., SQLiteConnection]]:
+    # Connected SQLiteConnections, disconnected when the test ends
+    connections: List[SQLiteConnection] = []
+
+    def factory(path: str = ':memory:') -> SQLiteConnection:
+        connection = SQLiteConnection(path)
+        connection.connect()
+        connections.append(connection)
+        return connection
+
+    yield factory
+    for connection in connections:
+        connection.disconnect()
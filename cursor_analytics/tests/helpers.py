@@ -0,0 +1,41 @@
+import sqlite3
+from typing import Optional, Union
+
+import pandas as pd
+
+from cursor_analytics.db.connection import DatabaseConnection
+
+
+class SQLiteConnection(DatabaseConnection):
+    # In-process stand-in for a real backend so the connection layer can be tested
+    # without database credentials.
+    backend = 'sqlite'
+    placeholder = '?'
+
+    def __init__(self, path: str = ':memory:'):
+        super().__init__()
+        self.config = {'database': path}
+
+    def connect(self) -> bool:
+        self.connection = sqlite3.connect(self.config['database'], check_same_thread=False)
+        return True
+
+    def _execute_query(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        timeout: int = 3000,
+        max_rows: int = 1000
+    ) -> Optional[pd.DataFrame]:
+        if not self.is_connected():
+            self.connect()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params or ())
+            if cursor.description is None:
+                self.connection.commit()
+                return None
+            columns = [desc[0] for desc in cursor.description]
+            return pd.DataFrame(cursor.fetchmany(max_rows), columns=columns)
+        finally:
+            cursor.close()
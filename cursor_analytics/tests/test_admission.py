@@ -0,0 +1,113 @@
+import time
+import threading
+from typing import List
+
+import pytest
+
+from cursor_analytics.db.admission import (
+    AdmissionController,
+    QueueTimeout,
+    query_client,
+    query_priority,
+    set_admission_controller
+)
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+def _hold_slot(controller: AdmissionController, started: threading.Event,
+               release: threading.Event) -> None:
+    with controller.admit('mysql'):
+        started.set()
+        release.wait(5)
+
+
+def _queue(controller: AdmissionController, order: List[str], label: str,
+           priority: str = 'normal', client: str = 'test') -> threading.Thread:
+    def run() -> None:
+        with query_priority(priority), query_client(client):
+            with controller.admit('mysql'):
+                order.append(label)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _wait_for_waiters(controller: AdmissionController, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while controller.stats().get('mysql', {}).get('waiting', 0) < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_interactive_queries_jump_the_batch_queue() -> None:
+    controller = AdmissionController({'mysql': 1})
+    started, release = threading.Event(), threading.Event()
+    holder = threading.Thread(target=_hold_slot, args=(controller, started, release))
+    holder.start()
+    started.wait(5)
+
+    order: List[str] = []
+    threads = [_queue(controller, order, f"batch-{i}", 'batch') for i in range(3)]
+    _wait_for_waiters(controller, 3)
+    threads.append(_queue(controller, order, 'interactive', 'interactive'))
+    _wait_for_waiters(controller, 4)
+
+    release.set()
+    for thread in [holder] + threads:
+        thread.join(5)
+
+    assert order[0] == 'interactive'
+    stats = controller.stats()['mysql']
+    assert stats['admitted'] == 5 and stats['running'] == 0
+    assert stats['by_priority'] == {'normal': 1, 'batch': 3, 'interactive': 1}
+
+
+def test_clients_share_a_priority_fairly() -> None:
+    controller = AdmissionController({'mysql': 1})
+    started, release = threading.Event(), threading.Event()
+    holder = threading.Thread(target=_hold_slot, args=(controller, started, release))
+    holder.start()
+    started.wait(5)
+
+    order: List[str] = []
+    threads = []
+    for i in range(3):
+        threads.append(_queue(controller, order, f"job-{i}", client='job'))
+        _wait_for_waiters(controller, i + 1)
+    threads.append(_queue(controller, order, 'analyst', client='analyst'))
+    _wait_for_waiters(controller, 4)
+
+    release.set()
+    for thread in [holder] + threads:
+        thread.join(5)
+
+    # The analyst's single query is not queued behind the whole job
+    assert order.index('analyst') <= 1
+
+
+def test_queue_timeout_is_reported() -> None:
+    controller = AdmissionController({'mysql': 1}, queue_timeout=0.05)
+    started, release = threading.Event(), threading.Event()
+    holder = threading.Thread(target=_hold_slot, args=(controller, started, release))
+    holder.start()
+    started.wait(5)
+
+    with pytest.raises(QueueTimeout):
+        with controller.admit('mysql'):
+            pass
+    release.set()
+    holder.join(5)
+    assert controller.stats()['mysql']['timeouts'] == 1
+
+
+def test_execute_query_goes_through_admission(sqlite_connection: SQLiteConnection) -> None:
+    controller = AdmissionController()
+    set_admission_controller(controller)
+    try:
+        with controller.admit('sqlite'):
+            # Queries nested in a held slot are not queued again
+            df = sqlite_connection.execute_query("SELECT 1 AS one")
+        assert df is not None and df['one'].tolist() == [1]
+    finally:
+        set_admission_controller(AdmissionController.from_env())
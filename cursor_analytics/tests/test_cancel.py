@@ -0,0 +1,131 @@
+import os
+import time
+import signal
+import asyncio
+import threading
+from unittest import mock
+
+import pytest
+
+from cursor_analytics.db import cancel
+from cursor_analytics.db.connection import DuckDBConnection, MySQLConnection
+
+# Runs for minutes unless cancelled
+SLOW_QUERY = "SELECT COUNT(*) AS n FROM range(10000000000) t WHERE t.range % 7 = 3"
+
+
+def _connection() -> DuckDBConnection:
+    connection = DuckDBConnection()
+    connection.execute_query("CREATE TABLE kept AS SELECT 1 AS id")
+    return connection
+
+
+def test_watchdog_cancels_queries_past_their_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cancel, '_watchdog', cancel.Watchdog(grace=0.05, cover_all=True))
+    connection = _connection()
+    start = time.perf_counter()
+
+    assert connection.execute_query(SLOW_QUERY, timeout=200) is None
+    assert time.perf_counter() - start < 5
+    assert connection.last_cancel['reason'] == 'timeout'
+    assert len(connection.execute_query("SELECT * FROM kept")) == 1
+
+
+def test_watchdog_skips_statements_the_server_does_not_time_out(
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    watchdog = cancel.Watchdog(grace=0.05)
+    monkeypatch.setattr(cancel, '_watchdog', watchdog)
+    connection = _connection()
+
+    with mock.patch.object(watchdog, 'watch', wraps=watchdog.watch) as watch:
+        connection.execute_query("SELECT COUNT(*) FROM range(1000)", timeout=200)
+    watch.assert_not_called()
+
+    mysql = MySQLConnection()
+    assert mysql._server_times_out("SELECT * FROM orders")
+    assert not mysql._server_times_out("UPDATE orders SET total = 0")
+    assert not mysql._server_times_out("CREATE TABLE copy AS SELECT * FROM orders")
+
+
+def test_cancel_from_another_thread_reports_reclaimed_time() -> None:
+    connection = _connection()
+    results = []
+    worker = threading.Thread(
+        target=lambda: results.append(connection.execute_query(SLOW_QUERY, timeout=60000))
+    )
+    worker.start()
+    time.sleep(0.3)
+    report = connection.cancel()
+    worker.join(timeout=5)
+
+    assert results == [None]
+    assert report['backend'] == 'duckdb' and report['elapsed_seconds'] > 0
+    assert 0 < report['reclaimed_seconds'] < 60
+    assert connection.cancel() is None  # nothing running any more
+
+
+def test_ctrl_c_cancels_the_query_on_the_server() -> None:
+    connection = _connection()
+    timer = threading.Timer(0.3, os.kill, (os.getpid(), signal.SIGINT))
+    timer.start()
+    start = time.perf_counter()
+    with pytest.raises(KeyboardInterrupt):
+        connection.execute_query(SLOW_QUERY, timeout=60000)
+
+    assert time.perf_counter() - start < 5
+    assert connection.last_cancel['reason'] == 'interrupted'
+    assert len(connection.execute_query("SELECT * FROM kept")) == 1
+
+
+def test_cancelled_task_cancels_its_query() -> None:
+    connection = _connection()
+
+    async def run() -> None:
+        task = asyncio.create_task(connection.execute_query_async(SLOW_QUERY, timeout=60000))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    with connection._async_lock:
+        assert connection.last_cancel['reason'] == 'task cancelled'
+    assert len(connection.execute_query("SELECT * FROM kept")) == 1
+
+
+def test_cancelling_a_waiting_task_keeps_the_running_query() -> None:
+    connection = _connection()
+
+    async def run() -> None:
+        running = asyncio.create_task(connection.execute_query_async(SLOW_QUERY, timeout=60000))
+        await asyncio.sleep(0.3)
+        waiting = asyncio.create_task(connection.execute_query_async("SELECT * FROM kept"))
+        await asyncio.sleep(0.1)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        await asyncio.sleep(0.3)
+        assert not running.done() and connection.last_cancel is None
+
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+
+    asyncio.run(run())
+    with connection._async_lock:
+        assert connection.last_cancel['reason'] == 'task cancelled'
+    assert len(connection.execute_query("SELECT * FROM kept")) == 1
+
+
+def test_mysql_kills_the_query_from_a_side_connection() -> None:
+    connection = MySQLConnection()
+    connection._connection_id = 42
+    connection._running = (time.perf_counter(), 3000)
+    side = mock.MagicMock()
+    with mock.patch.object(connection, 'clone', return_value=side):
+        report = connection.cancel()
+
+    side.connection.cursor.return_value.execute.assert_called_once_with("KILL QUERY 42")
+    side.disconnect.assert_called_once()
+    assert report['backend'] == 'mysql' and report['reclaimed_seconds'] > 2.9
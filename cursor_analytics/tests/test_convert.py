@@ -0,0 +1,50 @@
+import datetime
+import decimal
+import pandas as pd
+
+from cursor_analytics.db.connection import DuckDBConnection
+from cursor_analytics.db.convert import build_converted_frame
+
+
+def test_build_converted_frame_converts_driver_values() -> None:
+    description = [
+        ('amount', 246, None, None, None, 2, 1, 0, 63),
+        ('elapsed', 11, None, None, None, None, 1, 0, 63),
+        ('name', 253, None, None, None, None, 1, 0, 45),
+        ('payload', 245, None, None, None, None, 1, 0, 45),
+        ('amount', 246, None, None, None, 2, 1, 0, 63),
+    ]
+    rows = [
+        (decimal.Decimal('1.25'), datetime.timedelta(hours=1), bytearray(b'caf\xc3\xa9'),
+         '{"a": 1}', decimal.Decimal('-2.50')),
+        (None, None, None, None, decimal.Decimal('3.00')),
+    ]
+
+    df = build_converted_frame(rows, description, 'mysql', decimal_mode='fixed')
+
+    assert list(df.columns) == ['amount', 'elapsed', 'name', 'payload', 'amount']
+    assert str(df.iloc[:, 0].dtype) == 'Int64'
+    assert df.iloc[:, 0].tolist()[0] == 125 and pd.isna(df.iloc[1, 0])
+    assert df.iloc[:, 4].tolist() == [-250, 300]
+    assert df.attrs['decimal_scales'] == {'amount': 2}
+    assert df['elapsed'].dtype.kind == 'm'
+    assert df['elapsed'].iloc[0] == pd.Timedelta(hours=1)
+    assert df['name'].iloc[0] == 'café'
+    assert df['payload'].iloc[0] == {'a': 1}
+
+
+def test_connection_converts_values_before_building_frame() -> None:
+    connection = DuckDBConnection()
+    connection.connect()
+    connection.convert_values = True
+
+    df = connection.execute_query(
+        "SELECT CAST(range AS DECIMAL(10, 2)) / 4 AS amount, "
+        "TIME '01:30:00' AS start_time FROM range(4)",
+        max_rows=4
+    )
+
+    assert df is not None
+    assert df['amount'].dtype == 'float64'
+    assert df['amount'].tolist() == [0.0, 0.25, 0.5, 0.75]
+    assert df['start_time'].iloc[0] == pd.Timedelta(minutes=90)
@@ -0,0 +1,83 @@
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from cursor_analytics.daemon import (
+    DaemonUnavailable,
+    QueryDaemon,
+    forward_query,
+    request_daemon
+)
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+@pytest.fixture
+def daemon(tmp_path: Path) -> Iterator[QueryDaemon]:
+    daemon = QueryDaemon(str(tmp_path / 'daemon.sock'), pool_size=2,
+                         connection_factories={'sqlite': SQLiteConnection})
+    daemon.bind()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join(5)
+
+
+def test_forwarded_query_returns_arrow_result(daemon: QueryDaemon, tmp_path: Path) -> None:
+    query_file = tmp_path / 'letters.sql'
+    query_file.write_text(
+        "-- @param n int 2\n"
+        "SELECT {{ n }} AS n, 'a' AS letter UNION ALL SELECT {{ n }} + 1, NULL"
+    )
+
+    df = forward_query('sqlite', str(query_file), {'n': '5'}, path=daemon.path)
+
+    assert df['n'].tolist() == [5, 6]
+    assert df['letter'].tolist()[0] == 'a'
+    status = request_daemon('status', daemon.path)
+    assert status['requests'] == 1 and status['pools'] == {'sqlite': 1}
+
+
+def test_invalid_requests_are_reported(daemon: QueryDaemon, tmp_path: Path) -> None:
+    query_file = tmp_path / 'needs_param.sql'
+    query_file.write_text("-- @param n int\nSELECT {{ n }} AS n")
+
+    with pytest.raises(ValueError, match='Missing required parameter'):
+        forward_query('sqlite', str(query_file), path=daemon.path)
+    with pytest.raises(ValueError, match='Could not load query'):
+        forward_query('sqlite', 'no_such_query', path=daemon.path)
+
+
+def test_changed_connection_settings_fall_back_before_running(
+    daemon: QueryDaemon, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    query_file = tmp_path / 'one.sql'
+    query_file.write_text("SELECT 1 AS n")
+    monkeypatch.setenv('DUCKDB_DATABASE', str(tmp_path / 'other.duckdb'))
+
+    with pytest.raises(DaemonUnavailable, match='connection settings'):
+        forward_query('sqlite', str(query_file), path=daemon.path)
+    assert request_daemon('status', daemon.path)['pools'] == {}
+
+
+def test_unsendable_results_are_not_retried(daemon: QueryDaemon, tmp_path: Path) -> None:
+    # Mixed int/str values cannot be converted to an Arrow column
+    query_file = tmp_path / 'mixed.sql'
+    query_file.write_text("SELECT 1 AS v UNION ALL SELECT 'a'")
+
+    assert forward_query('sqlite', str(query_file), path=daemon.path) is None
+
+
+def test_missing_daemon_falls_back(tmp_path: Path) -> None:
+    with pytest.raises(DaemonUnavailable):
+        forward_query('sqlite', 'anything', path=str(tmp_path / 'missing.sock'))
+
+    # A socket file left behind by a dead daemon is not mistaken for a running one
+    stale = QueryDaemon(str(tmp_path / 'stale.sock'), connection_factories={})
+    stale.bind()
+    stale.close()
+    Path(stale.path).touch()
+    with pytest.raises(DaemonUnavailable):
+        request_daemon('status', stale.path)
@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import pandas as pd
+import pytest
+
+from cursor_analytics.queries.catalog import QueryCatalog
+from cursor_analytics.queries.dag import (
+    build_dag, topological_order, DAGRunner, SUCCESS, SKIPPED, FAILED, UPSTREAM_FAILED
+)
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+class FlakyConnection(SQLiteConnection):
+    failures: Dict[str, int] = {}
+
+    def execute_query(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        timeout: int = 3000,
+        max_rows: int = 1000
+    ) -> Optional[pd.DataFrame]:
+        for marker, remaining in self.failures.items():
+            if marker in query and remaining:
+                self.failures[marker] -= 1
+                raise ConnectionError("Lost connection to the server")
+        return super().execute_query(query, params, timeout, max_rows)
+
+
+def _queries(tmp_path: Path) -> QueryCatalog:
+    root = tmp_path / 'queries'
+    (root / 'base').mkdir(parents=True)
+    (root / 'base' / 'numbers.sql').write_text("SELECT 1 AS n UNION ALL SELECT 2")
+    (root / 'total.sql').write_text(
+        "-- @depends numbers\n-- @ttl 3600\n-- @param minimum int 0\n"
+        "SELECT {{ minimum }} AS minimum, 3 AS total"
+    )
+    (root / 'broken.sql').write_text("-- @depends total\nSELECT * FROM missing_table")
+    (root / 'after_broken.sql').write_text("-- @depends broken\nSELECT 1")
+    return QueryCatalog(root)
+
+
+def test_build_dag_resolves_dependencies(tmp_path: Path) -> None:
+    nodes = build_dag(_queries(tmp_path), ['total'], default_backend='sqlite')
+
+    assert set(nodes) == {'total', 'base/numbers'}
+    assert nodes['total'].depends == ['base/numbers']
+    assert topological_order(nodes) == ['base/numbers', 'total']
+
+
+def test_build_dag_rejects_cycles(tmp_path: Path) -> None:
+    root = tmp_path / 'cycle'
+    root.mkdir()
+    (root / 'a.sql').write_text("-- @depends b\nSELECT 1")
+    (root / 'b.sql').write_text("-- @depends a\nSELECT 1")
+
+    with pytest.raises(ValueError):
+        build_dag(QueryCatalog(root), default_backend='sqlite')
+
+
+def test_runner_retries_skips_and_stops_downstream(tmp_path: Path) -> None:
+    nodes = build_dag(_queries(tmp_path), default_backend='sqlite')
+    output_dir = str(tmp_path / 'out')
+    factories: Dict[str, Any] = {'sqlite': lambda: FlakyConnection(str(tmp_path / 'db.sqlite'))}
+    FlakyConnection.failures = {'AS minimum': 1}
+
+    results = DAGRunner(nodes, output_dir, retries=1, retry_delay=0,
+                        connection_factories=factories).run()
+
+    assert results['base/numbers']['status'] == SUCCESS
+    assert results['total']['status'] == SUCCESS
+    assert results['broken']['status'] == FAILED
+    assert results['after_broken']['status'] == UPSTREAM_FAILED
+    assert pd.read_pickle(results['total']['output'])['total'].tolist() == [3]
+    assert os.path.exists(os.path.join(output_dir, '_dag_state.json'))
+
+    rerun = DAGRunner(nodes, output_dir, retries=0, retry_delay=0, skip_unchanged=True,
+                      connection_factories=factories).run()
+    # numbers has no TTL, so it runs again; its unchanged result lets total be skipped
+    assert rerun['base/numbers']['status'] == SUCCESS
+    assert rerun['total']['status'] == SKIPPED
+
+
+def test_runner_only_retries_writes_that_opt_in(tmp_path: Path) -> None:
+    root = tmp_path / 'writes'
+    root.mkdir()
+    (root / 'load.sql').write_text("CREATE TABLE loaded AS SELECT 1 AS n")
+    (root / 'retried.sql').write_text("-- @retry true\nCREATE TABLE retried AS SELECT 1 AS n")
+    nodes = build_dag(QueryCatalog(root), default_backend='sqlite')
+    factories: Dict[str, Any] = {'sqlite': lambda: FlakyConnection(str(tmp_path / 'db.sqlite'))}
+    FlakyConnection.failures = {'TABLE loaded': 1, 'TABLE retried': 1}
+
+    results = DAGRunner(nodes, str(tmp_path / 'out'), retries=1, retry_delay=0,
+                        connection_factories=factories).run()
+
+    assert results['load']['status'] == FAILED
+    assert results['retried']['status'] == SUCCESS
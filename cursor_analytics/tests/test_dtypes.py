@@ -0,0 +1,66 @@
+import decimal
+import pandas as pd
+
+from cursor_analytics.db.connection import DuckDBConnection
+from cursor_analytics.db.dtypes import plan_dtypes, optimize_dtypes, BOOLEAN, CATEGORY, DECIMAL
+
+
+def test_plan_dtypes_uses_mysql_codes_and_schema_hints() -> None:
+    description = [
+        ('flag', 1, None, None, None, None, 1, 0, 63),
+        ('status', 254, None, None, None, None, 1, 256, 45),
+        ('amount', 246, None, None, None, None, 1, 0, 63),
+    ]
+
+    plan = plan_dtypes(
+        description, 'mysql', column_types={'flag': 'tinyint(1)', 'amount': 'decimal(12,2)'}
+    )
+
+    assert plan['flag']['kind'] == BOOLEAN
+    assert plan['status']['kind'] == CATEGORY
+    assert plan['amount'] == {'kind': DECIMAL, 'scale': 2}
+
+
+def test_optimize_dtypes_reports_memory_saved() -> None:
+    df = pd.DataFrame({
+        'id': [1, 2, None, 4] * 250,
+        'flag': [0, 1, 1, 0] * 250,
+        'status': ['open', 'closed', 'open', 'open'] * 250,
+        'amount': [
+            decimal.Decimal('1.25'), decimal.Decimal('2.50'), None, decimal.Decimal('3.75')
+        ] * 250,
+    })
+    plan = {
+        'id': {'kind': 'integer', 'scale': None},
+        'flag': {'kind': 'boolean', 'scale': None},
+        'status': {'kind': 'string', 'scale': None},
+        'amount': {'kind': 'decimal', 'scale': 2},
+    }
+
+    optimized, report = optimize_dtypes(df, plan, decimal_mode='fixed')
+
+    assert str(optimized['id'].dtype) == 'Int8'
+    assert optimized['flag'].dtype == bool
+    assert str(optimized['status'].dtype) == 'category'
+    assert optimized['amount'].tolist()[:2] == [125, 250]
+    assert optimized.attrs['decimal_scales'] == {'amount': 2}
+    assert report['memory_saved'] > 0 and set(report['columns']) == set(plan)
+
+
+def test_connection_applies_dtype_plan() -> None:
+    connection = DuckDBConnection()
+    connection.connect()
+    connection.optimize_dtypes = True
+
+    df = connection.execute_query(
+        "SELECT range::BIGINT AS id, CAST(range % 3 AS DECIMAL(10, 2)) AS amount, "
+        "CASE WHEN range % 2 = 0 THEN 'even' ELSE 'odd' END AS parity FROM range(100)",
+        max_rows=100
+    )
+
+    assert df is not None
+    assert str(df['id'].dtype) == 'int8'
+    assert df['amount'].dtype == 'float64'
+    assert str(df['parity'].dtype) == 'category'
+    assert connection.last_dtype_report is not None
+    assert connection.last_dtype_report['memory_saved'] > 0
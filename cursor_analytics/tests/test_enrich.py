@@ -0,0 +1,78 @@
+from pathlib import Path
+from typing import Any, Callable
+import pandas as pd
+import pytest
+
+from cursor_analytics.db.enrich import enrich
+from cursor_analytics.db.pool import ConnectionPool
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+def _lookup_connection(
+    factory: Callable[..., SQLiteConnection], tmp_path: Path
+) -> SQLiteConnection:
+    connection = factory(str(tmp_path / 'lookup.db'))
+    connection.execute_query("CREATE TABLE users (id INTEGER PRIMARY KEY, country TEXT)")
+    connection.connection.executemany(
+        "INSERT INTO users VALUES (?, ?)", [(i, f"c{i % 3}") for i in range(100)]
+    )
+    connection.connection.commit()
+    return connection
+
+
+def test_enrich_with_concurrent_batches(
+    sqlite_connection_factory: Callable[..., SQLiteConnection], tmp_path: Path
+) -> None:
+    connection = _lookup_connection(sqlite_connection_factory, tmp_path)
+    df = pd.DataFrame({'id': [1, 2, 2, 50, 99, 500], 'value': range(6)})
+
+    with ConnectionPool(connection, max_size=3) as pool:
+        result = enrich(df, connection, 'users', 'id', columns=['country'], batch_size=2, pool=pool)
+        assert 1 <= pool.size <= 3
+
+    assert len(result) == 6
+    assert result.loc[result['id'] == 50, 'country'].item() == 'c2'
+    assert result.loc[result['id'] == 500, 'country'].isna().all()
+
+
+def test_enrich_switches_to_temp_table(
+    sqlite_connection_factory: Callable[..., SQLiteConnection], tmp_path: Path
+) -> None:
+    connection = _lookup_connection(sqlite_connection_factory, tmp_path)
+    df = pd.DataFrame({'id': range(0, 200, 2)})
+
+    result = enrich(df, connection, 'users', 'id', how='inner', temp_table_threshold=10)
+
+    assert sorted(result['id'].tolist()) == list(range(0, 100, 2))
+    assert set(result.columns) == {'id', 'country'}
+
+
+def test_enrich_drops_temp_table_after_failed_load(
+    sqlite_connection_factory: Callable[..., SQLiteConnection],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    connection = _lookup_connection(sqlite_connection_factory, tmp_path)
+
+    def failing_load(*args: Any) -> None:
+        raise RuntimeError("load failed")
+
+    monkeypatch.setattr(connection, '_bulk_load', failing_load)
+    with pytest.raises(RuntimeError):
+        enrich(pd.DataFrame({'id': range(20)}), connection, 'users', 'id', temp_table_threshold=10)
+
+    tables = connection.connection.execute(
+        "SELECT name FROM sqlite_temp_master WHERE name = '_enrich_keys'"
+    ).fetchall()
+    assert tables == []
+
+
+def test_pool_acquire_timeout_is_descriptive(
+    sqlite_connection_factory: Callable[..., SQLiteConnection], tmp_path: Path
+) -> None:
+    connection = _lookup_connection(sqlite_connection_factory, tmp_path)
+
+    with ConnectionPool(connection, max_size=1) as pool:
+        with pool.connection():
+            with pytest.raises(TimeoutError, match='within 0.01s'):
+                pool.acquire(timeout=0.01)
@@ -0,0 +1,84 @@
+from pathlib import Path
+from typing import Any, Optional
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from cursor_analytics.db.connection import MySQLConnection
+from cursor_analytics.db.export import discover_key_columns, export_table
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+def _populate(connection: SQLiteConnection) -> None:
+    connection.execute_query("CREATE TABLE events (tenant INTEGER, seq INTEGER, payload TEXT)")
+    connection.connection.executemany(
+        "INSERT INTO events VALUES (?, ?, ?)",
+        [(tenant, seq, f"{tenant}-{seq}") for tenant in range(3) for seq in range(7)]
+    )
+    connection.connection.commit()
+
+
+def test_export_table_pages_by_composite_key(
+    sqlite_connection: SQLiteConnection,
+    tmp_path: Path
+) -> None:
+    _populate(sqlite_connection)
+
+    summary = export_table(
+        sqlite_connection, 'events', key_columns=['tenant', 'seq'],
+        output_dir=str(tmp_path), page_size=4, pages_per_file=2
+    )
+
+    assert summary['complete'] and summary['rows'] == 21
+    exported = pq.read_table(str(tmp_path), columns=['tenant', 'seq']).to_pandas()
+    assert len(exported) == 21
+    assert not exported.duplicated().any()
+
+
+def test_export_table_resumes_after_failure(
+    sqlite_connection: SQLiteConnection,
+    tmp_path: Path
+) -> None:
+    _populate(sqlite_connection)
+    original = sqlite_connection.execute_query
+    calls = {'count': 0}
+
+    def flaky(
+        query: str,
+        params: Any = None,
+        timeout: int = 3000,
+        max_rows: int = 1000
+    ) -> Optional[pd.DataFrame]:
+        calls['count'] += 1
+        if calls['count'] == 4:
+            return None
+        return original(query, params, timeout, max_rows)
+
+    sqlite_connection.execute_query = flaky  # type: ignore[method-assign]
+    with pytest.raises(RuntimeError):
+        export_table(sqlite_connection, 'events', key_columns=['tenant', 'seq'],
+                     output_dir=str(tmp_path), page_size=3, pages_per_file=2)
+
+    sqlite_connection.execute_query = original  # type: ignore[method-assign]
+    summary = export_table(sqlite_connection, 'events', key_columns=['tenant', 'seq'],
+                           output_dir=str(tmp_path), page_size=3, pages_per_file=2)
+
+    assert summary['complete'] and summary['rows'] == 21
+    exported = pq.read_table(str(tmp_path)).to_pandas()
+    assert len(exported) == 21 and not exported.duplicated().any()
+
+
+def test_discover_key_columns_follows_primary_key_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    connection = MySQLConnection()
+    queries = []
+
+    def execute_query(query: str, params: Any = None, **kwargs: Any) -> pd.DataFrame:
+        queries.append(query)
+        # PRIMARY KEY (seq, tenant) on a table whose columns are (tenant, seq, ...)
+        return pd.DataFrame({'COLUMN_NAME': ['seq', 'tenant']})
+
+    monkeypatch.setattr(connection, 'execute_query', execute_query)
+
+    assert discover_key_columns(connection, 'events') == ['seq', 'tenant']
+    assert "CONSTRAINT_NAME = 'PRIMARY'" in queries[0]
+    assert 'KEY_COLUMN_USAGE' in queries[0]
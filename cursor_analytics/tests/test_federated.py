@@ -0,0 +1,30 @@
+from typing import Callable
+
+from cursor_analytics.db.federated import FederatedQuery
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+def test_federated_join_pushes_down_and_reports_bytes(
+    sqlite_connection_factory: Callable[..., SQLiteConnection]
+) -> None:
+    tenants = sqlite_connection_factory()
+    tenants.execute_query("CREATE TABLE clients (id INTEGER, name TEXT, active INTEGER)")
+    tenants.execute_query("INSERT INTO clients VALUES (1, 'a', 1), (2, 'b', 0), (3, 'c', 1)")
+
+    warehouse = sqlite_connection_factory()
+    warehouse.execute_query("CREATE TABLE revenue (client_id INTEGER, amount REAL)")
+    warehouse.execute_query("INSERT INTO revenue VALUES (1, 10.0), (1, 5.0), (2, 7.0), (3, 1.0)")
+
+    federated = FederatedQuery(batch_size=2)
+    federated.add_source('c', tenants, 'clients', columns=['id', 'name'], where='active = 1')
+    federated.add_source('r', warehouse, 'revenue')
+
+    results = federated.execute(
+        "SELECT c.name, SUM(r.amount) AS total FROM c JOIN r ON c.id = r.client_id "
+        "GROUP BY c.name ORDER BY c.name"
+    )
+
+    assert results['name'].tolist() == ['a', 'c']
+    assert results['total'].tolist() == [15.0, 1.0]
+    assert federated.rows_pulled == {'c': 2, 'r': 4}
+    assert federated.bytes_pulled['c'] > 0 and federated.bytes_pulled['r'] > 0
@@ -0,0 +1,63 @@
+import json
+import time
+from pathlib import Path
+
+from cursor_analytics.db.connection import DuckDBConnection
+from cursor_analytics.db.instrumentation import (
+    JsonLinesSink,
+    MemorySink,
+    PrometheusSink,
+    QueryTrace,
+    add_sink,
+    phase,
+    remove_sink,
+    trace_query
+)
+
+# Per-phase overhead that still allows leaving tracing on in production
+PHASE_OVERHEAD_BUDGET = 20e-6  # seconds
+
+
+def test_query_phases_are_recorded(tmp_path: Path) -> None:
+    memory = add_sink(MemorySink())
+    jsonl = add_sink(JsonLinesSink(str(tmp_path / 'traces.jsonl')))
+    prometheus = add_sink(PrometheusSink(str(tmp_path / 'metrics.prom')))
+    connection = DuckDBConnection()
+    try:
+        df = connection.execute_query("SELECT range AS id, 'x' AS label FROM range(5)")
+        connection.execute_query("SELECT * FROM missing_table")
+    finally:
+        for sink in (memory, jsonl, prometheus):
+            remove_sink(sink)
+        connection.disconnect()
+
+    assert df is not None and len(df) == 5
+    trace, failed = memory.traces()
+    assert {'queue', 'connect', 'execute', 'fetch', 'build'} <= set(trace.spans)
+    assert trace.rows == 5 and trace.columns == 2 and trace.bytes > 0
+    assert sum(trace.spans.values()) <= trace.total_seconds
+    assert failed.error and 'connect' not in failed.spans
+
+    lines = (tmp_path / 'traces.jsonl').read_text().splitlines()
+    assert [json.loads(line)['rows'] for line in lines] == [5, None]
+    metrics = (tmp_path / 'metrics.prom').read_text()
+    assert 'cursor_analytics_queries_total{backend="duckdb"} 2' in metrics
+    assert 'cursor_analytics_query_errors_total{backend="duckdb"} 1' in metrics
+    assert 'phase="execute"' in metrics
+
+
+def test_phase_overhead_is_within_budget() -> None:
+    iterations = 10000
+    sink = add_sink(MemorySink())
+    try:
+        with trace_query('duckdb', 'SELECT 1') as trace:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                with phase('fetch'):
+                    pass
+            elapsed = time.perf_counter() - start
+    finally:
+        remove_sink(sink)
+
+    assert isinstance(trace, QueryTrace) and trace.spans['fetch'] > 0
+    assert elapsed / iterations < PHASE_OVERHEAD_BUDGET
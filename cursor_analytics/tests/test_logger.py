@@ -0,0 +1,69 @@
+import sys
+import json
+import logging
+import logging.handlers
+from pathlib import Path
+
+from cursor_analytics.utils.logger import (
+    DebugSampler,
+    JsonFormatter,
+    configure_logging,
+    setup_logger,
+    shutdown_logging
+)
+
+
+def test_setup_is_idempotent_and_writes_off_thread(tmp_path: Path) -> None:
+    log_file = str(tmp_path / 'logs' / 'analytics.log')
+    try:
+        for _ in range(3):
+            logger = setup_logger('cursor_analytics.tests', log_file=log_file)
+        configure_logging(json_format=True)
+        queue_handlers = [
+            handler for handler in logging.getLogger().handlers
+            if isinstance(handler, logging.handlers.QueueHandler)
+        ]
+        assert len(queue_handlers) == 1 and not logger.handlers
+
+        logger.info("query done", extra={'query_fingerprint': 'abc', 'rows': 3})
+    finally:
+        shutdown_logging()
+
+    lines = Path(log_file).read_text().splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert record['message'] == 'query done'
+    assert record['query_fingerprint'] == 'abc' and record['rows'] == 3
+
+
+def test_setup_logger_leaves_configuration_to_the_application() -> None:
+    shutdown_logging()
+    root_handlers = list(logging.getLogger().handlers)
+
+    logger = setup_logger('cursor_analytics.tests.library')
+    import cursor_analytics.db.schema  # noqa: F401  (creates its logger at import)
+
+    assert logger is logging.getLogger('cursor_analytics.tests.library')
+    assert logging.getLogger().handlers == root_handlers
+
+
+def test_json_formatter_keeps_exceptions() -> None:
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        record = logging.getLogger('test').makeRecord(
+            'test', logging.ERROR, __file__, 1, 'failed %s', ('query',), sys.exc_info()
+        )
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload['message'] == 'failed query' and 'ValueError: boom' in payload['exception']
+
+
+def test_debug_records_are_sampled_per_call_site() -> None:
+    sampler = DebugSampler(rate=0.25)
+    debug = logging.LogRecord('db', logging.DEBUG, __file__, 10, 'fetch', None, None)
+    warning = logging.LogRecord('db', logging.WARNING, __file__, 20, 'slow', None, None)
+
+    kept = sum(sampler.filter(debug) for _ in range(100))
+
+    assert kept == 25 and sampler.dropped == 75
+    assert all(sampler.filter(warning) for _ in range(10))
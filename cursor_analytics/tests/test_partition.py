@@ -0,0 +1,44 @@
+from pathlib import Path
+import pyarrow.parquet as pq
+
+from cursor_analytics.db.connection import DuckDBConnection
+from cursor_analytics.db.partition import partition_bounds, read_partitioned
+
+
+def _connection(database: str = ':memory:') -> DuckDBConnection:
+    connection = DuckDBConnection(database=database)
+    connection.connect()
+    connection.execute_query(
+        "CREATE TABLE trades AS SELECT range AS id, "
+        "DATE '2024-01-01' + CAST(range % 90 AS INTEGER) AS day, "
+        "range * 1.5 AS amount FROM range(1000)"
+    )
+    connection.execute_query("INSERT INTO trades VALUES (NULL, NULL, 0.0)")
+    return connection
+
+
+def test_partition_bounds_numeric_and_date() -> None:
+    connection = _connection()
+
+    assert partition_bounds(connection, 'trades', 'id', 4) == [0, 250, 500, 750, 999]
+    day_bounds = partition_bounds(connection, 'trades', 'day', 3)
+    assert len(day_bounds) == 4 and str(day_bounds[0]) == '2024-01-01'
+
+
+def test_read_partitioned_concatenates_every_row_once() -> None:
+    connection = _connection()
+
+    table = read_partitioned(connection, 'trades', 'id', partitions=4, batch_size=100)
+
+    assert table.num_rows == 1001
+    assert sorted(v for v in table.column('id').to_pylist() if v is not None) == list(range(1000))
+
+
+def test_read_partitioned_writes_parquet_per_partition(tmp_path: Path) -> None:
+    connection = _connection(str(tmp_path / 'trades.duckdb'))
+
+    files = read_partitioned(connection, 'trades', 'day', partitions=3, columns=['id', 'day'],
+                             where="amount > 0", output_dir=str(tmp_path / 'out'))
+
+    assert len(files) == 3
+    assert sum(pq.read_metadata(path).num_rows for path in files) == 999
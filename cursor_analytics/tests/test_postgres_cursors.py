@@ -0,0 +1,130 @@
+import io
+from typing import Any, List, Optional
+
+from cursor_analytics.db.connection import PostgreSQLConnection
+
+
+class FakePostgresCursor:
+    def __init__(self, rows: List[tuple], name: Optional[str] = None):
+        self.name = name
+        self.rows = rows
+        self.itersize = 2000
+        self.description: Optional[List[tuple]] = None
+        self.fetch_sizes: List[int] = []
+        self.executed: List[str] = []
+
+    def execute(self, query: str, params: Any = None) -> None:
+        self.executed.append(query)
+        if self.name is None:
+            self.description = [('id',), ('name',)]
+
+    def fetchmany(self, size: int) -> List[tuple]:
+        self.fetch_sizes.append(size)
+        # Like psycopg2 named cursors, description is only known after a fetch
+        self.description = [('id',), ('name',)]
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def copy_expert(self, sql: str, buffer: io.BytesIO) -> None:
+        self.executed.append(sql)
+        buffer.write(b"id,name\n1,a\n2,b\n")
+
+    def mogrify(self, query: str, params: Any) -> bytes:
+        return query.replace('%s', str(params[0])).encode()
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'FakePostgresCursor':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+class FakePostgresConnection:
+    autocommit = False
+
+    def __init__(self, rows: List[tuple]):
+        self.rows = rows
+        self.cursors: List[FakePostgresCursor] = []
+        self.commits = 0
+
+    def cursor(self, name: Optional[str] = None) -> FakePostgresCursor:
+        cursor = FakePostgresCursor(list(self.rows), name=name)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+def _connection(rows: List[tuple]) -> PostgreSQLConnection:
+    connection = PostgreSQLConnection()
+    connection.connection = FakePostgresConnection(rows)
+    return connection
+
+
+def test_select_uses_named_cursor_and_max_rows() -> None:
+    connection = _connection([(i, str(i)) for i in range(10)])
+
+    df = connection.execute_query("SELECT id, name FROM t", max_rows=3, itersize=500)
+
+    named = [c for c in connection.connection.cursors if c.name is not None]
+    assert len(named) == 1 and named[0].itersize == 500
+    assert named[0].fetch_sizes == [3]
+    assert df is not None and df['id'].tolist() == [0, 1, 2]
+
+
+def test_named_cursor_fetches_max_rows_in_itersize_round_trips() -> None:
+    connection = _connection([(i, str(i)) for i in range(2000)])
+
+    df = connection.execute_query("SELECT id, name FROM t", max_rows=1200, itersize=500)
+
+    named = [c for c in connection.connection.cursors if c.name is not None]
+    assert named[0].fetch_sizes == [500, 500, 200]
+    assert df is not None and len(df) == 1200 and df['id'].iloc[-1] == 1199
+
+    # A result shorter than max_rows stops at the first short FETCH
+    connection = _connection([(i, str(i)) for i in range(700)])
+    df = connection.execute_query("SELECT id, name FROM t", max_rows=1000, itersize=500)
+    named = [c for c in connection.connection.cursors if c.name is not None]
+    assert named[0].fetch_sizes == [500, 500] and len(df) == 700
+
+
+def test_repeated_parameterized_select_keeps_the_named_cursor() -> None:
+    connection = _connection([(i, str(i)) for i in range(10)])
+
+    for _ in range(3):
+        df = connection.execute_query("SELECT id, name FROM t WHERE id > %s", (0,), max_rows=3)
+        assert df is not None and len(df) == 3
+
+    cursors = connection.connection.cursors
+    assert not any('PREPARE' in query or 'EXECUTE' in query
+                   for cursor in cursors for query in cursor.executed)
+    named = [c for c in cursors if c.name is not None]
+    assert len(named) == 3 and all(c.fetch_sizes == [3] for c in named)
+
+
+def test_with_statements_that_write_are_committed() -> None:
+    connection = _connection([(1, 'a')])
+
+    assert connection.execute_query("WITH x AS (SELECT 1) INSERT INTO t SELECT * FROM x") is None
+    assert connection.connection.commits == 1
+
+    df = connection.execute_query("WITH d AS (DELETE FROM t RETURNING *) SELECT * FROM d")
+    assert df is not None and len(df) == 1 and connection.connection.commits == 2
+    assert all(c.name is None for c in connection.connection.cursors)
+
+
+def test_copy_to_arrow_wraps_query_in_copy() -> None:
+    connection = _connection([])
+
+    table = connection.copy_to_arrow("SELECT id, name FROM t WHERE id > %s;", params=(0,))
+
+    assert table is not None and table.num_rows == 2
+    assert table.column_names == ['id', 'name']
+    copy_sql = connection.connection.cursors[-1].executed[-1]
+    assert copy_sql == (
+        "COPY (SELECT id, name FROM t WHERE id > 0) TO STDOUT WITH (FORMAT csv, HEADER true)"
+    )
@@ -0,0 +1,113 @@
+from typing import Any, List
+from unittest import mock
+
+import pandas as pd
+
+from cursor_analytics.analytics import execute_analysis
+from cursor_analytics.db.connection import DuckDBConnection, PostgreSQLConnection
+from cursor_analytics.db.explain import estimate_rows
+from cursor_analytics.db.preflight import preflight_query
+
+MYSQL_PLAN = {
+    'query_block': {
+        'nested_loop': [
+            {'table': {'table_name': 'customers', 'access_type': 'ALL',
+                       'rows_examined_per_scan': 5000, 'rows_produced_per_join': 5000}},
+            {'table': {'table_name': 'orders', 'access_type': 'ref',
+                       'rows_examined_per_scan': 12, 'rows_produced_per_join': 60000}}
+        ]
+    }
+}
+
+POSTGRES_PLAN = [{
+    'Plan': {
+        'Node Type': 'Aggregate', 'Plan Rows': 1,
+        'Plans': [{'Node Type': 'Seq Scan', 'Relation Name': 'orders', 'Plan Rows': 250000}]
+    }
+}]
+
+
+def _orders() -> DuckDBConnection:
+    connection = DuckDBConnection()
+    connection.execute_query(
+        "CREATE TABLE orders AS SELECT range AS id, range % 10 AS status FROM range(50000)"
+    )
+    return connection
+
+
+def test_estimates_from_plans() -> None:
+    assert estimate_rows('mysql', MYSQL_PLAN) == {
+        'rows_scanned': 5012, 'rows_returned': 60000, 'bytes_scanned': None
+    }
+    assert estimate_rows('postgres', POSTGRES_PLAN) == {
+        'rows_scanned': 250000, 'rows_returned': 1, 'bytes_scanned': None
+    }
+    assert estimate_rows('snowflake', {'GlobalStats': {'bytesAssigned': 1024}}) == {
+        'rows_scanned': None, 'rows_returned': None, 'bytes_scanned': 1024
+    }
+
+
+def test_postgres_seq_scans_count_the_whole_table() -> None:
+    # A selective filter makes the Seq Scan's Plan Rows tiny on a huge table
+    plan = [{'Plan': {'Node Type': 'Seq Scan', 'Relation Name': 'events', 'Plan Rows': 5}}]
+    assert estimate_rows('postgres', plan, {'events': 1000000000})['rows_scanned'] == 1000000000
+
+    analyzed = [{'Plan': {'Node Type': 'Seq Scan', 'Relation Name': 'events', 'Plan Rows': 5,
+                          'Actual Rows': 3, 'Rows Removed by Filter': 99997}}]
+    assert estimate_rows('postgres', analyzed)['rows_scanned'] == 100000
+
+    connection = PostgreSQLConnection()
+    queries: List[Any] = []
+
+    def execute_query(query: str, params: Any = None, **kwargs: Any) -> pd.DataFrame:
+        queries.append(params)
+        return pd.DataFrame({'relation': ['events'], 'reltuples': [1e9]})
+
+    with mock.patch.object(connection, 'explain', return_value=plan), \
+            mock.patch.object(connection, 'execute_query', side_effect=execute_query):
+        result = preflight_query(connection, "SELECT * FROM events WHERE id = 7", max_scan=10000)
+
+    assert queries == [(['events'],)]
+    assert result is not None and not result.allowed
+    assert result.estimate['rows_scanned'] == 1000000000
+
+
+def test_preflight_flags_large_scans() -> None:
+    connection = _orders()
+    result = preflight_query(connection, "SELECT * FROM orders", max_scan=10000)
+
+    assert result.estimate['rows_scanned'] == 50000 and not result.allowed
+    assert 'truncated to 1,000' in result.message()
+    assert any('USING SAMPLE' in suggestion for suggestion in result.suggestions)
+    assert any('memory.main.orders' in suggestion for suggestion in result.suggestions)
+    assert preflight_query(connection, "SELECT * FROM orders", max_scan=100000).allowed
+    assert preflight_query(connection, "SHOW TABLES", max_scan=1) is None
+
+
+def test_queries_over_the_limit_are_refused_unless_confirmed() -> None:
+    connection = _orders()
+    query = "SELECT status, COUNT(*) AS orders FROM orders GROUP BY status"
+    asked: List[str] = []
+
+    assert execute_analysis(connection, query, max_scan=1000) is None
+    assert execute_analysis(connection, query, max_scan=1000,
+                            confirm=lambda message: asked.append(message) or False) is None
+    confirmed = execute_analysis(connection, query, max_scan=1000,
+                                 confirm=lambda message: asked.append(message) or True)
+
+    assert len(asked) == 2 and '~50,000 rows' in asked[0]
+    assert len(confirmed) == 10
+    assert len(execute_analysis(connection, query, max_scan=100000)) == 10
+
+
+def test_preflight_explains_on_the_idle_connection() -> None:
+    connection = _orders()
+
+    with mock.patch.object(connection, 'clone', wraps=connection.clone) as clone:
+        assert preflight_query(connection, "SELECT * FROM orders", max_scan=10000)
+        assert not clone.called
+
+        # A statement in progress keeps the EXPLAIN on a side connection
+        connection._running = (0.0, 3000)
+        assert connection.explain("SELECT * FROM orders", reuse_connection=True)
+        assert clone.called
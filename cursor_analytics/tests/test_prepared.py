@@ -0,0 +1,140 @@
+from typing import Any, List, Optional
+
+from cursor_analytics.db.connection import MySQLConnection, PostgreSQLConnection
+from cursor_analytics.db.prepared import PreparedStatementCache
+
+
+class FakeCursor:
+    def __init__(self, log: List[str], prepared: bool = False):
+        self.log = log
+        self.prepared = prepared
+        self.description: Optional[List[tuple]] = None
+        self.rows: List[tuple] = []
+        self.closed = False
+
+    def execute(self, query: str, params: Any = None) -> None:
+        self.log.append(f"{'prepared' if self.prepared else 'plain'}: {query}")
+        if query.lstrip().upper().startswith(('SELECT', 'EXECUTE')):
+            self.description = [('id',), ('category',)]
+            self.rows = [(1, 'books')]
+
+    def fetchall(self) -> List[tuple]:
+        return self.rows
+
+    def fetchmany(self, size: int) -> List[tuple]:
+        return self.rows[:size]
+
+    def close(self) -> None:
+        self.closed = True
+
+    def __enter__(self) -> 'FakeCursor':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+class FakeDriverConnection:
+    autocommit = False
+
+    def __init__(self) -> None:
+        self.log: List[str] = []
+        self.prepared_cursors: List[FakeCursor] = []
+
+    def cursor(
+        self, name: Optional[str] = None, prepared: bool = False, **kwargs: Any
+    ) -> FakeCursor:
+        cursor = FakeCursor(self.log, prepared=prepared)
+        if prepared:
+            self.prepared_cursors.append(cursor)
+        return cursor
+
+    def commit(self) -> None:
+        pass
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    released: List[str] = []
+    cache = PreparedStatementCache(max_size=2, on_evict=released.append)
+
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    assert cache.get('a') == 'A'
+    cache.put('c', 'C')
+
+    assert released == ['B'] and cache.get('b') is None
+    assert cache.stats()['hit_rate'] == 0.5
+
+
+def test_mysql_prepares_repeated_statements() -> None:
+    connection = MySQLConnection()
+    connection.connection = FakeDriverConnection()
+    query = "SELECT id, category FROM products WHERE category = %(category)s"
+
+    for _ in range(3):
+        df = connection.execute_query(query, {'category': 'books'})
+        assert df is not None and df['category'].tolist() == ['books']
+
+    driver = connection.connection
+    assert len(driver.prepared_cursors) == 1
+    prepared_runs = [entry for entry in driver.log if entry.startswith('prepared')]
+    assert prepared_runs == [
+        "prepared: SELECT id, category FROM products WHERE category = ?"
+    ] * 2
+    assert connection.statement_cache.stats()['hits'] == 1
+
+    connection.statement_cache.invalidate()
+    assert len(connection.statement_cache) == 0
+
+
+def test_postgres_uses_prepare_and_execute() -> None:
+    connection = PostgreSQLConnection()
+    connection.connection = FakeDriverConnection()
+    connection.statement_cache.max_size = 1
+    query = "UPDATE products SET stock = stock - 1 WHERE category = %s"
+
+    for _ in range(2):
+        connection.execute_query(query, ('books',))
+    connection.execute_query("DELETE FROM products WHERE id = %s", (1,))
+    connection.execute_query("DELETE FROM products WHERE id = %s", (1,))
+
+    log = connection.connection.log
+    prepares = [entry for entry in log if 'PREPARE ' in entry]
+    assert len(prepares) == 2 and prepares[0].endswith("WHERE category = $1")
+    assert sum('EXECUTE ca_stmt_' in entry for entry in log) == 2
+    assert any(entry.startswith('plain: DEALLOCATE ca_stmt_') for entry in log)
+
+
+class FailingExecuteConnection(FakeDriverConnection):
+    # EXECUTE fails, e.g. when a schema change invalidated the prepared plan
+    def cursor(
+        self, name: Optional[str] = None, prepared: bool = False, **kwargs: Any
+    ) -> FakeCursor:
+        cursor = super().cursor(name, prepared, **kwargs)
+        execute = cursor.execute
+
+        def failing_execute(query: str, params: Any = None) -> None:
+            execute(query, params)
+            if query.startswith('EXECUTE'):
+                raise RuntimeError("cached plan must not change result type")
+
+        cursor.execute = failing_execute
+        return cursor
+
+    def rollback(self) -> None:
+        self.log.append('rollback')
+
+
+def test_postgres_rolls_back_before_deallocating_a_failed_statement() -> None:
+    connection = PostgreSQLConnection()
+    connection.connection = FailingExecuteConnection()
+    query = "UPDATE products SET stock = stock - 1 WHERE category = %s"
+
+    connection.execute_query(query, ('books',))
+    assert 'rollback' not in connection.connection.log
+    connection.execute_query(query, ('books',))
+
+    log = connection.connection.log
+    deallocate = next(i for i, entry in enumerate(log) if 'DEALLOCATE' in entry)
+    assert log.index('rollback') < deallocate
+    assert len(connection.statement_cache) == 0
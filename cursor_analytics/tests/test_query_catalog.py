@@ -0,0 +1,84 @@
+import os
+import datetime
+from pathlib import Path
+import pytest
+
+from cursor_analytics.queries.catalog import QueryCatalog
+
+
+def _write(path: Path, text: str, mtime: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_catalog_compiles_header_and_templates(tmp_path: Path) -> None:
+    _write(tmp_path / 'reports' / 'daily_sales.sql', (
+        "-- Daily sales per market\n"
+        "-- @param market str us\n"
+        "-- @param since date\n"
+        "-- @ttl 3600\n"
+        "-- @backend mysql\n"
+        "-- @depends markets, reports/base\n"
+        "SELECT * FROM sales WHERE market = {{ market }} AND day >= {{since}}\n"
+    ), 1000)
+    catalog = QueryCatalog(tmp_path)
+
+    query = catalog.get('daily_sales')
+
+    assert catalog.names() == ['reports/daily_sales']
+    assert query is not None and query.name == 'reports/daily_sales'
+    assert query.ttl == 3600 and query.backend == 'mysql'
+    assert query.depends == ['markets', 'reports/base']
+    sql, params = query.bind({'since': '2024-01-31'})
+    assert sql == "SELECT * FROM sales WHERE market = %(market)s AND day >= %(since)s"
+    assert params == {'market': 'us', 'since': datetime.date(2024, 1, 31)}
+    with pytest.raises(ValueError):
+        query.bind({})
+
+
+def test_catalog_recompiles_only_when_mtime_changes(tmp_path: Path) -> None:
+    path = tmp_path / 'totals.sql'
+    _write(path, "SELECT 1", 1000)
+    catalog = QueryCatalog(tmp_path)
+
+    first = catalog.get('totals.sql')
+    assert catalog.get('totals') is first
+
+    _write(path, "SELECT 2", 2000)
+    assert catalog.load('totals') == "SELECT 2"
+
+    _write(tmp_path / 'new.sql', "SELECT 3", 1000)
+    assert catalog.load('new') == "SELECT 3"
+
+
+def test_load_returns_compiled_sql(tmp_path: Path) -> None:
+    _write(tmp_path / 'plain.sql', "-- @ttl 60\n-- Daily totals\nSELECT 1;\nSELECT 2;\n", 1000)
+    _write(tmp_path / 'templated.sql', "-- @param market str us\nSELECT {{ market }}", 1000)
+    catalog = QueryCatalog(tmp_path)
+
+    assert catalog.load('plain') == "SELECT 1;\nSELECT 2;"
+    with pytest.raises(ValueError, match='market'):
+        catalog.load('templated')
+
+
+def test_parameterized_query_escapes_literal_percent(tmp_path: Path) -> None:
+    _write(tmp_path / 'names.sql', "SELECT * FROM t WHERE name LIKE 'a%' AND id > {{ n }}", 1000)
+    _write(tmp_path / 'plain.sql', "SELECT * FROM t WHERE name LIKE 'a%'", 1000)
+    catalog = QueryCatalog(tmp_path)
+
+    sql, params = catalog.get('names').bind({'n': '3'})
+
+    assert sql == "SELECT * FROM t WHERE name LIKE 'a%%' AND id > %(n)s"
+    assert sql % params == "SELECT * FROM t WHERE name LIKE 'a%' AND id > 3"
+    assert catalog.load('plain') == "SELECT * FROM t WHERE name LIKE 'a%'"
+
+
+def test_names_lists_files_added_after_the_scan(tmp_path: Path) -> None:
+    _write(tmp_path / 'first.sql', "SELECT 1", 1000)
+    catalog = QueryCatalog(tmp_path)
+    assert catalog.names() == ['first']
+
+    _write(tmp_path / 'reports' / 'second.sql', "SELECT 2", 1000)
+
+    assert sorted(catalog.names()) == ['first', 'reports/second']
@@ -0,0 +1,122 @@
+import time
+import asyncio
+import threading
+from typing import Any, List, Optional, Union
+
+import pandas as pd
+import pytest
+
+from cursor_analytics.db.singleflight import SingleFlight
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+class SlowConnection(SQLiteConnection):
+    def __init__(self) -> None:
+        super().__init__()
+        self.executions = 0
+
+    def _execute_query(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        timeout: int = 3000,
+        max_rows: int = 1000,
+        **kwargs: Any
+    ) -> Optional[pd.DataFrame]:
+        self.executions += 1
+        time.sleep(0.2)
+        return super()._execute_query(query, params, timeout, max_rows)
+
+
+def test_concurrent_identical_reads_share_one_execution() -> None:
+    connection = SlowConnection()
+    results: List[pd.DataFrame] = []
+
+    def run() -> None:
+        results.append(connection.execute_query("SELECT 1 AS one,  2 AS two"))
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert connection.executions == 1
+    assert len({id(df) for df in results}) == 4
+    # Each caller's view is independent of the others
+    results[0].loc[0, 'one'] = 100
+    assert results[1].loc[0, 'one'] == 1
+
+
+def test_writes_and_different_params_are_not_coalesced() -> None:
+    flight = SingleFlight()
+    connection = SQLiteConnection()
+    assert connection._flight_key("CREATE TABLE t (id INTEGER)", None, 3000, 10, {}) is None
+    assert connection._flight_key("SELECT ?", (1,), 3000, 10, {}) != connection._flight_key(
+        "SELECT ?", (2,), 3000, 10, {}
+    )
+    # A short-timeout caller must not wait on a long-timeout execution
+    assert connection._flight_key("SELECT 1", None, 1000, 10, {}) != connection._flight_key(
+        "SELECT 1", None, 60000, 10, {}
+    )
+    assert flight.do(None, lambda: 'ran') == 'ran' and flight.stats()['executions'] == 0
+
+
+def test_unshared_flight_returns_the_result_untouched(monkeypatch: pytest.MonkeyPatch) -> None:
+    flight = SingleFlight()
+    result = ['rows']
+
+    assert flight.do('key', lambda: result, share=list) is result
+
+    connection = SQLiteConnection()
+    frame = pd.DataFrame({'one': [1]})
+    monkeypatch.setattr(connection, '_admitted_query', lambda *args, **kwargs: frame)
+    assert connection.execute_query("SELECT 1 AS one") is frame
+
+
+def test_async_callers_share_one_execution() -> None:
+    connection = SlowConnection()
+
+    async def run_all() -> List[Optional[pd.DataFrame]]:
+        return await asyncio.gather(*[
+            connection.execute_query_async("SELECT 1 AS one") for _ in range(3)
+        ])
+
+    results = asyncio.run(run_all())
+
+    assert connection.executions == 1
+    assert all(df is not None and df['one'].tolist() == [1] for df in results)
+
+
+def test_cancelled_async_follower_does_not_cancel_the_flight() -> None:
+    flight = SingleFlight()
+    started = threading.Event()
+    outcome: List[Any] = []
+
+    def slow() -> str:
+        started.set()
+        time.sleep(0.3)
+        return 'done'
+
+    def lead() -> None:
+        try:
+            outcome.append(flight.do('key', slow))
+        except BaseException as e:
+            outcome.append(e)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    started.wait(5)
+
+    async def follow() -> None:
+        await asyncio.wait_for(flight.do_async('key', slow), 0.1)
+
+    try:
+        asyncio.run(follow())
+    except asyncio.TimeoutError:
+        pass
+    else:
+        raise AssertionError("the follower should have timed out")
+    leader.join(5)
+
+    assert outcome == ['done'] and flight.stats()['executions'] == 1
@@ -0,0 +1,99 @@
+import os
+from pathlib import Path
+
+from cursor_analytics.db.connection import DuckDBConnection
+from cursor_analytics.db.explain import plan_issues
+from cursor_analytics.db.slowlog import (
+    SlowQueryLog,
+    analyze_slow_log,
+    read_slow_log,
+    set_slow_query_log
+)
+
+MYSQL_PLAN = {
+    'query_block': {
+        'select_id': 1,
+        'ordering_operation': {
+            'using_filesort': True,
+            'grouping_operation': {
+                'using_temporary_table': True,
+                'table': {
+                    'table_name': 'orders',
+                    'access_type': 'ALL',
+                    'rows_examined_per_scan': 1000
+                }
+            }
+        }
+    }
+}
+
+POSTGRES_PLAN = [{
+    'Plan': {
+        'Node Type': 'Sort',
+        'Plans': [{'Node Type': 'Seq Scan', 'Relation Name': 'orders', 'Plan Rows': 1000}]
+    }
+}]
+
+SNOWFLAKE_PLAN = {
+    'GlobalStats': {'partitionsTotal': 12, 'partitionsAssigned': 12},
+    'Operations': [[
+        {'id': 0, 'operation': 'Result'},
+        {'id': 1, 'operation': 'Sort', 'parentOperators': [0]},
+        {'id': 2, 'operation': 'TableScan', 'objects': ['DB.PUBLIC.ORDERS'],
+         'partitionsAssigned': 12, 'partitionsTotal': 12, 'parentOperators': [1]}
+    ]]
+}
+
+
+def test_plan_issues_per_backend() -> None:
+    expected = [
+        {'issue': 'filesort', 'table': None},
+        {'issue': 'temporary_table', 'table': None},
+        {'issue': 'full_scan', 'table': 'orders'}
+    ]
+    assert sorted(plan_issues('mysql', MYSQL_PLAN), key=str) == sorted(expected, key=str)
+    assert plan_issues('postgres', POSTGRES_PLAN) == [
+        {'issue': 'filesort', 'table': None}, {'issue': 'full_scan', 'table': 'orders'}
+    ]
+    assert plan_issues('snowflake', SNOWFLAKE_PLAN) == [
+        {'issue': 'filesort', 'table': None}, {'issue': 'full_scan', 'table': 'DB.PUBLIC.ORDERS'}
+    ]
+    assert plan_issues('generic', MYSQL_PLAN) == []
+
+
+def test_slow_queries_are_captured_with_plans(tmp_path: Path) -> None:
+    slow_log = SlowQueryLog(str(tmp_path / 'slow.jsonl'), threshold=0.0)
+    previous = set_slow_query_log(slow_log)
+    connection = DuckDBConnection()
+    try:
+        connection.execute_query("CREATE TABLE orders AS SELECT range AS id FROM range(100)")
+        for limit in (10, 20):
+            connection.execute_query(f"SELECT * FROM orders ORDER BY id DESC LIMIT {limit}")
+        slow_log.flush()
+    finally:
+        set_slow_query_log(previous)
+
+    entries = [
+        entry for entry in read_slow_log(slow_log.path) if entry['query'].startswith('SELECT')
+    ]
+    # The second execution of the same fingerprint is logged without a new EXPLAIN
+    assert [entry['plan'] is not None for entry in entries] == [True, False]
+
+    summary = next(summary for summary in analyze_slow_log(slow_log.path)
+                   if summary['fingerprint'] == entries[0]['fingerprint'])
+    assert summary['captures'] == 2 and summary['backend'] == 'duckdb'
+    assert {'issue': 'full_scan', 'table': 'memory.main.orders'} in summary['issues']
+
+
+def test_fast_queries_are_skipped_and_log_rotates(tmp_path: Path) -> None:
+    slow_log = SlowQueryLog(str(tmp_path / 'slow.jsonl'), threshold=1.0, max_bytes=400,
+                            backup_count=2)
+    connection = DuckDBConnection()
+    assert not slow_log.observe(connection, "SELECT 1", None, 0.5)
+
+    for seconds in range(1, 11):
+        slow_log.capture(connection, "SHOW TABLES", None, float(seconds))
+
+    assert sorted(os.listdir(tmp_path)) == ['slow.jsonl', 'slow.jsonl.1', 'slow.jsonl.2']
+    seconds = [entry['seconds'] for entry in read_slow_log(slow_log.path, backup_count=2)]
+    assert seconds == sorted(seconds) and seconds[-1] == 10.0 and len(seconds) < 10
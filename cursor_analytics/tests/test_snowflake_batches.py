@@ -0,0 +1,93 @@
+import threading
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+from cursor_analytics.db.connection import SnowflakeConnection
+
+
+class FakeResultBatch:
+    def __init__(self, start: int, rowcount: int, downloads: List[int]):
+        self.start = start
+        self.rowcount = rowcount
+        self.downloads = downloads
+
+    def to_pandas(self) -> pd.DataFrame:
+        self.downloads.append(threading.get_ident())
+        values = list(range(self.start, self.start + self.rowcount))
+        return pd.DataFrame({'ID': values})
+
+
+class FakeSnowflakeCursor:
+    def __init__(self, connection: 'FakeSnowflakeConnector'):
+        self.connection = connection
+        self.description = [('ID',)]
+        self.sfqid: Optional[str] = None
+
+    def execute(self, query: str, params: Any = None) -> None:
+        pass
+
+    def execute_async(self, query: str, params: Any = None) -> None:
+        self.sfqid = f"qid-{len(self.connection.statuses)}"
+        self.connection.statuses[self.sfqid] = ['RUNNING', 'SUCCESS']
+
+    def get_results_from_sfqid(self, query_id: str) -> None:
+        self.sfqid = query_id
+
+    def get_result_batches(self) -> List[FakeResultBatch]:
+        return [FakeResultBatch(i * 10, 10, self.connection.downloads) for i in range(5)]
+
+    def fetchmany(self, size: int) -> List[tuple]:
+        raise AssertionError("Arrow batches should be used instead of fetchmany")
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'FakeSnowflakeCursor':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+class FakeSnowflakeConnector:
+    def __init__(self) -> None:
+        self.downloads: List[int] = []
+        self.statuses: Dict[str, List[str]] = {}
+
+    def cursor(self) -> FakeSnowflakeCursor:
+        return FakeSnowflakeCursor(self)
+
+    def get_query_status_throw_if_error(self, query_id: str) -> str:
+        statuses = self.statuses[query_id]
+        return statuses.pop(0) if len(statuses) > 1 else statuses[0]
+
+    def is_still_running(self, status: str) -> bool:
+        return status == 'RUNNING'
+
+
+def _connection() -> SnowflakeConnection:
+    connection = SnowflakeConnection()
+    connection.connection = FakeSnowflakeConnector()
+    return connection
+
+
+def test_execute_query_downloads_only_needed_batches() -> None:
+    connection = _connection()
+
+    df = connection.execute_query("SELECT id FROM t", max_rows=25)
+
+    assert df is not None and df['ID'].tolist() == list(range(25))
+    assert len(connection.connection.downloads) == 3
+
+
+def test_run_async_queries_polls_until_complete() -> None:
+    connection = _connection()
+
+    results = connection.run_async_queries(["SELECT 1", "SELECT 2"], poll_interval=0, max_rows=None)
+
+    assert len(results) == 2
+    assert all(result is not None and len(result) == 50 for result in results)
+    assert all(
+        not statuses or statuses == ['SUCCESS']
+        for statuses in connection.connection.statuses.values()
+    )
@@ -0,0 +1,103 @@
+from cursor_analytics.db.sql_parser import (
+    split_statements, strip_comments, returns_rows, is_compound, preprocess, fingerprint,
+    convert_placeholders, READ, WRITE
+)
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+def test_split_statements_ignores_quoted_and_commented_semicolons() -> None:
+    script = """
+    -- setup; not a statement
+    CREATE TEMPORARY TABLE t AS SELECT 'a;b' AS v;  /* block; comment */
+    INSERT INTO t VALUES ("x;y"), ('it''s;');
+    # trailing comment only;
+    SELECT $body$ ; $body$ AS d;
+    """
+    statements = split_statements(script)
+    assert len(statements) == 3
+    assert strip_comments(statements[1]) == """INSERT INTO t VALUES ("x;y"), ('it''s;')"""
+    assert returns_rows(statements[2])
+    assert not returns_rows(statements[0])
+
+
+def test_split_statements_honours_delimiter_directive() -> None:
+    script = (
+        "DELIMITER //\n"
+        "CREATE PROCEDURE p() BEGIN SELECT 1; SELECT 2; END //\n"
+        "DELIMITER ;\n"
+        "CALL p();\n"
+    )
+    statements = split_statements(script)
+    assert statements == ["CREATE PROCEDURE p() BEGIN SELECT 1; SELECT 2; END", "CALL p()"]
+    assert is_compound(statements[0]) and not is_compound(statements[1])
+
+
+def test_hash_comments_and_backslash_escapes_follow_the_dialect() -> None:
+    json_path = "SELECT data #>> '{a,b}' FROM t; SELECT 2"
+    assert len(split_statements(json_path, 'postgres')) == 2
+    assert len(split_statements(json_path, 'mysql')) == 1
+
+    windows_path = "SELECT 'C:\\' AS p; SELECT 2"
+    assert split_statements(windows_path, 'duckdb') == ["SELECT 'C:\\' AS p", "SELECT 2"]
+    assert len(split_statements(windows_path, 'postgres')) == 2
+    assert len(split_statements(windows_path, 'mysql')) == 1
+    # PostgreSQL escape strings still honour backslashes
+    assert len(split_statements("SELECT E'it\\'s; ok'; SELECT 2", 'postgres')) == 2
+    assert preprocess(json_path, 'postgres').is_multi
+
+
+def test_returns_rows_skips_comments_and_parentheses() -> None:
+    assert returns_rows("/* hint */ -- note\n(SELECT 1) UNION (SELECT 2)")
+    assert returns_rows("  with x as (select 1) select * from x")
+    assert not returns_rows("-- select\nUPDATE t SET a = 1")
+
+
+def test_with_statements_take_the_kind_of_their_main_statement() -> None:
+    write = preprocess("WITH x AS (SELECT (1)) INSERT INTO t SELECT * FROM x")
+    assert write.kind == WRITE and not write.returns_rows
+    read = preprocess(
+        "WITH RECURSIVE r (n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM r) SELECT n FROM r"
+    )
+    assert read.kind == READ and read.returns_rows
+    # PostgreSQL data-modifying CTEs return rows but still write
+    returning = preprocess("WITH d AS (DELETE FROM t RETURNING *) SELECT * FROM d", 'postgres')
+    assert returning.kind == WRITE and returning.returns_rows
+
+    connection = SQLiteConnection()
+    assert connection._flight_key(
+        "WITH x AS (SELECT 1) DELETE FROM t WHERE id IN (SELECT * FROM x)", None, 3000, 10, {}
+    ) is None
+
+
+def test_execute_script_returns_each_result_set(sqlite_connection: SQLiteConnection) -> None:
+    results = sqlite_connection.execute_script(
+        "CREATE TABLE t (v INTEGER); INSERT INTO t VALUES (1), (2);"
+        "SELECT COUNT(*) AS n FROM t; SELECT v FROM t WHERE v > 1;"
+    )
+    assert results is not None and len(results) == 2
+    assert results[0]['n'].item() == 2
+    assert results[1]['v'].tolist() == [2]
+
+
+def test_preprocess_classifies_and_fingerprints() -> None:
+    info = preprocess("/* report */ -- daily\n(SELECT a FROM t WHERE b = %(b)s AND c IN (1, 2))")
+
+    assert info.keyword == 'select' and info.kind == READ and info.returns_rows
+    assert info.param_style == 'pyformat' and not info.is_multi
+    assert info.normalized == "(SELECT a FROM t WHERE b = %(b)s AND c IN (1, 2))"
+    assert fingerprint("select a from t where b = %(x)s and c in (7)") != info.fingerprint
+    assert fingerprint("SELECT * FROM t WHERE id IN (%s, %s)") == fingerprint(
+        "select *  from t where id in (%s, %s, %s)"
+    )
+    assert preprocess("-- select\nUPDATE t SET a = 1; SELECT 1").is_multi
+    assert preprocess("SELECT x::int FROM t WHERE a = :a").param_style == 'named'
+
+
+def test_convert_placeholders_to_positional_styles() -> None:
+    query = "SELECT * FROM t WHERE a = %(a)s AND b LIKE 'x%%' AND c = %(a)s"
+
+    assert convert_placeholders(query, {'a': 1}, 'numeric') == (
+        "SELECT * FROM t WHERE a = $1 AND b LIKE 'x%' AND c = $2", [1, 1]
+    )
+    assert convert_placeholders("SELECT %s, %s", (1, 2)) == ("SELECT ?, ?", [1, 2])
+    assert convert_placeholders("SELECT $2, $1", (1, 2), 'format') == ("SELECT %s, %s", [2, 1])
@@ -0,0 +1,62 @@
+import sys
+import time
+import subprocess
+from pathlib import Path
+from typing import List
+
+# Import-time budgets in seconds. They are generous so the test only fails when a
+# heavy dependency (pandas, a database driver) creeps back into the startup path.
+PACKAGE_IMPORT_BUDGET = 0.3
+CLI_LIST_BUDGET = 1.0
+
+HEAVY_MODULES = [
+    'pandas', 'numpy', 'pyarrow', 'duckdb', 'mysql', 'psycopg2', 'snowflake', 'dotenv'
+]
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _imported_heavy_modules(statement: str) -> List[str]:
+    code = (
+        f"import sys; {statement}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=REPO_ROOT
+    ).stdout.strip()
+    return [module for module in output.split(',') if module]
+
+
+def _cumulative_import_seconds(module: str) -> float:
+    # -X importtime reports self and cumulative microseconds per imported module
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        capture_output=True, text=True, check=True, cwd=REPO_ROOT
+    ).stderr
+    for line in stderr.splitlines():
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1e6
+    raise AssertionError(f"{module} not found in import timings")
+
+
+def test_package_import_is_lazy() -> None:
+    assert _imported_heavy_modules('import cursor_analytics') == []
+    assert _imported_heavy_modules('import cursor_analytics.analytics') == []
+    assert _imported_heavy_modules(
+        'from cursor_analytics.db import query_priority; import cursor_analytics.db.sql_parser'
+    ) == []
+    assert _imported_heavy_modules('import cursor_analytics.config.settings') == []
+
+
+def test_import_time_budget() -> None:
+    assert _cumulative_import_seconds('cursor_analytics') < PACKAGE_IMPORT_BUDGET
+    assert _cumulative_import_seconds('cursor_analytics.analytics') < PACKAGE_IMPORT_BUDGET
+
+
+def test_cli_list_startup_budget() -> None:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-m', 'cursor_analytics.analytics', '--list'],
+        capture_output=True, check=True, cwd=REPO_ROOT
+    )
+    assert time.perf_counter() - start < CLI_LIST_BUDGET
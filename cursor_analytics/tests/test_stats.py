@@ -0,0 +1,61 @@
+import random
+from pathlib import Path
+
+from cursor_analytics.db.stats import (
+    QuantileSketch,
+    StatsRegistry,
+    get_stats_registry,
+    load_stats
+)
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+def test_sketch_quantiles_have_bounded_relative_error() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-3, 1.5) for _ in range(20000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    values.sort()
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) / exact < 0.02
+
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+    restored.merge(sketch)
+    assert restored.count == 40000 and restored.quantile(0.5) == sketch.quantile(0.5)
+
+
+def test_registry_groups_by_fingerprint_and_stays_bounded() -> None:
+    registry = StatsRegistry(max_entries=20)
+    for customer in range(5):
+        registry.record('mysql', f"SELECT * FROM orders WHERE customer_id = {customer}", 0.1, 3)
+    registry.record('mysql', "SELECT * FROM orders WHERE customer_id = 9", 0.5, error=True)
+    for table in range(40):
+        registry.record('postgres', f"SELECT * FROM table_{table}", 0.01)
+
+    top = registry.top(1)[0]
+    assert top['calls'] == 6 and top['errors'] == 1 and top['rows'] == 15
+    assert top['max_ms'] == 500.0 and 'customer_id' in top['query']
+    assert len(registry) <= 20 and registry.evictions > 0
+
+
+def test_stats_file_merges_runs(tmp_path: Path) -> None:
+    path = str(tmp_path / 'query_stats.json')
+    for _ in range(2):
+        registry = StatsRegistry()
+        registry.record('duckdb', "SELECT 1", 0.2, 1)
+        registry.save(path)
+
+    assert load_stats(path).top()[0]['calls'] == 2
+
+
+def test_execute_query_is_recorded(sqlite_connection: SQLiteConnection) -> None:
+    registry = get_stats_registry()
+    registry.clear()
+    for value in range(3):
+        sqlite_connection.execute_query(f"SELECT {value} AS value")
+
+    entry = registry.top()[0]
+    assert entry['calls'] == 3 and entry['backends'] == 'sqlite' and entry['rows'] == 3
@@ -0,0 +1,77 @@
+from typing import Any, List, Optional, Union
+import pandas as pd
+
+from cursor_analytics.db.sweep import execute_many_params
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+class RecordingConnection(SQLiteConnection):
+    def __init__(self) -> None:
+        super().__init__()
+        self.queries: List[str] = []
+
+    def execute_query(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        timeout: int = 3000,
+        max_rows: int = 1000
+    ) -> Optional[pd.DataFrame]:
+        self.queries.append(query)
+        return super().execute_query(query, params, timeout, max_rows)
+
+
+def _connection() -> RecordingConnection:
+    connection = RecordingConnection()
+    connection.connect()
+    connection.execute_query("CREATE TABLE sales (market TEXT, amount INTEGER)")
+    connection.connection.executemany(
+        "INSERT INTO sales VALUES (?, ?)", [('us', 1), ('us', 2), ('uk', 3), ('de', 4)]
+    )
+    connection.queries.clear()
+    return connection
+
+
+def test_sweep_collapses_into_one_union_query() -> None:
+    connection = _connection()
+    param_sets: List[Any] = [('us',), ('uk',), ('fr',)]
+
+    result = execute_many_params(
+        connection, "SELECT SUM(amount) AS total FROM sales WHERE market = ?", param_sets
+    )
+
+    assert len(connection.queries) == 1 and connection.queries[0].count('UNION ALL') == 2
+    totals = result.set_index('param_set')['total']
+    assert totals.loc[[0, 1]].tolist() == [3, 3] and pd.isna(totals.loc[2])
+
+
+def test_sweep_pipeline_adds_named_parameter_columns() -> None:
+    connection = _connection()
+    param_sets: List[Any] = [{'market': 'us', 'minimum': 2}, {'market': 'de', 'minimum': 0}]
+
+    result = execute_many_params(
+        connection,
+        "SELECT amount FROM sales WHERE market = :market AND amount >= :minimum",
+        param_sets
+    )
+
+    # SQLite's :name placeholders cannot be renamed per UNION branch, so even 'auto'
+    # pipelines the sweep
+    assert len(connection.queries) == 2
+    assert result[['param_set', 'amount', 'market', 'minimum']].values.tolist() == [
+        [0, 2, 'us', 2], [1, 4, 'de', 0]
+    ]
+
+
+def test_union_sweep_limits_rows_per_parameter_set() -> None:
+    connection = _connection()
+    param_sets: List[Any] = [('us',), ('uk',)]
+
+    result = execute_many_params(
+        connection, "SELECT amount FROM sales WHERE market = ?", param_sets,
+        strategy='union', max_rows=1
+    )
+
+    # 'us' matches two rows; the second must not push 'uk' out of the shared result cap
+    assert len(connection.queries) == 1
+    assert result.groupby('param_set').size().to_dict() == {0: 1, 1: 1}
@@ -0,0 +1,126 @@
+import io
+from typing import List
+
+import pandas as pd
+
+from cursor_analytics.db.connection import (
+    MySQLConnection, PostgreSQLConnection, SnowflakeConnection
+)
+from cursor_analytics.tests.helpers import SQLiteConnection
+
+
+def _create_table(connection: SQLiteConnection) -> None:
+    connection.execute_query("CREATE TABLE prices (id INTEGER PRIMARY KEY, price REAL, label TEXT)")
+
+
+def test_write_dataframe_modes(sqlite_connection: SQLiteConnection) -> None:
+    _create_table(sqlite_connection)
+    df = pd.DataFrame({'id': [1, 2, 3], 'price': [1.0, None, 3.0], 'label': ['a', 'b', None]})
+
+    stats = sqlite_connection.write_dataframe(df, 'prices', chunk_size=2)
+    assert stats is not None and stats['rows'] == 3 and stats['rows_per_second'] > 0
+
+    upsert = pd.DataFrame({'id': [3, 4], 'price': [30.0, 40.0], 'label': ['c', 'd']})
+    assert sqlite_connection.write_dataframe(upsert, 'prices', mode='upsert', key_columns=['id'])
+
+    result = sqlite_connection.execute_query("SELECT * FROM prices ORDER BY id")
+    assert result['id'].tolist() == [1, 2, 3, 4]
+    assert result['price'].tolist()[2:] == [30.0, 40.0]
+    assert result['price'].isna().tolist()[1]
+
+    assert sqlite_connection.write_dataframe(upsert, 'prices', mode='replace')
+    assert sqlite_connection.execute_query("SELECT COUNT(*) AS n FROM prices")['n'].item() == 2
+
+
+def test_write_dataframe_rolls_back_on_failure(sqlite_connection: SQLiteConnection) -> None:
+    _create_table(sqlite_connection)
+    initial = pd.DataFrame({'id': [1], 'price': [1.0], 'label': ['a']})
+    sqlite_connection.write_dataframe(initial, 'prices')
+
+    # Duplicate primary key in the second chunk fails the whole replace
+    bad = pd.DataFrame({'id': [5, 6, 6], 'price': [1.0, 2.0, 3.0], 'label': ['x', 'y', 'z']})
+    assert sqlite_connection.write_dataframe(bad, 'prices', mode='replace', chunk_size=2) is None
+
+    assert sqlite_connection.execute_query("SELECT id FROM prices")['id'].tolist() == [1]
+
+
+class _LoadDataCursor:
+    # Reads the LOCAL INFILE file while it still exists
+    def __init__(self) -> None:
+        self.statement = None
+        self.data = None
+
+    def execute(self, statement: str) -> None:
+        self.statement = statement
+        path = statement.split("'")[1]
+        with open(path, encoding='utf-8') as f:
+            self.data = f.read()
+
+
+def test_mysql_load_data_keeps_null_strings_apart_from_nulls() -> None:
+    connection = MySQLConnection()
+    connection.config['allow_local_infile'] = True
+    cursor = _LoadDataCursor()
+    df = pd.DataFrame({
+        'id': [1, 2, 3], 'label': ['NULL', None, 'C:\\tmp\tx'], 'flag': [True, False, True]
+    })
+
+    connection._bulk_load(cursor, 'labels', list(df.columns), df, 'load')
+
+    assert "ESCAPED BY '\\\\'" in cursor.statement and "ENCLOSED BY ''" in cursor.statement
+    assert cursor.data.split('\n') == ['1\tNULL\t1', '2\t\\N\t0', '3\tC:\\\\tmp\\tx\t1', '']
+
+
+class _CopyCursor:
+    def __init__(self) -> None:
+        self.statement = None
+        self.data = None
+
+    def copy_expert(self, statement: str, buffer: io.StringIO) -> None:
+        self.statement = statement
+        self.data = buffer.read()
+
+
+def test_postgres_copy_keeps_empty_and_null_marker_strings_apart_from_nulls() -> None:
+    connection = PostgreSQLConnection()
+    cursor = _CopyCursor()
+    df = pd.DataFrame({'id': [1, 2, 3, 4], 'label': ['\\N', '', None, 'a,b']})
+
+    connection._bulk_load(cursor, 'labels', list(df.columns), df, 'load')
+
+    assert cursor.statement == "COPY labels (id, label) FROM STDIN WITH (FORMAT csv)"
+    # Only the unquoted empty field is read as NULL
+    assert cursor.data.split('\n') == ['1,\\N', '2,""', '3,', '4,"a,b"', '']
+
+
+class _StageCursor:
+    # Reads the Parquet file of a PUT while it still exists
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+        self.staged: List[pd.DataFrame] = []
+
+    def execute(self, statement: str) -> None:
+        self.statements.append(statement)
+        if statement.startswith('PUT'):
+            self.staged.append(pd.read_parquet(statement.split("'")[1][len('file://'):]))
+
+
+def test_snowflake_stages_parquet_and_copies_the_load_once() -> None:
+    connection = SnowflakeConnection()
+    cursor = _StageCursor()
+    df = pd.DataFrame({'id': [1, 2, 3], 'label': ['NULL', None, '']})
+
+    connection._bulk_load(cursor, 'labels', list(df.columns), df.iloc[:2], 'load42')
+    connection._bulk_load(cursor, 'labels', list(df.columns), df.iloc[2:], 'load42')
+    connection._finish_bulk_load(cursor, 'labels', list(df.columns), 'load42')
+
+    puts, copy = cursor.statements[:2], cursor.statements[2:]
+    assert all(put.startswith("PUT 'file://") and '/load42_' in put and
+               put.endswith("@%labels AUTO_COMPRESS=FALSE OVERWRITE=TRUE") for put in puts)
+    assert copy == [
+        "COPY INTO labels FROM @%labels FILE_FORMAT = (TYPE = PARQUET) "
+        "MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE PATTERN = '.*load42.*' PURGE = TRUE"
+    ]
+    staged = pd.concat(cursor.staged, ignore_index=True)
+    assert staged['label'].tolist()[0] == 'NULL' and staged['label'].tolist()[2] == ''
+    assert staged['label'].isna().tolist() == [False, True, False]
@@ -2,13 +2,28 @@
 Logger configuration for the Cursor Analytics package.
 
 This module provides a standard logging configuration for the application.
+Handlers are attached once, to the root logger: a QueueHandler that only enqueues
+records, and a QueueListener thread that formats them and does the actual console
+and file I/O, so logging never blocks query execution. Records can be written as
+text or as JSON lines that include structured fields passed with `extra=` (e.g.
+the query fingerprint, duration and row count), and high-frequency DEBUG records
+can be sampled.
+
+Settings default to the LOG_LEVEL, LOG_FORMAT (text or json), LOG_FILE and
+LOG_DEBUG_SAMPLE_RATE environment variables.
 """
 
-import logging
 import os
 import sys
-from pathlib import Path
-from typing import Optional
+import copy
+import json
+import queue
+import atexit
+import logging
+import threading
+import itertools
+import logging.handlers
+from typing import Any, Dict, Optional
 
 # Define log levels
 CRITICAL = logging.CRITICAL
@@ -20,48 +35,187 @@ DEBUG = logging.DEBUG
 # Define log format
 DEFAULT_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
+# Attributes every LogRecord has; anything else on a record came from extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime', 'taskName'
+}
+
+_lock = threading.Lock()
+_queue_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_targets: Dict[str, logging.Handler] = {}
+_sampler: Optional['DebugSampler'] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            'timestamp': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        payload.update({
+            key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES
+        })
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exception'] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class DebugSampler(logging.Filter):
+    # Passes one in every 1/rate DEBUG records per call site; other levels always pass
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+        self._counters: Dict[tuple, Any] = {}
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > DEBUG or self.rate >= 1:
+            return True
+        if self.rate <= 0:
+            self.dropped += 1
+            return False
+        counter = self._counters.setdefault((record.name, record.lineno), itertools.count())
+        if next(counter) % round(1 / self.rate) == 0:
+            return True
+        self.dropped += 1
+        return False
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only the message is rendered on the calling thread; formatting happens on
+        # the listener thread. Unlike the default, structured fields and the
+        # traceback survive the queue.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def _formatter(json_format: bool, log_format: str) -> logging.Formatter:
+    return JsonFormatter() if json_format else logging.Formatter(log_format)
+
+
+def configure_logging(
+    level: Optional[int] = None,
+    log_file: Optional[str] = None,
+    log_format: str = DEFAULT_LOG_FORMAT,
+    json_format: Optional[bool] = None,
+    debug_sample_rate: Optional[float] = None
+) -> None:
+    """
+    Configure non-blocking logging for the process; safe to call repeatedly.
+
+    Args:
+        level: Root log level (defaults to LOG_LEVEL, then INFO)
+        log_file: Additional log file (defaults to LOG_FILE)
+        log_format: Format of text records
+        json_format: Write JSON lines instead of text (defaults to LOG_FORMAT=json)
+        debug_sample_rate: Fraction of DEBUG records kept per call site
+            (defaults to LOG_DEBUG_SAMPLE_RATE, then 1.0)
+    """
+    global _queue_handler, _listener, _sampler
+
+    log_file = log_file or os.getenv('LOG_FILE')
+    if json_format is None:
+        json_format = os.getenv('LOG_FORMAT', 'text').lower() == 'json'
+    if debug_sample_rate is None:
+        debug_sample_rate = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1.0'))
+
+    with _lock:
+        root = logging.getLogger()
+        if level is None and _queue_handler is None:
+            level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+            level = level if isinstance(level, int) else INFO
+        if level is not None:
+            root.setLevel(level)
+
+        if _queue_handler is None:
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            _queue_handler = _QueueHandler(log_queue)
+            _sampler = DebugSampler(debug_sample_rate)
+            # Sampled records are dropped before they are enqueued
+            _queue_handler.addFilter(_sampler)
+            root.addHandler(_queue_handler)
+            _targets['console'] = logging.StreamHandler(sys.stderr)
+            _listener = logging.handlers.QueueListener(
+                log_queue, _targets['console'], respect_handler_level=True
+            )
+            _listener.start()
+        _sampler.rate = debug_sample_rate
+
+        if log_file and log_file not in _targets:
+            # Create directory if it doesn't exist
+            log_dir = os.path.dirname(log_file)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            _targets[log_file] = logging.FileHandler(log_file)
+            _listener.handlers = _listener.handlers + (_targets[log_file],)
+
+        formatter = _formatter(json_format, log_format)
+        for handler in _targets.values():
+            handler.setFormatter(formatter)
+
+
+def shutdown_logging() -> None:
+    # Writes out queued records and detaches the handlers; called at exit
+    global _queue_handler, _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        if _queue_handler is not None:
+            logging.getLogger().removeHandler(_queue_handler)
+            _queue_handler = None
+        for handler in _targets.values():
+            handler.close()
+        _targets.clear()
+
+
+atexit.register(shutdown_logging)
+
+
 def setup_logger(
     name: str,
     level: int = INFO,
     log_file: Optional[str] = None,
-    log_format: str = DEFAULT_LOG_FORMAT
+    log_format: str = DEFAULT_LOG_FORMAT,
+    configure: bool = False
 ) -> logging.Logger:
     """
     Set up a logger with the specified configuration.
-    
+
+    Process-wide logging is only configured when asked for (configure=True or a
+    log_file), so libraries can call this at import time without taking over the
+    application's logging.
+
     Args:
         name: Logger name (typically __name__)
         level: Log level
         log_file: Log file path (if None, log to console only)
         log_format: Log message format
-        
+        configure: Configure the process-wide handlers (see configure_logging)
+
     Returns:
         Configured logger instance
     """
-    # Create logger
+    # Handlers live on the root logger, so calling this repeatedly (or for nested
+    # logger names) never duplicates output
+    if configure or log_file is not None:
+        configure_logging(log_file=log_file, log_format=log_format)
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    # Create formatter
-    formatter = logging.Formatter(log_format)
-    
-    # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # Create file handler if log_file is specified
-    if log_file:
-        # Create directory if it doesn't exist
-        log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-            
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
     return logger
 
-# Create a default logger for the package
-logger = setup_logger('cursor_analytics') 
\ No newline at end of file
+
+# Default logger for the package; its records reach the handlers configured above
+logger = logging.getLogger('cursor_analytics')